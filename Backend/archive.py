@@ -0,0 +1,420 @@
+"""
+backend/archive.py
+
+Compressed day archives of Front End session files and merged transaction files.
+
+Session and merged files are only needed again to replay or audit an old
+day, so once a day is processed they can be moved into an archive: one
+bundle per day, compressed with gzip or lzma from the standard library.
+
+    python archive.py bundle [options] <source_dir> <archive_dir>
+
+puts every session file found in source_dir (several directories separated
+by os.pathsep, as for merge_transactions.py) into the bundle of the day in
+its file name, <archive_dir>/YYYY-MM-DD.gz (or .xz with --lzma). Bundling
+is incremental: files already in a bundle are skipped, new ones appended.
+
+Bundle layout:
+    Each file is stored as a run of blocks of up to BLOCK_RECORDS records,
+    and every block is compressed on its own as a complete gzip member (or
+    xz stream). The bundle is the blocks back to back, so it is still a
+    valid .gz (.xz) file: `zcat 2026-03-12.gz` prints every file in it.
+
+Block index:
+    <bundle>.index.json lists the files in the bundle, and for each one
+    the byte offset, compressed length, first record and record count of
+    every block, plus the file's size and SHA-256:
+        {"version": 1, "compression": "gzip", "size": ..., "members": [
+            {"name": "terminal1/03-12-2026 14-05-33.txt", "kind": "session",
+             "size": 410, "sha256": "...", "records": 10, "header": 0,
+             "blocks": [[offset, length, first_record, records], ...]}]}
+    With it, any file or range of records is read back by decompressing
+    only the blocks that hold it (see read_records and open_member). A
+    binary file's header ("header" bytes) is stored at the start of its
+    first block.
+
+Reading an archived file:
+    "<bundle>::<member>" can be given wherever TransactionsList reads a
+    merged transaction file (so main.py can replay an old day straight from
+    its archive), and a bundle path on its own stands for the day's merged
+    file. The records are decompressed block by block as they are read.
+
+Usage:
+    python archive.py bundle [options] <source_dir> <archive_dir>
+    python archive.py list <bundle>
+    python archive.py cat <bundle>::<member> [first[:stop]]
+
+Options (bundle):
+    --lzma          compress with lzma (.xz) instead of gzip (.gz).
+    --merged=FILE   also archive a merged transaction file, in the bundle of
+                    the day it was last modified.
+    --remove        delete each file once it is in its bundle and reads
+                    back unchanged.
+
+`cat` writes a member, or its records first up to (not including) stop,
+counted from 0, to standard output.
+"""
+
+import bisect
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import sys
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import binary_transactions as binary
+import stdio
+
+INDEX_SUFFIX  = ".index.json"
+INDEX_VERSION = 1
+
+# Separates the bundle path from the member name in "<bundle>::<member>".
+MEMBER_SEPARATOR = "::"
+
+# Records per compressed block.
+BLOCK_RECORDS = 4096
+
+# Compression name -> (bundle suffix, compress, decompress).
+COMPRESSIONS = {
+    "gzip": (".gz", lambda data: gzip.compress(data, mtime=0), gzip.decompress),
+    "lzma": (".xz", lzma.compress, lzma.decompress),
+}
+
+DAY_FORMAT = "%Y-%m-%d"
+
+
+def bundle_path(archive_dir: str, day: datetime, compression: str = "gzip") -> str:
+    """Return the path of the bundle that holds the files of a day."""
+    return os.path.join(archive_dir, day.strftime(DAY_FORMAT) + COMPRESSIONS[compression][0])
+
+
+def split_path(path: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Split an archived-file path into its bundle and member name.
+
+    Args:
+        path: "<bundle>::<member>", or a bundle path on its own.
+
+    Returns:
+        (bundle, member), with member None for a bare bundle path, or None
+        if the path does not name an archive (no index file next to it).
+    """
+    bundle, separator, member = path.partition(MEMBER_SEPARATOR)
+    if not os.path.exists(bundle + INDEX_SUFFIX):
+        return None
+    return bundle, (member if separator else None)
+
+
+def load_index(bundle: str) -> Dict:
+    """
+    Load the block index of a bundle.
+
+    Returns:
+        The index; an empty one (no members) if the bundle does not exist.
+
+    Raises:
+        ValueError: If the index is from an unsupported version.
+    """
+    try:
+        with open(bundle + INDEX_SUFFIX) as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return {"version": INDEX_VERSION, "compression": None, "size": 0, "members": []}
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(f"unsupported archive index version {index.get('version')}")
+    return index
+
+
+def save_index(bundle: str, index: Dict):
+    """Write the block index of a bundle, replacing the old one atomically."""
+    path = bundle + INDEX_SUFFIX
+    with open(path + ".tmp", "w") as f:
+        json.dump(index, f, indent=1)
+        f.write("\n")
+    os.replace(path + ".tmp", path)
+
+
+def find_member(index: Dict, name: Optional[str]) -> Dict:
+    """
+    Return a member of a bundle by name; None means the day's (last) merged file.
+
+    Raises:
+        KeyError: If there is no such member.
+    """
+    members = index["members"]
+    if name is None:
+        merged = [m for m in members if m["kind"] == "merged"]
+        if not merged:
+            raise KeyError("the archive holds no merged file; name a member as <bundle>::<member>")
+        return merged[-1]
+    for member in members:
+        if member["name"] == name:
+            return member
+    raise KeyError(f"no member {name!r} in the archive")
+
+
+def split_records(data: bytes) -> Tuple[bytes, List[bytes]]:
+    """
+    Split a transaction file's contents into its header and records.
+
+    Text records are lines (with their line endings); binary records are
+    fixed-size packed records after the file header. Joining the header and
+    records gives back the contents exactly.
+    """
+    if binary.is_binary(data):
+        size = binary.RECORD.size
+        head = binary.HEADER.size
+        return data[:head], [data[i:i + size] for i in range(head, len(data), size)]
+    lines = data.split(b"\n")
+    records = [line + b"\n" for line in lines[:-1]]
+    if lines[-1]:
+        records.append(lines[-1])
+    return b"", records
+
+
+def add_member(bundle: str, index: Dict, name: str, kind: str, data: bytes,
+               block_records: int = BLOCK_RECORDS) -> Dict:
+    """
+    Append one file to a bundle, as compressed blocks, and add it to its index.
+
+    The caller saves the index afterwards (see save_index); until then the
+    new blocks are not part of the archive.
+
+    Args:
+        bundle:        The bundle path.
+        index:         The bundle's index (see load_index); updated in place.
+        name:          The member name the file is archived under.
+        kind:          "session" or "merged".
+        data:          The file's contents.
+        block_records: Records per block.
+
+    Returns:
+        The new member's index entry.
+    """
+    compress = COMPRESSIONS[index["compression"]][1]
+    header, records = split_records(data)
+    member = {"name": name, "kind": kind, "size": len(data),
+              "sha256": hashlib.sha256(data).hexdigest(),
+              "records": len(records), "header": len(header), "blocks": []}
+    with open(bundle, "ab") as out:
+        # Drop anything after the indexed blocks (an earlier run that stopped part-way).
+        out.truncate(index["size"])
+        offset = index["size"]
+        for first in range(0, max(len(records), 1), block_records):
+            block = compress((header if first == 0 else b"") + b"".join(records[first:first + block_records]))
+            out.write(block)
+            member["blocks"].append([offset, len(block), first, len(records[first:first + block_records])])
+            offset += len(block)
+    index["size"] = offset
+    index["members"].append(member)
+    return member
+
+
+def iter_blocks(bundle: str, member: Dict, decompress, first_block: int = 0) -> Iterator[bytes]:
+    """Yield the decompressed blocks of a member, from the given block on."""
+    with open(bundle, "rb") as f:
+        for offset, length, _, _ in member["blocks"][first_block:]:
+            f.seek(offset)
+            yield decompress(f.read(length))
+
+
+def read_member(bundle: str, name: Optional[str] = None) -> bytes:
+    """Return the contents of an archived file (the day's merged file if name is None)."""
+    index  = load_index(bundle)
+    member = find_member(index, name)
+    return b"".join(iter_blocks(bundle, member, COMPRESSIONS[index["compression"]][2]))
+
+
+def read_records(bundle: str, name: Optional[str] = None, start: int = 0,
+                 stop: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield the records start up to (not including) stop of an archived file.
+
+    Only the blocks that hold those records are read and decompressed.
+    Records are text lines, or packed records for a binary file (whose
+    header is not included).
+    """
+    index  = load_index(bundle)
+    member = find_member(index, name)
+    stop   = member["records"] if stop is None else min(stop, member["records"])
+    firsts = [block[2] for block in member["blocks"]]
+    block  = max(bisect.bisect_right(firsts, start) - 1, 0)
+    for data in iter_blocks(bundle, member, COMPRESSIONS[index["compression"]][2], block):
+        first = member["blocks"][block][2]
+        if first >= stop:
+            return
+        if first == 0:
+            data = data[member["header"]:]
+        _, records = split_records((binary.file_header() if member["header"] else b"") + data)
+        yield from records[max(start - first, 0):stop - first]
+        block += 1
+
+
+class _BlockReader(io.RawIOBase):
+    """Raw, read-only file over a member's blocks, decompressed one at a time as it is read."""
+
+    def __init__(self, blocks: Iterator[bytes]):
+        self._blocks  = blocks
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            data = next(self._blocks, None)
+            if data is None:
+                return 0
+            self._pending = memoryview(data)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        self._blocks.close()
+        super().close()
+
+
+def open_member(bundle: str, name: Optional[str] = None) -> BinaryIO:
+    """
+    Open an archived file for reading (the day's merged file if name is None).
+
+    Blocks are decompressed as the file is read, so memory use is one block.
+
+    Raises:
+        KeyError: If there is no such member.
+    """
+    index  = load_index(bundle)
+    member = find_member(index, name)
+    blocks = iter_blocks(bundle, member, COMPRESSIONS[index["compression"]][2])
+    return io.BufferedReader(_BlockReader(blocks))
+
+
+def _archive_file(bundle_file: str, index: Dict, name: str, kind: str, path: str, remove: bool) -> bool:
+    """
+    Add one file to a bundle unless it is already there.
+
+    Returns:
+        True if the file was newly archived.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    existing = next((m for m in index["members"] if m["name"] == name), None)
+    if existing is not None:
+        if existing["sha256"] != hashlib.sha256(data).hexdigest():
+            print(f"Warning: {path} changed after it was archived as {name}; it is not archived again.")
+            return False
+        added = False
+    else:
+        add_member(bundle_file, index, name, kind, data)
+        save_index(bundle_file, index)
+        if read_member(bundle_file, name) != data:
+            print(f"ERROR: {name} does not read back from {bundle_file} unchanged; {path} is kept.")
+            return True
+        added = True
+    if remove:
+        os.remove(path)
+    return added
+
+
+def archive_sessions(source_dirs: List[str], archive_dir: str, compression: str = "gzip",
+           merged_file: Optional[str] = None, remove: bool = False) -> int:
+    """
+    Archive session files (and a merged file) into per-day bundles.
+
+    A bundle keeps the compression it was created with.
+
+    Args:
+        source_dirs: Directories to take session files from.
+        archive_dir: Directory holding the bundles; created if needed.
+        compression: "gzip" or "lzma", for new bundles.
+        merged_file: A merged transaction file to archive as well, in the
+                     bundle of the day it was last modified.
+        remove:      Delete each file once it reads back unchanged from its
+                     bundle (with a merged file, also its session index and
+                     manifest).
+
+    Returns:
+        The number of files newly archived.
+    """
+    from merge_transactions import MANIFEST_SUFFIX, SESSIONS_SUFFIX, iter_sessions
+    os.makedirs(archive_dir, exist_ok=True)
+    indexes: Dict[str, Tuple[str, Dict]] = {}
+
+    def bundle_for(day: datetime) -> Tuple[str, Dict]:
+        key = day.strftime(DAY_FORMAT)
+        if key not in indexes:
+            existing = [bundle_path(archive_dir, day, c) for c in COMPRESSIONS]
+            existing = [path for path in existing if os.path.exists(path + INDEX_SUFFIX)]
+            path  = existing[0] if existing else bundle_path(archive_dir, day, compression)
+            index = load_index(path)
+            index["compression"] = index["compression"] or compression
+            indexes[key] = (path, index)
+        return indexes[key]
+
+    added   = 0
+    sources = [os.path.basename(os.path.normpath(d)) for d in source_dirs]
+    for session in iter_sessions(source_dirs):
+        name = f"{sources[session.source]}/{session.name}"
+        added += _archive_file(*bundle_for(session.timestamp), name, "session", session.path, remove)
+    if merged_file is not None:
+        day = datetime.fromtimestamp(os.path.getmtime(merged_file))
+        added += _archive_file(*bundle_for(day), os.path.basename(merged_file), "merged", merged_file, remove)
+        if remove and not os.path.exists(merged_file):
+            for suffix in (SESSIONS_SUFFIX, MANIFEST_SUFFIX):
+                if os.path.exists(merged_file + suffix):
+                    os.remove(merged_file + suffix)
+    return added
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the archive commands from the command line."""
+    args:    List[str]      = []
+    options: Dict[str, str] = {}
+    for arg in sys.argv[1:] if argv is None else argv:
+        if arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value
+        else:
+            args.append(arg)
+    command = args[0] if args else None
+    try:
+        if command == "bundle" and len(args) == 3:
+            added = archive_sessions(args[1].split(os.pathsep), args[2], "lzma" if "lzma" in options else "gzip",
+                           merged_file=options.get("merged") or None, remove="remove" in options)
+            print(f"Archived {added} file(s) in {args[2]}.")
+        elif command == "list" and len(args) == 2:
+            index = load_index(args[1])
+            for member in index["members"]:
+                print(f"{member['kind']:<8}{member['records']:>8}{member['size']:>10}  {member['name']}")
+        elif command == "cat" and len(args) in (2, 3):
+            located = split_path(args[1])
+            if located is None:
+                raise KeyError(f"{args[1]} is not an archive (no {INDEX_SUFFIX} file)")
+            first, _, stop = (args[2] if len(args) == 3 else "").partition(":")
+            out = stdio.data_stream().buffer
+            if len(args) == 2:
+                with open_member(*located) as f:
+                    for block in iter(lambda: f.read(1 << 16), b""):
+                        out.write(block)
+            else:
+                for record in read_records(*located, int(first or 0), int(stop) if stop else None):
+                    out.write(record)
+            out.flush()
+        else:
+            print("Usage: python archive.py bundle [--lzma] [--merged=FILE] [--remove] <source_dir> <archive_dir>\n"
+                  "       python archive.py list <bundle>\n"
+                  "       python archive.py cat <bundle>::<member> [first[:stop]]")
+            sys.exit(2)
+    except (KeyError, ValueError) as e:
+        print(f"ERROR: {e.args[0] if isinstance(e, KeyError) else e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""
+backend/bench
+
+Synthetic data generator and benchmark suite for the Banking System Back End.
+
+    python -m bench --accounts 50000 --transactions 200000 --seed 1 --output results.json
+
+(run from the Backend directory). generate.py writes master accounts and
+merged transaction files from a seed, so the same arguments always produce
+the same files; run.py times each Back End phase on them and reports the
+results as JSON.
+"""
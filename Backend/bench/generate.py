@@ -0,0 +1,167 @@
+"""
+backend/bench/generate.py
+
+Seeded generators for realistic master accounts and merged transaction files.
+
+Every random choice comes from one random.Random(seed), so a given set of
+arguments always produces byte-identical files, on any machine and Python
+version the Back End supports.
+"""
+
+import random
+from typing import Dict, List, Optional
+
+from lists import ACCOUNT_NUMBER_SPACE
+from money import format_cents
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Wei", "Priya", "Ahmed", "Sofia",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas",
+    "Taylor", "Moore", "Jackson", "Martin", "Lee", "Nguyen", "Patel", "Chen", "Singh",
+)
+
+# Paybill company codes.
+COMPANIES = ("EC", "CQ", "FI")
+
+# Default share of each transaction code in a day's merged file.
+DEFAULT_MIX: Dict[str, float] = {
+    "01": 0.22,   # withdrawal
+    "02": 0.18,   # transfer
+    "03": 0.12,   # paybill
+    "04": 0.22,   # deposit
+    "05": 0.02,   # create
+    "06": 0.01,   # delete
+    "07": 0.01,   # disable
+    "08": 0.02,   # changeplan
+    "09": 0.10,   # login
+    "10": 0.10,   # logout
+}
+
+# Largest amount written to a money field, in cents.
+MAX_MONEY_CENTS = 9999999
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parse a code mix such as "01=30,02=20,04=50" (weights need not add up to 1).
+
+    Raises:
+        ValueError: If an entry is not CODE=WEIGHT.
+    """
+    mix: Dict[str, float] = {}
+    for entry in filter(None, (part.strip() for part in text.split(","))):
+        code, sep, weight = entry.partition("=")
+        if not sep or not code.strip().isdigit():
+            raise ValueError(f"Invalid code mix entry: {entry!r}")
+        mix[code.strip().zfill(2)] = float(weight)
+    return mix
+
+
+def holder_names(rnd: random.Random, count: int) -> List[str]:
+    """Return count holder names (20 characters or fewer), some of them shared."""
+    return [f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}" for _ in range(count)]
+
+
+def generate_master(path: str, accounts: int, seed: int = 0, sp_fraction: float = 0.3,
+                    disabled_fraction: float = 0.02) -> List[Dict]:
+    """
+    Write a master accounts file with randomly chosen account numbers.
+
+    Args:
+        path:              Where to write the file.
+        accounts:          Number of accounts, at most the full 5-digit space
+                           less account 00000 (99999).
+        seed:              Random seed.
+        sp_fraction:       Share of accounts on the student plan (SP).
+        disabled_fraction: Share of accounts that are disabled (D).
+
+    Returns:
+        The generated accounts as dicts (accountNumber, accountName, status,
+        balance in cents, plan, transactionCount), in file order.
+
+    Raises:
+        ValueError: If accounts does not fit in the account-number space.
+    """
+    if not 0 <= accounts < ACCOUNT_NUMBER_SPACE:
+        raise ValueError(f"accounts must be between 0 and {ACCOUNT_NUMBER_SPACE - 1}")
+    rnd     = random.Random(seed)
+    numbers = sorted(rnd.sample(range(1, ACCOUNT_NUMBER_SPACE), accounts))
+    # Roughly three accounts per holder, so holders often own several.
+    names   = holder_names(rnd, max(accounts // 3, 1))
+    result  = []
+    with open(path, "w") as f:
+        for number in numbers:
+            account = {
+                "accountNumber":    f"{number:05d}",
+                "accountName":      rnd.choice(names),
+                "status":           "D" if rnd.random() < disabled_fraction else "A",
+                # Log-uniform balances between $1 and $99,999.
+                "balance":          min(int(10 ** rnd.uniform(2, 7)), MAX_MONEY_CENTS),
+                "plan":             "SP" if rnd.random() < sp_fraction else "NP",
+                "transactionCount": rnd.randint(0, 500),
+            }
+            f.write(
+                f"{account['accountNumber']} {account['accountName']:<20} {account['status']} "
+                f"{format_cents(account['balance'])} {account['plan']} {account['transactionCount']:04d}\n"
+            )
+            result.append(account)
+    return result
+
+
+def generate_merged(path: str, accounts: List[Dict], transactions: int, seed: int = 0,
+                    mix: Optional[Dict[str, float]] = None, miss_fraction: float = 0.02):
+    """
+    Write a merged transaction file for the given master accounts.
+
+    Most transactions name an existing account; miss_fraction of them name
+    a random number instead, which usually does not exist. A busy 10% of
+    accounts receives about half of the traffic. As in a file written by
+    merge_transactions.py, the only end-of-session (00) record is the last.
+
+    Args:
+        path:           Where to write the file.
+        accounts:       The master accounts (as returned by generate_master).
+        transactions:   Number of transaction records, not counting 00 records.
+        seed:           Random seed.
+        mix:            Transaction code -> weight (default DEFAULT_MIX).
+        miss_fraction:  Share of records naming a random account number.
+    """
+    rnd     = random.Random(seed)
+    mix     = mix or DEFAULT_MIX
+    codes   = list(mix)
+    weights = [mix[code] for code in codes]
+    busy    = accounts[:max(len(accounts) // 10, 1)]
+    names   = sorted({acc["accountName"] for acc in accounts}) or holder_names(rnd, 10)
+
+    def pick_account() -> Dict:
+        if not accounts or rnd.random() < miss_fraction:
+            return {"accountNumber": f"{rnd.randrange(ACCOUNT_NUMBER_SPACE):05d}", "accountName": rnd.choice(names)}
+        return rnd.choice(busy if rnd.random() < 0.5 else accounts)
+
+    with open(path, "w") as f:
+        for code in rnd.choices(codes, weights, k=transactions):
+            account = pick_account()
+            number  = account["accountNumber"]
+            name    = account["accountName"]
+            money   = 0
+            misc    = "00"
+            if code in ("01", "02", "03", "04"):
+                money = min(int(10 ** rnd.uniform(2, 5.5)), MAX_MONEY_CENTS)
+            if code == "02":
+                # TO account is 'number'; the FROM holder is identified by name.
+                source = pick_account()
+                name   = source["accountName"]
+                misc   = source["accountNumber"][:2]
+            elif code == "03":
+                misc = rnd.choice(COMPANIES)
+            elif code == "05":
+                number  = f"{rnd.randrange(1, ACCOUNT_NUMBER_SPACE):05d}"
+                name    = rnd.choice(names)
+                money   = min(int(10 ** rnd.uniform(2, 6)), MAX_MONEY_CENTS)
+            f.write(f"{code} {name:<20} {number} {format_cents(money)} {misc}\n")
+        f.write("00 END_OF_FILE          00000 00000000 00\n")
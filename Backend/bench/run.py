@@ -0,0 +1,187 @@
+"""
+backend/bench/run.py
+
+Times each phase of a Back End run on generated data and reports JSON.
+
+Phases timed (each on fresh objects, repeated --repeat times):
+    read_old_master_accounts      AccountsList.read_old_master_accounts()
+    read_merged_transaction_file  TransactionsList.read_merged_transaction_file()
+    apply                         AccountsList.perform_transaction() for every record
+    write_new_master_accounts     AccountsList.write_new_master_accounts()
+    write_new_current_accounts    AccountsList.write_new_current_accounts()
+
+The report records the generator settings and seed, so a run can be repeated
+exactly on another commit and the two JSON files compared.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from bench.generate import DEFAULT_MIX, generate_master, generate_merged, parse_mix
+from lists import AccountsList, TransactionsList
+from rejects import RejectSink
+
+PHASES = (
+    "read_old_master_accounts",
+    "read_merged_transaction_file",
+    "apply",
+    "write_new_master_accounts",
+    "write_new_current_accounts",
+)
+
+# Account store options, as in main.py.
+ENGINES = ("records", "lazy", "columnar")
+
+
+def _make_accounts(engine: str, current_file: str, master_file: str) -> AccountsList:
+    """Create an empty account store of the given kind."""
+    if engine == "columnar":
+        from columnar import ColumnarAccountsList
+        return ColumnarAccountsList(current_file=current_file, master_file=master_file)
+    return AccountsList(current_file=current_file, master_file=master_file, lazy=engine == "lazy")
+
+
+def _commit() -> Optional[str]:
+    """Return the current git commit of the repository, if it can be found."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(__file__),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(accounts: int = 10000, transactions: int = 100000, seed: int = 0,
+                  mix: Optional[Dict[str, float]] = None, sp_fraction: float = 0.3,
+                  disabled_fraction: float = 0.02, miss_fraction: float = 0.02,
+                  repeat: int = 3, engine: str = "records", workdir: Optional[str] = None) -> Dict:
+    """
+    Generate a master and a merged transaction file, then time every phase.
+
+    Args:
+        accounts, transactions, seed, mix, sp_fraction, disabled_fraction,
+        miss_fraction: Generator settings (see bench.generate).
+        repeat:  Number of timed runs of each phase.
+        engine:  Account store: "records", "lazy" or "columnar".
+        workdir: Directory for the generated and written files. Defaults to
+                 a temporary directory that is removed afterwards.
+
+    Returns:
+        The JSON-ready report.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine!r}")
+    scratch = workdir or tempfile.mkdtemp(prefix="backend-bench-")
+    try:
+        master_in = os.path.join(scratch, "master_in.txt")
+        merged    = os.path.join(scratch, "merged_transactions.txt")
+        master    = os.path.join(scratch, "master_accounts.txt")
+        current   = os.path.join(scratch, "current_accounts.txt")
+        generated = generate_master(master_in, accounts, seed, sp_fraction, disabled_fraction)
+        generate_merged(merged, generated, transactions, seed, mix, miss_fraction)
+
+        runs: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+        for _ in range(repeat):
+            shutil.copyfile(master_in, master)
+            store = _make_accounts(engine, current, master)
+            store.rejects = RejectSink(os.path.join(scratch, "rejects.csv"))
+            records = TransactionsList(merged)
+
+            started = time.perf_counter()
+            store.read_old_master_accounts()
+            runs["read_old_master_accounts"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            records.read_merged_transaction_file()
+            runs["read_merged_transaction_file"].append(time.perf_counter() - started)
+
+            perform = store.perform_transaction
+            started = time.perf_counter()
+            for transaction in records.transactions:
+                perform(transaction)
+            runs["apply"].append(time.perf_counter() - started)
+            store.rejects.close()
+
+            started = time.perf_counter()
+            store.write_new_master_accounts()
+            runs["write_new_master_accounts"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            store.write_new_current_accounts()
+            runs["write_new_current_accounts"].append(time.perf_counter() - started)
+        record_counts = {
+            "read_old_master_accounts":     accounts,
+            "read_merged_transaction_file": len(records.transactions),
+            "apply":                        len(records.transactions),
+            "write_new_master_accounts":    len(store.current_accounts),
+            "write_new_current_accounts":   len(store.current_accounts),
+        }
+    finally:
+        if workdir is None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    phases = {}
+    for phase in PHASES:
+        best = min(runs[phase])
+        phases[phase] = {
+            "best_seconds":       round(best, 6),
+            "median_seconds":     round(statistics.median(runs[phase]), 6),
+            "runs":               [round(t, 6) for t in runs[phase]],
+            "records":            record_counts[phase],
+            "records_per_second": round(record_counts[phase] / best, 1) if best > 0 else None,
+        }
+    return {
+        "config": {
+            "accounts": accounts, "transactions": transactions, "seed": seed,
+            "mix": mix or DEFAULT_MIX, "sp_fraction": sp_fraction,
+            "disabled_fraction": disabled_fraction, "miss_fraction": miss_fraction,
+            "repeat": repeat, "engine": engine,
+        },
+        "environment": {
+            "python":         platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform":       platform.platform(),
+            "commit":         _commit(),
+        },
+        "phases": phases,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point (python -m bench)."""
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--accounts", type=int, default=10000, help="accounts in the master file (max 99999)")
+    parser.add_argument("--transactions", type=int, default=100000, help="records in the merged file")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--mix", type=parse_mix, default=None,
+                        help='transaction code weights, e.g. "01=30,02=20,04=50"')
+    parser.add_argument("--sp-fraction", type=float, default=0.3, help="share of student-plan accounts")
+    parser.add_argument("--disabled-fraction", type=float, default=0.02, help="share of disabled accounts")
+    parser.add_argument("--miss-fraction", type=float, default=0.02,
+                        help="share of records naming a random account number")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of each phase")
+    parser.add_argument("--engine", choices=ENGINES, default="records", help="account store to benchmark")
+    parser.add_argument("--workdir", help="keep the generated files in this directory")
+    parser.add_argument("--output", help="write the JSON report here instead of to stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        args.accounts, args.transactions, args.seed, args.mix, args.sp_fraction,
+        args.disabled_fraction, args.miss_fraction, args.repeat, args.engine, args.workdir,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
@@ -0,0 +1,226 @@
+"""
+backend/binary_transactions.py
+
+Compact binary form of the Front End session and merged transaction files.
+
+A text transaction record is a 41-character fixed-width line that has to be
+decoded and checked column by column. The binary form stores the same fields
+packed, so a file is about 15% smaller and a batch of records is read with a
+single struct pass over the buffer.
+
+File layout (little-endian):
+    header   8 bytes   b"BTXF", format version (uint16), record size (uint16)
+    records  36 bytes each:
+        code     uint8     transaction code (0-99)
+        flags    uint8     how the text record was written (see below)
+        name     20 bytes  account holder name field, exactly as in the text
+        number   uint32    account number
+        money    uint64    amount in cents
+        misc     2 bytes   miscellaneous field; for a transfer, the first two
+                           digits of the FROM account number
+
+Text records are not all written the same way (money as "00100.00" or as
+whole dollars "00000100", with or without the misc field, LF or CRLF line
+endings), so the flags keep that, and converting a file to binary and back
+gives back exactly the same bytes. Readers detect the format from the magic
+bytes, so a binary file can be used wherever a text one is.
+
+Converting files:
+    python binary_transactions.py to-binary <text file> <binary file>
+    python binary_transactions.py to-text <binary file> <text file>
+Either path may be "-" for standard input/output.
+"""
+
+import struct
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import stdio
+from lists import BINARY_MAGIC, TRANSACTION_RECORD_LENGTH, gc_paused, parse_transaction_line
+from records import Transaction
+
+MAGIC   = BINARY_MAGIC
+VERSION = 1
+
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<BB20sIQ2s")
+
+# Record flags.
+WHOLE_DOLLARS = 0x01   # money field had no decimal point
+NO_MISC       = 0x02   # record was written without its misc field
+CRLF          = 0x04   # line ended with "\r\n"
+NO_NEWLINE    = 0x08   # last line of the file had no line ending
+
+_LINE_ENDINGS = {b"\r\n": CRLF, b"\n": 0, b"": NO_NEWLINE}
+
+# Text form of every code byte.
+_CODES = ["%02d" % code for code in range(256)]
+
+
+def file_header() -> bytes:
+    """Return the header that starts a binary transaction file."""
+    return HEADER.pack(MAGIC, VERSION, RECORD.size)
+
+
+def check_header(header: bytes):
+    """
+    Check the header of a binary transaction file.
+
+    Raises:
+        ValueError: If it is not a header, or from an unsupported version.
+    """
+    if len(header) != HEADER.size or header[:4] != MAGIC:
+        raise ValueError("not a binary transaction file")
+    _, version, size = HEADER.unpack(header)
+    if version != VERSION or size != RECORD.size:
+        raise ValueError(f"unsupported binary transaction file version {version} (record size {size})")
+
+
+def encode_line(raw: bytes, line_number: int = 0) -> bytes:
+    """
+    Pack one text transaction record.
+
+    Args:
+        raw:         The text line, with or without its line ending.
+        line_number: The line's position, for error messages.
+
+    Returns:
+        The packed record.
+
+    Raises:
+        ValueError: If the line is not a valid transaction record.
+    """
+    parse_transaction_line(raw, line_number)
+    body   = raw.rstrip(b"\r\n")
+    flags  = _LINE_ENDINGS[raw[len(body):]]
+    if len(body) != TRANSACTION_RECORD_LENGTH:
+        flags |= NO_MISC
+    money = body[30:38]
+    if money[5:6] == b".":
+        cents = int(money[:5]) * 100 + int(money[6:])
+    else:
+        cents  = int(money) * 100
+        flags |= WHOLE_DOLLARS
+    name = body[3:23]
+    if not name.isascii():
+        raise ValueError("account name is not ASCII")
+    return RECORD.pack(int(body[0:2]), flags, name, int(body[24:29]), cents, body[39:41].ljust(2))
+
+
+def decode_record(record: bytes) -> bytes:
+    """Return the text line, with its line ending, that a packed record was made from."""
+    code, flags, name, number, cents, misc = RECORD.unpack(record)
+    if flags & WHOLE_DOLLARS:
+        money = b"%08d" % (cents // 100)
+    else:
+        money = b"%05d.%02d" % divmod(cents, 100)
+    line = b"%02d %s %05d %s" % (code, name, number, money)
+    if not flags & NO_MISC:
+        line += b" " + misc
+    if flags & NO_NEWLINE:
+        return line
+    return line + (b"\r\n" if flags & CRLF else b"\n")
+
+
+def parse_batch(chunk: bytes, line_number: int = 0) -> List[Transaction]:
+    """
+    Unpack a buffer of whole packed records into Transaction records.
+
+    Account numbers, names and misc fields repeat a lot within a batch, so
+    each distinct value is decoded once per batch.
+
+    Args:
+        chunk:       Packed records (a multiple of RECORD.size bytes).
+        line_number: Number of records in the file before the chunk.
+    """
+    numbers: Dict[int, str]   = {}
+    names:   Dict[bytes, str] = {}
+    miscs:   Dict[bytes, str] = {}
+    batch:   List[Transaction] = []
+    append = batch.append
+    with gc_paused():
+        for n, (code, flags, name, number, cents, misc) in enumerate(RECORD.iter_unpack(chunk), line_number + 1):
+            text_number = numbers.get(number)
+            if text_number is None:
+                text_number = numbers[number] = "%05d" % number
+            text_name = names.get(name)
+            if text_name is None:
+                text_name = names[name] = name.decode().strip()
+            text_misc = miscs.get(misc)
+            if text_misc is None:
+                text_misc = miscs[misc] = misc.decode()
+            append(Transaction(_CODES[code], text_name, text_number, cents,
+                               "" if flags & NO_MISC else text_misc, n))
+    return batch
+
+
+def encode_lines(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Pack text lines one by one (see encode_line).
+
+    Raises:
+        ValueError: If a line is not a valid record; the message starts with
+                    its line number.
+    """
+    for line_number, raw in enumerate(lines, 1):
+        try:
+            yield encode_line(raw, line_number)
+        except ValueError as e:
+            raise ValueError(f"line {line_number}: {e}") from None
+
+
+def iter_records(fh) -> Iterator[bytes]:
+    """
+    Read the packed records of a binary transaction file, after checking its header.
+
+    Raises:
+        ValueError: If the header is not valid or the file ends part-way
+                    through a record.
+    """
+    check_header(fh.read(HEADER.size))
+    while True:
+        record = fh.read(RECORD.size)
+        if not record:
+            return
+        if len(record) != RECORD.size:
+            raise ValueError("binary transaction file ends part-way through a record")
+        yield record
+
+
+def is_binary(head: bytes) -> bool:
+    """Return True if the first bytes of a file show it is a binary transaction file."""
+    return head[:len(MAGIC)] == MAGIC
+
+
+def to_binary(source: str, target: str):
+    """Convert a text transaction file to the binary form."""
+    with stdio.open_input(source) as fh, stdio.open_output(target, "wb") as out:
+        out.write(file_header())
+        for record in encode_lines(fh):
+            out.write(record)
+
+
+def to_text(source: str, target: str):
+    """Convert a binary transaction file back to its exact text form."""
+    with stdio.open_input(source) as fh, stdio.open_output(target, "wb") as out:
+        for record in iter_records(fh):
+            out.write(decode_record(record))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the converter from the command line."""
+    args = sys.argv[1:] if argv is None else argv
+    converters = {"to-binary": to_binary, "to-text": to_text}
+    if len(args) != 3 or args[0] not in converters:
+        print("Usage: python binary_transactions.py to-binary|to-text <source> <target>")
+        sys.exit(2)
+    with stdio.messages_to_stderr(stdio.is_stdio(args[2])):
+        try:
+            converters[args[0]](args[1], args[2])
+        except ValueError as e:
+            print(f"ERROR: {args[1]}: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
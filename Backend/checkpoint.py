@@ -0,0 +1,159 @@
+"""
+backend/checkpoint.py
+
+Checkpoints of a Back End run, so a run that stops part-way can be resumed
+(main.py --checkpoint and --resume).
+
+While the transactions are applied, the run writes a checkpoint at the end
+of the first batch of input after every N transactions, and once more when
+all of them are applied. A checkpoint holds everything the rest of the run depends on:
+
+    - every account, as it is at that point (and, for the columnar store,
+      the transaction counts it was loaded with, for its fee totals);
+    - the byte offset and line number in the merged transaction file just
+      after the last applied transaction;
+    - the length of the rejects file and the reject counts by reason.
+
+It is written to <master_accounts>.checkpoint under a temporary name and
+then renamed into place, keeping the previous one as .checkpoint.1, so
+there is always a complete checkpoint on disk. A run that finishes removes
+both.
+
+main.py --resume loads the latest valid checkpoint for the same merged
+transaction file (same path, size and modification time), restores the
+accounts from it instead of reading the master file, cuts the rejects file
+back to where the checkpoint left it, and continues reading the merged file
+at the checkpoint's offset. The account and rejects files it writes are the
+same as those of a run that was never interrupted. The work redone is less
+than one checkpoint interval plus one batch; batches are at most 1 MB of
+input, and are cut to about N records when checkpointing, so it is less
+than 2N transactions.
+
+File layout:
+    magic      4 bytes   b"BKCP"
+    version    uint16    format version
+    digest     32 bytes  SHA-256 of the state
+    state      pickled dict (see save)
+
+Checkpoints are only ever read by the Back End that wrote them, on the same
+machine; like any pickle, they must not be loaded from untrusted sources.
+"""
+
+import hashlib
+import os
+import pickle
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import archive
+from records import Account
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+MAGIC   = b"BKCP"
+VERSION = 1
+
+HEADER = struct.Struct("<4sH32s")
+
+# Default number of transactions between checkpoints.
+DEFAULT_INTERVAL = 1000000
+
+# Account fields kept for each account, in order.
+ACCOUNT_FIELDS = ("accountNumber", "accountName", "status", "balance", "plan", "transactionCount")
+
+
+def checkpoint_path(master_file: str) -> str:
+    """Return the path of the checkpoint of a run that writes master_file."""
+    return master_file + CHECKPOINT_SUFFIX
+
+
+def input_identity(transactions_file: str) -> Dict:
+    """Return what identifies a merged transaction file: its path, size and modification time."""
+    located = archive.split_path(transactions_file)
+    st = os.stat(located[0] if located else transactions_file)
+    return {"path": os.path.abspath(transactions_file), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def account_rows(accounts_list) -> List[Tuple]:
+    """Return the fields of every account of an AccountsList, in ascending account-number order."""
+    return [tuple(acc[field] for field in ACCOUNT_FIELDS) for acc in accounts_list.current_accounts]
+
+
+def account_baseline(accounts_list):
+    """
+    Return the transaction counts the accounts were loaded with, for account
+    stores that keep them (columnar.ColumnarAccountsList), or None.
+    """
+    loaded = getattr(accounts_list, "loaded_count", None)
+    return None if loaded is None else loaded.copy()
+
+
+def restore_accounts(accounts_list, rows: List[Tuple], baseline=None):
+    """Replace the accounts of an AccountsList with rows from account_rows() (and account_baseline())."""
+    accounts_list.current_accounts = [Account(*row) for row in rows]
+    accounts_list.master_accounts  = accounts_list.current_accounts
+    if baseline is not None:
+        accounts_list.loaded_count[:] = baseline
+
+
+def save(path: str, state: Dict):
+    """
+    Write a checkpoint atomically, keeping the previous one as path + ".1".
+
+    Args:
+        path:  The checkpoint path (see checkpoint_path).
+        state: The run's state: "transactions" (input_identity), "offset",
+               "line_number", "records" (transactions applied so far),
+               "accounts" (account_rows), "baseline" (account_baseline) and
+               "rejects" (RejectSink.checkpoint).
+    """
+    data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp  = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, hashlib.sha256(data).digest()))
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    if os.path.exists(path):
+        os.replace(path, path + ".1")
+    os.replace(tmp, path)
+
+
+def load(path: str, transactions_file: str) -> Optional[Dict]:
+    """
+    Return the latest valid checkpoint for a merged transaction file.
+
+    The checkpoint at path is tried first, then the previous one (path +
+    ".1"). Damaged checkpoints, and ones taken while reading another merged
+    file (or this one before it changed), are skipped with a warning.
+
+    Returns:
+        The state passed to save(), or None if there is no valid checkpoint.
+    """
+    identity = input_identity(transactions_file)
+    for candidate in (path, path + ".1"):
+        if not os.path.exists(candidate):
+            continue
+        with open(candidate, "rb") as f:
+            header = f.read(HEADER.size)
+            data   = f.read()
+        if len(header) != HEADER.size:
+            print(f"Warning: checkpoint {candidate} is damaged; skipped.")
+            continue
+        magic, version, digest = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or hashlib.sha256(data).digest() != digest:
+            print(f"Warning: checkpoint {candidate} is damaged or from another version; skipped.")
+            continue
+        state = pickle.loads(data)
+        if state["transactions"] != identity:
+            print(f"Warning: checkpoint {candidate} is for another merged transaction file; skipped.")
+            continue
+        return state
+    return None
+
+
+def remove(path: str):
+    """Delete the checkpoints of a run that has finished."""
+    for candidate in (path, path + ".1", path + ".tmp"):
+        if os.path.exists(candidate):
+            os.remove(candidate)
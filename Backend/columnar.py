@@ -0,0 +1,494 @@
+"""
+backend/columnar.py
+
+Columnar, NumPy-backed account store for the Banking System Back End.
+
+ColumnarAccountsList is an alternative storage engine for AccountsList. Instead
+of one record object per account it keeps every field in its own array,
+indexed directly by the 5-digit account number:
+
+    present           bool   – slot holds an account
+    balance           int64  – balance in integer cents
+    status            S1     – A (active) or D (disabled)
+    plan              S2     – SP or NP
+    transaction_count int64  – transactionCount field
+    names             list   – account holder names
+
+The transaction handlers in transactions.py run against it unchanged: account
+lookups return AccountRow views that read and write the arrays through the
+same dict-style keys as an Account record. End-of-day reporting helpers
+(total_balance, fee_totals, validate) operate on whole arrays at once.
+
+NumPy is an optional dependency. Install it with `pip install numpy` (or the
+project's `columnar` extra) to use this engine.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this engine needs it.
+    np = None
+
+import master_snapshot
+import stdio
+from lists import ACCOUNT_NUMBER_SPACE, AccountsList, account_slot
+from master_file import MASTER_RECORD_WIDTH
+from money import format_cents
+from registry import HandlerRegistry
+from transactions import TRANSACTION_FEE
+
+
+# Largest balance the 8-character balance field can hold, in cents.
+MAX_BALANCE_CENTS = 9999999
+
+# Largest value the 4-character transactionCount field can hold.
+MAX_TRANSACTION_COUNT = 9999
+
+
+class AccountRow:
+    """Dict-style view of one account slot in a ColumnarAccountsList."""
+
+    __slots__ = ("_store", "_slot")
+
+    def __init__(self, store: "ColumnarAccountsList", slot: int):
+        self._store = store
+        self._slot  = slot
+
+    def __getitem__(self, key: str) -> Any:
+        store, slot = self._store, self._slot
+        if key == "balance":
+            return int(store.balance[slot])
+        if key == "status":
+            return store.status[slot].decode()
+        if key == "plan":
+            return store.plan[slot].decode()
+        if key == "accountNumber":
+            return f"{slot:05d}"
+        if key == "accountName":
+            return store.names[slot]
+        if key == "transactionCount":
+            return int(store.transaction_count[slot])
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        store, slot = self._store, self._slot
+        if key == "balance":
+            store.balance[slot] = value
+        elif key == "status":
+            store.status[slot] = value.encode()
+        elif key == "plan":
+            store.plan[slot] = value.encode()
+        elif key == "accountName":
+            store.names[slot] = value
+        elif key == "transactionCount":
+            store.transaction_count[slot] = value
+        else:
+            raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the field value for key, or default if there is no such field."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the row as a plain account dict."""
+        return {key: self[key] for key in
+                ("accountNumber", "accountName", "status", "balance", "plan", "transactionCount")}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, AccountRow):
+            return self._store is other._store and self._slot == other._slot
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"AccountRow({self.to_dict()!r})"
+
+
+def _digits(block: "np.ndarray") -> "np.ndarray":
+    """Convert a 2-D block of ASCII digit bytes into one int64 per row."""
+    weights = 10 ** np.arange(block.shape[1] - 1, -1, -1, dtype=np.int64)
+    return (block.astype(np.int64) - ord("0")) @ weights
+
+
+def _snapshot_dtype() -> "np.dtype":
+    """Return the NumPy record type of a master snapshot record (master_snapshot.RECORD)."""
+    return np.dtype([("number", "<u4"), ("name", "S20"), ("status", "S1"),
+                     ("balance", "<i8"), ("plan", "S2"), ("count", "<u4")])
+
+
+class ColumnarAccountsList(AccountsList):
+    """AccountsList whose accounts live in parallel NumPy arrays."""
+
+    def __init__(self, current_file: Optional[str] = None, master_file: Optional[str] = None,
+                 registry: Optional[HandlerRegistry] = None, snapshot: bool = False):
+        """
+        Initialize file paths and empty account arrays.
+
+        Args:
+            current_file: Path to the current accounts file.
+            master_file:  Path to the master accounts file.
+            registry:     Transaction handlers (see AccountsList).
+            snapshot:     Load from and keep up the master file's binary
+                          snapshot (see AccountsList).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("The columnar account store requires NumPy (pip install numpy).")
+        super().__init__(current_file=current_file, master_file=master_file, registry=registry,
+                         snapshot=snapshot)
+        self._by_number = None  # the arrays below replace the record table
+        self._clear()
+
+    def _clear(self):
+        """Reset every column to an empty account space."""
+        size = ACCOUNT_NUMBER_SPACE
+        self.present           = np.zeros(size, dtype=bool)
+        self.balance           = np.zeros(size, dtype=np.int64)
+        self.status            = np.full(size, b"A", dtype="S1")
+        self.plan              = np.full(size, b"NP", dtype="S2")
+        self.transaction_count = np.zeros(size, dtype=np.int64)
+        # transactionCount as loaded, so fee_totals can report this run's fees.
+        self.loaded_count      = np.zeros(size, dtype=np.int64)
+        self.names: List[Optional[str]] = [None] * size
+        self._active_by_name = {}
+        self._ordered = []
+
+    def _rebuild_name_index(self):
+        """Rebuild the holder-name index from the active accounts, ascending."""
+        by_name: Dict[str, List[int]] = {}
+        names = self.names
+        for slot in np.flatnonzero(self.present & (self.status == b"A")).tolist():
+            by_name.setdefault(names[slot].strip(), []).append(slot)
+        self._active_by_name = by_name
+
+    # Account views
+    @property
+    def current_accounts(self) -> List[AccountRow]:
+        """Row views of every account, in ascending account-number order."""
+        if self._ordered is None:
+            self._ordered = [AccountRow(self, slot) for slot in np.flatnonzero(self.present).tolist()]
+        return self._ordered
+
+    @current_accounts.setter
+    def current_accounts(self, accounts: List[Dict]):
+        """
+        Replace every account with the given records or dicts.
+
+        The transaction counts the accounts were loaded with (see fee_totals)
+        are kept, so fees are still counted from the master file after the
+        accounts are replaced mid-run (sharded apply, checkpoint restore).
+        """
+        baseline = self.loaded_count
+        self._clear()
+        self.loaded_count = baseline
+        for acc in accounts:
+            slot = self._require_slot(acc)
+            if self.present[slot]:
+                print(f"Warning: duplicate account number {acc['accountNumber']} ignored.")
+                continue
+            self._store(slot, acc)
+        self._rebuild_name_index()
+        self._ordered = None
+
+    def _store(self, slot: int, account: Dict):
+        """Copy one account record into the columns at slot."""
+        self.present[slot]           = True
+        self.names[slot]             = account["accountName"]
+        self.status[slot]            = account["status"].encode()
+        self.balance[slot]           = account["balance"]
+        self.plan[slot]              = account.get("plan", "NP").encode()
+        self.transaction_count[slot] = account.get("transactionCount", 0)
+
+    def get_account_by_id(self, account_id: str) -> Optional[AccountRow]:
+        """
+        Return a row view of the account with the given number.
+
+        Args:
+            account_id: Account number (zero-padded to 5 digits if necessary).
+
+        Returns:
+            An AccountRow, or None if no account was found.
+        """
+        slot = account_slot(account_id)
+        if slot is None or not self.present[slot]:
+            return None
+        return AccountRow(self, slot)
+
+    def add_account(self, account: Dict):
+        """
+        Add a new account to the columns and index it.
+
+        Args:
+            account: The Account record or dict to add.
+
+        Raises:
+            ValueError: If the account number is invalid or already in use.
+        """
+        slot = self._require_slot(account)
+        if self.present[slot]:
+            raise ValueError(f"Account number {account['accountNumber']} already exists")
+        self._store(slot, account)
+        self.loaded_count[slot] = 0
+        self._ordered = None
+        if account["status"] == "A":
+            slots = self._active_by_name.setdefault(account["accountName"].strip(), [])
+            slots.insert(int(np.searchsorted(slots, slot)), slot)
+
+    def remove_account(self, account: AccountRow):
+        """
+        Remove an account from the columns and from the holder-name index.
+
+        Args:
+            account: The row to remove (as returned by get_account_by_id).
+        """
+        slot = self._require_slot(account)
+        if not self.present[slot]:
+            raise ValueError(f"Account {account['accountNumber']} is not in this list")
+        self._unindex_name(account, slot)
+        self.present[slot] = False
+        self.names[slot]   = None
+        self._ordered = None
+
+    def disable_account(self, account: AccountRow):
+        """
+        Mark an account as disabled (D) and drop it from the holder-name index.
+
+        Args:
+            account: The row to disable (as returned by get_account_by_id).
+        """
+        slot = self._require_slot(account)
+        self.status[slot] = b"D"
+        self._unindex_name(account, slot)
+
+    def get_active_account_by_name(self, account_name: str) -> Optional[AccountRow]:
+        """
+        Return a row view of the holder's first active account.
+
+        Args:
+            account_name: Account holder name (surrounding spaces are ignored).
+
+        Returns:
+            The matching AccountRow, or None if the holder has no active account.
+        """
+        name  = account_name.strip()
+        slots = self._active_by_name.get(name)
+        while slots:
+            slot = slots[0]
+            if self.present[slot] and self.status[slot] == b"A" and self.names[slot].strip() == name:
+                return AccountRow(self, slot)
+            del slots[0]
+        return None
+
+    # File I/O
+    def read_old_master_accounts(self, file_path: Optional[str] = None):
+        """
+        Load the master bank accounts file into the columns.
+
+        A master file made only of fixed-width records is decoded column by
+        column with array operations. Anything else (blank lines, CRLF line
+        endings, duplicate numbers) falls back to the line-by-line reader.
+
+        With snapshots enabled, an up-to-date binary snapshot is copied
+        straight into the columns instead, and otherwise rebuilt from them
+        (see master_snapshot.py).
+
+        An in-place patch left unfinished by an interrupted run is completed
+        or rolled back first (see journal.py).
+
+        Args:
+            file_path: Override the default master accounts file path.
+        """
+        path = file_path or self.master_file
+        self._recover_patches(path)
+        if not os.path.exists(path):
+            print("Warning: master accounts file not found:", path)
+            return
+        if not (self.snapshot and self._load_snapshot(path)):
+            with open(path, "rb") as f:
+                data = f.read()
+            if not self._load_fixed_width(data):
+                super().read_old_master_accounts(path)
+            elif self.snapshot:
+                self._write_snapshot(path)
+        self.loaded_count[:] = self.transaction_count
+        self.master_accounts = self.current_accounts
+
+    def _load_snapshot(self, path: str) -> bool:
+        """Copy the records of the master file's snapshot into the columns; False if it is not valid."""
+        with master_snapshot.mapped_records(path) as records:
+            if records is None:
+                return False
+            rows    = np.frombuffer(records, dtype=_snapshot_dtype())
+            numbers = rows["number"].astype(np.intp)
+            self._clear()
+            self.present[numbers]           = True
+            self.balance[numbers]           = rows["balance"]
+            self.status[numbers]            = rows["status"]
+            self.plan[numbers]              = rows["plan"]
+            self.transaction_count[numbers] = rows["count"]
+            raw_names = rows["name"].tolist()
+            del rows  # the mapping cannot be closed while an array still views it
+        names = self.names
+        for slot, name in zip(numbers.tolist(), raw_names):
+            names[slot] = name.rstrip().decode()
+        self._rebuild_name_index()
+        self._ordered = None
+        return True
+
+    def _write_snapshot(self, path: str):
+        """Rebuild the binary snapshot of the master file at path, packing the columns directly."""
+        master_snapshot.write_snapshot(path, self._snapshot_records())
+
+    def _snapshot_records(self) -> Optional[bytes]:
+        """Pack the accounts as snapshot records, or None if they cannot be (see master_snapshot.pack_accounts)."""
+        slots   = np.flatnonzero(self.present)
+        balance = self.balance[slots]
+        count   = self.transaction_count[slots]
+        if self.present[0] or not (
+                (balance >= master_snapshot.MIN_BALANCE_CENTS).all()
+                and (balance <= master_snapshot.MAX_BALANCE_CENTS).all()
+                and (count >= 0).all() and (count <= master_snapshot.MAX_TRANSACTION_COUNT).all()
+                and (np.char.str_len(self.status[slots]) == 1).all()
+                and (np.char.str_len(self.plan[slots]) == 2).all()):
+            return None
+        names = []
+        for slot in slots.tolist():
+            name = self.names[slot]
+            if len(name) > 20 or not name.isascii():
+                return None
+            names.append(name.strip().encode().ljust(20))
+        rows = np.zeros(len(slots), dtype=_snapshot_dtype())
+        rows["number"]  = slots
+        rows["name"]    = names
+        rows["status"]  = self.status[slots]
+        rows["balance"] = balance
+        rows["plan"]    = self.plan[slots]
+        rows["count"]   = count
+        return rows.tobytes()
+
+    def _load_fixed_width(self, data: bytes) -> bool:
+        """Decode fixed-width master records with array operations; False if not possible."""
+        if not data or len(data) % MASTER_RECORD_WIDTH:
+            return False
+        rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, MASTER_RECORD_WIDTH)
+        if (rows[:, -1] != ord("\n")).any() or (rows >= 0x80).any():
+            return False
+
+        # Stop at the END_OF_FILE (00000) sentinel, as the line reader does.
+        sentinel = np.flatnonzero((rows[:, 0:5] == ord("0")).all(axis=1))
+        if len(sentinel):
+            rows = rows[:sentinel[0]]
+
+        digit_columns = np.r_[0:5, 29:34, 35:37, 41:45]
+        digits = rows[:, digit_columns]
+        if ((digits < ord("0")) | (digits > ord("9"))).any() or (rows[:, 34] != ord(".")).any():
+            return False
+        numbers = _digits(rows[:, 0:5])
+        if len(np.unique(numbers)) != len(numbers):
+            return False
+
+        self._clear()
+        self.present[numbers]           = True
+        self.balance[numbers]           = _digits(rows[:, 29:34]) * 100 + _digits(rows[:, 35:37])
+        self.status[numbers]            = np.ascontiguousarray(rows[:, 27:28]).view("S1").ravel()
+        self.plan[numbers]              = np.ascontiguousarray(rows[:, 38:40]).view("S2").ravel()
+        self.transaction_count[numbers] = _digits(rows[:, 41:45])
+        raw_names = np.ascontiguousarray(rows[:, 6:26]).view("S20").ravel().tolist()
+        for slot, name in zip(numbers.tolist(), raw_names):
+            self.names[slot] = name.decode("ascii").strip()
+        self._rebuild_name_index()
+        self._ordered = None
+        return True
+
+    def _format_lines(self, with_plan: bool) -> List[str]:
+        """Format every account as a current (or master) accounts file line."""
+        slots    = np.flatnonzero(self.present)
+        balances = self.balance[slots].tolist()
+        statuses = self.status[slots].tolist()
+        plans    = self.plan[slots].tolist()
+        counts   = self.transaction_count[slots].tolist()
+        names    = self.names
+        lines = []
+        for slot, balance, status, plan, count in zip(slots.tolist(), balances, statuses, plans, counts):
+            line = f"{slot:05d} {names[slot]:<20} {status.decode()} {format_cents(balance)}"
+            if with_plan:
+                line += f" {plan.decode()} {count:04d}"
+            lines.append(line + "\n")
+        return lines
+
+    def write_new_current_accounts(self, file_path: Optional[str] = None):
+        """
+        Write the accounts to the current accounts file.
+
+        Args:
+            file_path: Override the default current accounts file path.
+        """
+        with stdio.open_output(file_path or self.current_file) as f:
+            f.writelines(self._format_lines(with_plan=False))
+            f.write("00000 END_OF_FILE          A 00000.00\n")
+
+    def write_new_master_accounts(self, file_path: Optional[str] = None):
+        """
+        Write the accounts to the master accounts file.
+
+        Args:
+            file_path: Override the default master accounts file path.
+        """
+        path = file_path or self.master_file
+        with stdio.open_output(path) as f:
+            f.writelines(self._format_lines(with_plan=True))
+        if self.snapshot:
+            self._write_snapshot(path)
+
+    # Bulk reporting
+    def total_balance(self) -> int:
+        """Return the sum of all account balances, in cents."""
+        return int(self.balance[self.present].sum())
+
+    def fee_totals(self) -> Dict[str, int]:
+        """
+        Return the transaction fees charged since the accounts were loaded.
+
+        Fees are derived from each account's transactionCount increase and its
+        current plan's fee rate.
+
+        Returns:
+            Dict mapping plan code to the fees charged on that plan, in cents.
+        """
+        charged = np.where(self.present, self.transaction_count - self.loaded_count, 0)
+        return {
+            plan: int(charged[self.plan == plan.encode()].sum()) * fee
+            for plan, fee in TRANSACTION_FEE.items()
+        }
+
+    def validate(self) -> Dict[str, List[str]]:
+        """
+        Check every account against the file-format and business limits.
+
+        Returns:
+            Dict mapping a problem name to the account numbers that have it:
+            negative_balance, balance_limit, bad_status, bad_plan and
+            count_limit. Empty lists mean no account has that problem.
+        """
+        present = self.present
+        checks = {
+            "negative_balance": self.balance < 0,
+            "balance_limit":    self.balance > MAX_BALANCE_CENTS,
+            "bad_status":       ~np.isin(self.status, [b"A", b"D"]),
+            "bad_plan":         ~np.isin(self.plan, [b"SP", b"NP"]),
+            "count_limit":      (self.transaction_count < 0) | (self.transaction_count > MAX_TRANSACTION_COUNT),
+        }
+        return {
+            problem: [f"{slot:05d}" for slot in np.flatnonzero(present & mask).tolist()]
+            for problem, mask in checks.items()
+        }
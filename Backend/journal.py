@@ -0,0 +1,122 @@
+"""
+backend/journal.py
+
+Crash-safe in-place patching of fixed-width account files.
+
+A patch is a list of (offset, old bytes, new bytes) edits to one file. Before
+the file is touched, every edit is written to a journal next to it
+(<file>.journal) and the journal is ended with a COMMIT line and flushed to
+disk; only then are the edits written to the file itself, after which the
+journal is removed.
+
+If the Back End stops part-way through, recover() puts the file back into a
+consistent state on the next run:
+  • a journal without COMMIT was never applied, so it is discarded and the
+    file is left exactly as it was (rolled back);
+  • a committed journal is applied again from the start (completed). Applying
+    an edit twice is harmless because each edit writes the full new record.
+
+Journal format (text, one edit per line, bytes as hex):
+    PATCH <file size>
+    <offset> <old bytes> <new bytes>
+    ...
+    COMMIT
+"""
+
+import os
+from typing import List, Optional, Tuple
+
+# One in-place edit: (byte offset, bytes expected there now, replacement bytes).
+Patch = Tuple[int, bytes, bytes]
+
+JOURNAL_SUFFIX = ".journal"
+
+
+def journal_path(path: str) -> str:
+    """Return the path of the journal kept for a patched file."""
+    return path + JOURNAL_SUFFIX
+
+
+def apply_patches(path: str, patches: List[Patch]):
+    """
+    Journal and apply in-place edits to a file.
+
+    Args:
+        path:    The file to patch.
+        patches: The edits; each new value must be as long as the old one.
+
+    Raises:
+        ValueError: If an edit would change the length of the file.
+    """
+    if not patches:
+        return
+    for offset, old, new in patches:
+        if len(old) != len(new):
+            raise ValueError(f"Patch at offset {offset} changes the record length")
+    jpath = journal_path(path)
+    with open(jpath, "w") as journal:
+        journal.write(f"PATCH {os.path.getsize(path)}\n")
+        for offset, old, new in patches:
+            journal.write(f"{offset} {old.hex()} {new.hex()}\n")
+        _sync(journal)
+        journal.write("COMMIT\n")
+        _sync(journal)
+    _write_patches(path, patches)
+    os.remove(jpath)
+
+
+def recover(path: str) -> Optional[str]:
+    """
+    Finish or undo a patch left behind by an interrupted run.
+
+    Args:
+        path: The patched file.
+
+    Returns:
+        "completed" if a committed patch was re-applied, "rolled back" if an
+        uncommitted one was discarded, or None if there was no journal.
+
+    Raises:
+        ValueError: If the file no longer matches a committed journal (it was
+                    changed by something else since), in which case the
+                    journal is kept for inspection.
+    """
+    jpath = journal_path(path)
+    if not os.path.exists(jpath):
+        return None
+    with open(jpath, "r") as journal:
+        lines = journal.read().splitlines()
+    if not lines or lines[-1] != "COMMIT" or not os.path.exists(path):
+        os.remove(jpath)
+        return "rolled back"
+
+    size    = int(lines[0].split()[1])
+    patches = []
+    for entry in lines[1:-1]:
+        offset, old, new = entry.split()
+        patches.append((int(offset), bytes.fromhex(old), bytes.fromhex(new)))
+    if os.path.getsize(path) != size:
+        raise ValueError(f"{path} does not match its patch journal {jpath}")
+    with open(path, "rb") as f:
+        for offset, old, new in patches:
+            f.seek(offset)
+            if f.read(len(old)) not in (old, new):
+                raise ValueError(f"{path} does not match its patch journal {jpath}")
+    _write_patches(path, patches)
+    os.remove(jpath)
+    return "completed"
+
+
+def _write_patches(path: str, patches: List[Patch]):
+    """Write each edit at its offset and flush the file to disk."""
+    with open(path, "r+b") as f:
+        for offset, _, new in patches:
+            f.seek(offset)
+            f.write(new)
+        _sync(f)
+
+
+def _sync(f):
+    """Flush a file's buffers through to the disk."""
+    f.flush()
+    os.fsync(f.fileno())
@@ -8,14 +8,15 @@ tracks all in-memory changes made by transaction handlers, and writes updated
 records back out at the end of each Back End run.
 
 TransactionsList loads the merged transaction file produced by the Front End
-and exposes the records as an iterator for the main processing loop.
+and exposes the records as an iterator for the main processing loop, either
+from an in-memory list or streamed lazily from the file.
 
 Current bank accounts file format (one record per line):
     NNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPP
     NNNNN – 5-digit account number
     AAAAAAAAAAAAAAAAAAAA – account holder name (up to 20 chars)
     S     – status: A (active) or D (disabled)
-    PPPPPPPP – balance (8 chars, 2 decimal places)
+    PPPPPPPP – balance (8 chars, 2 decimal places; held in memory as integer cents)
     (no payment-plan field in current accounts)
 
 Master bank accounts file format adds a trailing two-character payment plan:
@@ -26,18 +27,114 @@ Merged transaction file format (one record per line):
     CC    – 2-digit transaction code
     AAAAA… – account holder name (up to 20 chars)
     NNNNN – 5-digit account number
-    PPPPP… – money amount (8 chars)
+    PPPPP… – money amount (8 chars; held in memory as integer cents)
     MM    – miscellaneous field (2 chars, e.g. first 2 digits of FROM account)
 """
 
+import gc
 import os
-from typing import List, Dict, Optional
+import struct
+from contextlib import contextmanager
+from bisect import bisect_left, insort
+from itertools import chain
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set
+
+import journal
+import master_snapshot
+import stdio
+from master_file import MASTER_RECORD_WIDTH, MasterFile
+from money import format_cents, is_digits, parse_cents
+from records import Account, Transaction
+from registry import HandlerRegistry
+from rejects import MALFORMED_RECORD, Reject, RejectSink
+
+
+# Length of a merged transaction record line, without its line ending.
+TRANSACTION_RECORD_LENGTH = 41
+
+# Fixed column layout of a merged transaction record (0-based, end-exclusive):
+#   CC AAAAAAAAAAAAAAAAAAAA NNNNN PPPPPPPP MM
+CODE_COLUMNS    = (0, 2)
+NAME_COLUMNS    = (3, 23)
+NUMBER_COLUMNS  = (24, 29)
+MONEY_COLUMNS   = (30, 38)
+MISC_COLUMNS    = (39, 41)
+SPACE_COLUMNS   = (2, 23, 29, 38)
+DIGIT_COLUMNS   = (0, 1, 24, 25, 26, 27, 28, 30, 31, 32, 33, 34, 36, 37)
+DECIMAL_COLUMN  = 35
+
+# Whole-record unpackers for batches of identical-width lines, keyed by line
+# ending. Each yields (code, name, number, money, misc) as bytes.
+_RECORD_STRUCTS = {
+    b"\n":   struct.Struct("2sx20sx5sx8sx2sx"),
+    b"\r\n": struct.Struct("2sx20sx5sx8sx2s2x"),
+}
+
+# Account numbers are a fixed 5-digit space (00000-99999), so every account can
+# be addressed directly by its numeric value instead of searched for.
+ACCOUNT_NUMBER_SPACE = 100000
+
+
+# First bytes of a binary transaction file (see binary_transactions.py).
+BINARY_MAGIC = b"BTXF"
+
+# Start of the end-of-file record that ends a merged transaction file; a
+# merged stream read from standard input must end with it to be complete.
+END_OF_STREAM_PREFIX = b"00 END_OF_FILE"
+
+# Final line of the current accounts file.
+CURRENT_ACCOUNTS_SENTINEL = "00000 END_OF_FILE          A 00000.00\n"
+
+# Width of one current accounts record, including its newline.
+CURRENT_RECORD_WIDTH = 38
+
+
+def account_slot(account_id) -> Optional[int]:
+    """
+    Convert an account number into its slot in the direct-addressed table.
+
+    Args:
+        account_id: Account number as a string or int (zero-padded to 5
+                    digits if necessary).
+
+    Returns:
+        The integer slot 0-99999, or None if the value is not a valid
+        5-digit account number.
+    """
+    key = str(account_id).zfill(5)
+    if len(key) != 5 or not key.isdigit():
+        return None
+    return int(key)
+
+
+def _current_line(acc: Dict) -> str:
+    """Format an account as a current accounts file line."""
+    return (
+        f"{acc['accountNumber'].zfill(5)} "
+        f"{acc['accountName']:<20} "
+        f"{acc['status']} "
+        f"{format_cents(acc['balance'])}\n"
+    )
+
+
+def _master_line(acc: Dict) -> str:
+    """Format an account as a master accounts file line."""
+    return (
+        f"{acc['accountNumber'].zfill(5)} "
+        f"{acc['accountName']:<20} "
+        f"{acc['status']} "
+        f"{format_cents(acc['balance'])} "
+        f"{acc.get('plan', 'NP')} "
+        f"{acc['transactionCount']:04.0f}\n"
+    )
 
 
 class AccountsList:
     """Container for bank accounts loaded from the current and master account files."""
 
-    def __init__(self, current_file: Optional[str] = None, master_file: Optional[str] = None):
+    def __init__(self, current_file: Optional[str] = None, master_file: Optional[str] = None,
+                 lazy: bool = False, patch: bool = False,
+                 registry: Optional[HandlerRegistry] = None, snapshot: bool = False):
         """
         Initialize file paths and empty account lists.
 
@@ -46,16 +143,121 @@ class AccountsList:
                           current_accounts.txt in the repository root.
             master_file:  Path to the master accounts file. Defaults to
                           master_accounts.txt in the repository root.
+            lazy:         If True, read_old_master_accounts() memory-maps a
+                          fixed-width master file and decodes each account
+                          only when it is first looked up (see master_file.py).
+            patch:        If True (implies lazy), the writers update existing
+                          account files in place, rewriting only the records
+                          that changed (see _patch_file).
+            registry:     Transaction handlers used by perform_transaction().
+                          Defaults to a new registry of the built-in handlers.
+            snapshot:     If True, the master file is loaded from its binary
+                          snapshot while that is up to date, and the snapshot
+                          is rebuilt whenever the master file is read or
+                          written (see master_snapshot.py). Ignored in lazy mode.
         """
+        self.registry = registry if registry is not None else HandlerRegistry()
+        # Reject log for transactions the handlers reject; None prints ERROR
+        # messages instead (see rejects.py).
+        self.rejects: Optional[RejectSink] = None
+        self.lazy  = lazy or patch
+        self.patch = patch
+        self.snapshot = snapshot and not self.lazy
         base_dir = os.path.join(os.path.dirname(__file__), "..")
         self.current_file = current_file or os.path.join(base_dir, "current_accounts.txt")
         self.master_file  = master_file  or os.path.join(base_dir, "master_accounts.txt")
-        self.current_accounts: List[Dict] = []
-        self.master_accounts:  List[Dict] = []
+        self.master_accounts:  List[Account] = []
+        # Direct-addressed, ordered account store: slot N holds the account
+        # numbered N (or None), so walking the table yields ascending order.
+        self._by_number: List[Optional[Dict]] = [None] * ACCOUNT_NUMBER_SPACE
+        # Holder name -> slots of that holder's active accounts, ascending.
+        self._active_by_name: Optional[Dict[str, List[int]]] = {}
+        # Cached in-order list view of the table; None when it must be rebuilt.
+        self._ordered: Optional[List[Dict]] = []
+        # Lazy mode: the mapped master file behind the table. A slot that is
+        # None in the table may still hold an undecoded account in the file,
+        # unless it is listed in _deleted. The name index is built on first use.
+        self._source:  Optional[MasterFile] = None
+        self._deleted: Set[int] = set()
+
+    @property
+    def current_accounts(self) -> List[Dict]:
+        """
+        The accounts in ascending account-number order.
+
+        The list is a view of the account table, rebuilt only after accounts
+        are added or removed. Use add_account/remove_account to change which
+        accounts exist; the records themselves may be modified in place.
+        In lazy mode this decodes every account still left in the master file.
+        """
+        if self._source is not None:
+            self._decode_all()
+        if self._ordered is None:
+            self._ordered = [acc for acc in self._by_number if acc is not None]
+        return self._ordered
+
+    @current_accounts.setter
+    def current_accounts(self, accounts: List[Dict]):
+        """Replace every account and rebuild the account-number and holder-name indexes."""
+        table: List[Optional[Dict]] = [None] * ACCOUNT_NUMBER_SPACE
+        for acc in accounts:
+            slot = self._require_slot(acc)
+            if table[slot] is not None:
+                print(f"Warning: duplicate account number {acc['accountNumber']} ignored.")
+                continue
+            table[slot] = acc
+        by_name: Dict[str, List[int]] = {}
+        for slot, acc in enumerate(table):
+            if acc is not None and acc["status"] == "A":
+                by_name.setdefault(acc["accountName"].strip(), []).append(slot)
+        self._drop_source()
+        self._by_number = table
+        self._active_by_name = by_name
+        self._ordered = None
+
+    def _set_ordered_accounts(self, accounts: List[Account]):
+        """
+        Replace every account with records known to have valid, unique account
+        numbers in ascending order (as a snapshot holds them), skipping the
+        checks and the table scan of the current_accounts setter.
+        """
+        table: List[Optional[Dict]] = [None] * ACCOUNT_NUMBER_SPACE
+        by_name: Dict[str, List[int]] = {}
+        for acc in accounts:
+            slot = int(acc.accountNumber)
+            table[slot] = acc
+            if acc.status == "A":
+                by_name.setdefault(acc.accountName, []).append(slot)
+        self._drop_source()
+        self._by_number = table
+        self._active_by_name = by_name
+        self._ordered = list(accounts)
+
+    @staticmethod
+    def _require_slot(account: Dict) -> int:
+        """Return the table slot for an account, rejecting invalid account numbers."""
+        slot = account_slot(account["accountNumber"])
+        if slot is None:
+            raise ValueError(f"Invalid account number: {account['accountNumber']!r}")
+        return slot
+
+    def _unindex_name(self, account: Dict, slot: int):
+        """Drop an account from the active holder-name index, if present."""
+        if self._active_by_name is None:
+            return
+        name  = account["accountName"].strip()
+        slots = self._active_by_name.get(name)
+        if not slots:
+            return
+        i = bisect_left(slots, slot)
+        if i < len(slots) and slots[i] == slot:
+            del slots[i]
+        if not slots:
+            del self._active_by_name[name]
 
     def read_old_master_accounts(self, file_path: Optional[str] = None):
         """
-        Read the master bank accounts file into self.master_accounts.
+        Read the master bank accounts file into self.master_accounts as Account records.
 
         Expected record format:
             NNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPP MM TTTT
@@ -63,14 +265,40 @@ class AccountsList:
         Uses fixed-position parsing so account names with spaces are handled
         correctly. Stops at the END_OF_FILE (00000) sentinel line.
 
+        In lazy mode a fixed-width, sorted master file is memory-mapped
+        instead: no record is decoded until its account is looked up, and
+        self.master_accounts stays empty. Other files are read as usual.
+
+        With snapshots enabled, an up-to-date binary snapshot of the file is
+        loaded instead of parsing it; otherwise the snapshot is rebuilt from
+        the parsed records (see master_snapshot.py).
+
+        An in-place patch left unfinished by an interrupted run is completed
+        or rolled back first (see journal.py).
+
         Args:
             file_path: Override the default master accounts file path.
         """
         path = file_path or self.master_file
         self.master_accounts = []
+        self._recover_patches(path)
         if not os.path.exists(path):
             print("Warning: master accounts file not found:", path)
             return
+        if self.lazy:
+            source = MasterFile.open(path)
+            if source is not None:
+                self.current_accounts = []
+                self._source = source
+                self._active_by_name = None
+                return
+        if self.snapshot:
+            with gc_paused():
+                accounts = master_snapshot.read_snapshot(path)
+                if accounts is not None:
+                    self.master_accounts = accounts
+                    self._set_ordered_accounts(accounts)
+                    return
         with open(path, "r") as f:
             for line in f:
                 line = line.rstrip("\n")
@@ -78,18 +306,30 @@ class AccountsList:
                     continue
                 if line[0:5].strip() == "00000":  # END_OF_FILE sentinel
                     break
-                account = {
-                    "accountNumber": line[0:5].strip(),
-                    "accountName": line[6:26].strip(),
-                    "status": line[27:28].strip(),
-                    "balance": float(line[29:37].strip()),
-                    "plan": line[38:40].strip() if len(line) >= 40 else "NP",
-                    "transactionCount" : int(line[41:45].strip())
-                }
-                self.master_accounts.append(account)
+                self.master_accounts.append(Account(
+                    line[0:5].strip(),
+                    line[6:26].strip(),
+                    line[27:28].strip(),
+                    parse_cents(line[29:37]),
+                    line[38:40].strip() if len(line) >= 40 else "NP",
+                    int(line[41:45].strip()),
+                ))
 
         # Master accounts are the authoritative source for Back End processing.
-        self.current_accounts = [dict(acc) for acc in self.master_accounts]
+        # The current view shares the same records rather than copying them, so
+        # master_accounts reflects every change applied during the run.
+        self.current_accounts = self.master_accounts
+        if self.snapshot:
+            self._write_snapshot(path)
+
+    def _recover_patches(self, master_path: str):
+        """Complete or roll back in-place patches of the account files left by an interrupted run (see journal.py)."""
+        for patched in (master_path, self.current_file):
+            if patched is None or stdio.is_stdio(patched):
+                continue
+            outcome = journal.recover(patched)
+            if outcome:
+                print(f"Warning: interrupted update of {patched} {outcome}.")
 
     def write_new_current_accounts(self, file_path: Optional[str] = None):
         """
@@ -102,17 +342,15 @@ class AccountsList:
             file_path: Override the default current accounts file path.
         """
         path = file_path or self.current_file
+        if self._source is not None:
+            if not (self.patch and self._patch_file(path, with_plan=False)):
+                self._write_merged(path, with_plan=False)
+            return
 
-        with open(path, "w") as f:
+        with stdio.open_output(path) as f:
             for acc in self.current_accounts:
-                line = (
-                    f"{acc['accountNumber'].zfill(5)} "
-                    f"{acc['accountName']:<20} "
-                    f"{acc['status']} "
-                    f"{acc['balance']:08.2f}\n"
-                )
-                f.write(line)
-            f.write("00000 END_OF_FILE          A 00000.00\n")
+                f.write(_current_line(acc))
+            f.write(CURRENT_ACCOUNTS_SENTINEL)
 
     def write_new_master_accounts(self, file_path: Optional[str] = None):
         """
@@ -125,18 +363,111 @@ class AccountsList:
             file_path: Override the default master accounts file path.
         """
         path = file_path or self.master_file
+        if self._source is not None:
+            if not (self.patch and self._patch_file(path, with_plan=True)):
+                self._write_merged(path, with_plan=True)
+            return
 
-        with open(path, "w") as f:
+        with stdio.open_output(path) as f:
             for acc in self.current_accounts:
-                line = (
-                    f"{acc['accountNumber'].zfill(5)} "
-                    f"{acc['accountName']:<20} "
-                    f"{acc['status']} "
-                    f"{acc['balance']:08.2f} "
-                    f"{acc.get('plan', 'NP')} "
-                    f"{acc['transactionCount']:04.0f}\n"
-                )
-                f.write(line)
+                f.write(_master_line(acc))
+        if self.snapshot:
+            self._write_snapshot(path)
+
+    def _write_snapshot(self, path: str):
+        """Rebuild the binary snapshot of the master file at path from the accounts."""
+        master_snapshot.write_snapshot(path, master_snapshot.pack_accounts(
+            (acc["accountNumber"], acc["accountName"], acc["status"], acc["balance"],
+             acc.get("plan", "NP"), acc["transactionCount"])
+            for acc in self.current_accounts
+        ))
+
+    def _write_merged(self, path: str, with_plan: bool):
+        """
+        Write the accounts in lazy mode, merging the table with the mapped file.
+
+        Accounts that were never decoded are copied from the mapped file in
+        runs of raw bytes; decoded, created and deleted accounts are taken
+        from the table. The file is written under a temporary name and then
+        renamed over path, so it is never left half-written (standard output,
+        for path "-", is written directly).
+        """
+        source = self._source
+        to_stdout = stdio.is_stdio(path)
+        if not to_stdout and os.path.exists(path) and os.path.samefile(path, source.path):
+            source.detach()
+        raw_bytes = source.master_bytes if with_plan else source.current_bytes
+        line      = _master_line if with_plan else _current_line
+        table     = self._by_number
+        changed   = self._deleted.union(slot for slot, acc in enumerate(table) if acc is not None)
+        tmp_path  = path if to_stdout else path + ".tmp"
+        with stdio.open_output(tmp_path, "wb") as f:
+            pos = 0
+            for slot in sorted(changed):
+                index = source.lower_bound(slot)
+                if index > pos:
+                    f.write(raw_bytes(pos, index))
+                    pos = index
+                if index < source.count and source.number_at(index) == slot:
+                    pos = index + 1
+                acc = table[slot]
+                if acc is not None:
+                    f.write(line(acc).encode())
+            f.write(raw_bytes(pos, source.count))
+            if not with_plan:
+                f.write(CURRENT_ACCOUNTS_SENTINEL.encode())
+        if not to_stdout:
+            os.replace(tmp_path, path)
+
+    def _patch_file(self, path: str, with_plan: bool) -> bool:
+        """
+        Patch mode: rewrite only the changed records of an existing account file.
+
+        Every decoded account is formatted and compared with its record in
+        path at its fixed byte offset; the records that differ are written
+        in place through a journal (see journal.py), so a quiet day writes a
+        few records instead of the whole file.
+
+        Creating or deleting an account shifts the records after it, so then
+        the file has to be compacted by a full rewrite instead; the same
+        happens if path is missing or its records do not line up with the
+        master file.
+
+        Returns:
+            True if path was patched, False if it must be rewritten.
+        """
+        source = self._source
+        table  = self._by_number
+        if self._deleted or stdio.is_stdio(path) or not os.path.exists(path):
+            return False
+        width   = MASTER_RECORD_WIDTH if with_plan else CURRENT_RECORD_WIDTH
+        trailer = b"" if with_plan else CURRENT_ACCOUNTS_SENTINEL.encode()
+        line    = _master_line if with_plan else _current_line
+        if os.path.getsize(path) != source.count * width + len(trailer):
+            return False
+        patches: List[journal.Patch] = []
+        with open(path, "rb") as f:
+            if trailer:
+                f.seek(-len(trailer), os.SEEK_END)
+                if f.read() != trailer:
+                    return False
+            for slot, acc in enumerate(table):
+                if acc is None:
+                    continue
+                index = source.find(slot)
+                if index is None:  # created this run
+                    return False
+                new = line(acc).encode()
+                if len(new) != width:  # e.g. a balance over 99999.99 widens the record
+                    return False
+                f.seek(index * width)
+                old = f.read(width)
+                if old[:5] != new[:5]:
+                    return False
+                if old != new:
+                    patches.append((index * width, old, new))
+        journal.apply_patches(path, patches)
+        return True
 
     def get_account_by_id(self, account_id: str) -> Optional[Dict]:
         """
@@ -148,15 +479,140 @@ class AccountsList:
         Returns:
             The matching account dict, or None if no account was found.
         """
-        key = str(account_id).zfill(5)
-        for a in self.current_accounts:
-            if a['accountNumber'] == key:
-                return a
+        slot = account_slot(account_id)
+        if slot is None:
+            return None
+        acc = self._by_number[slot]
+        if acc is None and self._source is not None:
+            acc = self._decode_slot(slot)
+        return acc
+
+    def _decode_slot(self, slot: int) -> Optional[Account]:
+        """Lazy mode: decode the account in slot from the mapped file into the table."""
+        if slot in self._deleted:
+            return None
+        index = self._source.find(slot)
+        if index is None:
+            return None
+        acc = self._by_number[slot] = self._source.decode(index)
+        return acc
+
+    def _decode_all(self):
+        """Lazy mode: decode every remaining account and release the mapped file."""
+        source, table = self._source, self._by_number
+        for index in range(source.count):
+            slot = source.number_at(index)
+            if table[slot] is None and slot not in self._deleted:
+                table[slot] = source.decode(index)
+        self._ordered = None
+        self._drop_source()
+
+    def _drop_source(self):
+        """Release the mapped master file, if any."""
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+        self._deleted = set()
+
+    def add_account(self, account: Dict):
+        """
+        Add a new account to the table and index it.
+
+        Insertion is O(1) and needs no re-sort: the table is addressed by
+        account number, so current_accounts stays in ascending order.
+
+        Args:
+            account: The account dict to add. Its number must not be in use.
+
+        Raises:
+            ValueError: If the account number is invalid or already in use.
+        """
+        slot = self._require_slot(account)
+        if self.get_account_by_id(slot) is not None:
+            raise ValueError(f"Account number {account['accountNumber']} already exists")
+        self._by_number[slot] = account
+        self._deleted.discard(slot)
+        self._ordered = None
+        if account["status"] == "A" and self._active_by_name is not None:
+            insort(self._active_by_name.setdefault(account["accountName"].strip(), []), slot)
+
+    def remove_account(self, account: Dict):
+        """
+        Remove an account from the table and from the holder-name index.
+
+        Args:
+            account: The account dict to remove (as returned by get_account_by_id).
+        """
+        slot = self._require_slot(account)
+        if self._by_number[slot] is not account:
+            raise ValueError(f"Account {account['accountNumber']} is not in this list")
+        self._by_number[slot] = None
+        if self._source is not None:
+            self._deleted.add(slot)
+        self._ordered = None
+        self._unindex_name(account, slot)
+
+    def disable_account(self, account: Dict):
+        """
+        Mark an account as disabled (D) and drop it from the holder-name index.
+
+        Args:
+            account: The account dict to disable (as returned by get_account_by_id).
+        """
+        account["status"] = "D"
+        slot = account_slot(account["accountNumber"])
+        if slot is not None and self._by_number[slot] is account:
+            self._unindex_name(account, slot)
+
+    def get_active_account_by_name(self, account_name: str) -> Optional[Dict]:
+        """
+        Return the first active account owned by the given holder.
+
+        "First" means lowest account number, i.e. first in current_accounts
+        order. Entries whose status or name was changed without
+        going through disable_account are dropped from the index as they are met.
+
+        Args:
+            account_name: Account holder name (surrounding spaces are ignored).
+
+        Returns:
+            The matching account dict, or None if the holder has no active account.
+        """
+        if self._active_by_name is None:
+            self._active_by_name = self._build_name_index()
+        name  = account_name.strip()
+        slots = self._active_by_name.get(name)
+        while slots:
+            acc = self._by_number[slots[0]]
+            if acc is None and self._source is not None:
+                acc = self._decode_slot(slots[0])
+            if acc is not None and acc["status"] == "A" and acc["accountName"].strip() == name:
+                return acc
+            del slots[0]
         return None
 
-    def perform_transaction(self, transaction):
+    def _build_name_index(self) -> Dict[str, List[int]]:
+        """
+        Lazy mode: build the holder-name index on first use.
+
+        Names and statuses are read straight from the mapped file for accounts
+        that have not been decoded; decoded and created accounts come from
+        the table.
+        """
+        table   = self._by_number
+        by_name: Dict[str, List[int]] = {}
+        if self._source is not None:
+            for slot, name in self._source.iter_active_names():
+                if table[slot] is None and slot not in self._deleted:
+                    by_name.setdefault(name, []).append(slot)
+        for slot, acc in enumerate(table):
+            if acc is not None and acc["status"] == "A":
+                insort(by_name.setdefault(acc["accountName"].strip(), []), slot)
+        return by_name
+
+    def perform_transaction(self, transaction) -> bool:
         """
-        Dispatch a transaction dict to the appropriate handler in transactions.py.
+        Dispatch a transaction record to its handler through self.registry.
 
         Transaction codes:
             00 – end_of_session    04 – deposit    08 – changeplan
@@ -165,72 +621,350 @@ class AccountsList:
             03 – paybill           07 – disable
 
         Codes 09 and 10 (login/logout) are Front End only and are silently
-        ignored. Any other unrecognised code prints an ERROR message.
+        ignored. Any other unrecognised code prints an ERROR message. Extra
+        codes can be added with self.registry.register() (see registry.py).
 
         Args:
-            transaction: Dict with keys: code, accountName, accountNumber,
-                         money, misc.
-        """
-        import transactions as tx
-        code = str(transaction.get('code', '')).zfill(2)
-        dispatch = {
-            '01': tx.withdrawal,
-            '02': tx.transfer,
-            '03': tx.paybill,
-            '04': tx.deposit,
-            '05': tx.create,
-            '06': tx.delete,
-            '07': tx.disable,
-            '08': tx.changeplan,
-            '00': tx.end_of_session,
-        }
-        handler = dispatch.get(code)
-        if handler:
-            handler(transaction, self)
-        elif code not in ('09', '10'):  # login/logout have no backend action
-            print(f"ERROR: Unknown transaction code '{code}' - skipping.")
+            transaction: Transaction record (or dict) with keys: code,
+                         accountName, accountNumber, money, misc.
+
+        Returns:
+            True if the transaction was applied, False if it was rejected.
+        """
+        return self.registry.dispatch(transaction, self)
+
+
+class ParseError(NamedTuple):
+    """A merged transaction file line that could not be parsed."""
+    line_number: int
+    line: str
+    reason: str
+
+
+@contextmanager
+def gc_paused():
+    """
+    Pause the cyclic garbage collector while many records are created.
+
+    Parsed records never reference each other, so collecting while millions of
+    them are allocated only costs time.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def parse_transaction_line(raw: bytes, line_number: int = 0) -> Transaction:
+    """
+    Parse one fixed-width merged transaction record by column offset.
+
+    This is the line-at-a-time path; TransactionsList parses whole batches of
+    well-formed records at once and only falls back to this function for
+    batches that contain an irregular line.
+
+    Args:
+        raw:         The raw line, with or without its line ending.
+        line_number: The line's 1-based position in the file, if known.
+
+    Returns:
+        The parsed Transaction record.
+
+    Raises:
+        ValueError: If the line does not match the fixed-width layout. The
+                    message describes the problem.
+    """
+    line = raw.decode("utf-8").rstrip("\r\n")
+    if len(line) == TRANSACTION_RECORD_LENGTH:
+        misc = line[MISC_COLUMNS[0]:MISC_COLUMNS[1]]
+    elif len(line) == TRANSACTION_RECORD_LENGTH - 3:
+        misc = ""
+        line += " "
+    else:
+        raise ValueError(f"expected {TRANSACTION_RECORD_LENGTH} characters, found {len(line)}")
+    if any(line[c] != " " for c in SPACE_COLUMNS):
+        raise ValueError("fields are not separated by spaces at the expected columns")
+    code   = line[CODE_COLUMNS[0]:CODE_COLUMNS[1]]
+    number = line[NUMBER_COLUMNS[0]:NUMBER_COLUMNS[1]]
+    money  = line[MONEY_COLUMNS[0]:MONEY_COLUMNS[1]]
+    if not is_digits(code):
+        raise ValueError(f"invalid transaction code {code!r}")
+    if not is_digits(number):
+        raise ValueError(f"invalid account number {number!r}")
+    if not (is_digits(money) or (money[5] == "." and is_digits(money[:5]) and is_digits(money[6:]))):
+        raise ValueError(f"invalid money amount {money!r}")
+    return Transaction(code, line[NAME_COLUMNS[0]:NAME_COLUMNS[1]].strip(), number,
+                       parse_cents(money), misc, line_number)
+
+
+def _parse_uniform_batch(chunk: bytes, line_number: int = 0) -> Optional[List[Transaction]]:
+    """
+    Parse a batch of complete lines whose records all have the full fixed width.
+
+    Every column is checked for the whole batch at once with strided slices
+    (e.g. chunk[2::42] holds column 2 of every record), then the records are
+    unpacked with a single struct pass, so no per-line splitting or checking
+    happens in Python.
+
+    Args:
+        chunk:       Complete lines read from the merged transaction file.
+        line_number: Number of lines in the file before the chunk.
+
+    Returns:
+        The parsed records, or None if any line is irregular (wrong width,
+        mixed line endings, non-ASCII, or bad field contents), in which case
+        the caller parses the batch line by line to report the problem.
+    """
+    first_end = chunk.find(b"\n")
+    if first_end < 1 or not chunk.isascii():
+        return None
+    ending = b"\r\n" if chunk[first_end - 1:first_end] == b"\r" else b"\n"
+    record = _RECORD_STRUCTS[ending]
+    width  = record.size
+    if len(chunk) % width or first_end + 1 != width:
+        return None
+    if chunk[width - 1::width].strip(b"\n") or (ending == b"\r\n" and chunk[width - 2::width].strip(b"\r")):
+        return None
+    if any(chunk[c::width].strip(b" ") for c in SPACE_COLUMNS):
+        return None
+    if not all(chunk[c::width].isdigit() for c in DIGIT_COLUMNS):
+        return None
+    if chunk[DECIMAL_COLUMN::width].translate(None, b".0123456789"):
+        return None
+    with gc_paused():
+        return [
+            Transaction(
+                code.decode(),
+                name.decode().strip(),
+                number.decode(),
+                int(money.replace(b".", b"")) if money[5] == 0x2E else int(money) * 100,
+                misc.decode(),
+                n,
+            )
+            for n, (code, name, number, money, misc) in enumerate(record.iter_unpack(chunk), line_number + 1)
+        ]
+
+
+def _archived_file_exists(path: str) -> bool:
+    """Return True if path names a file in a day archive (see archive.py)."""
+    import archive
+    located = archive.split_path(path)
+    if located is None:
+        return False
+    try:
+        archive.find_member(archive.load_index(located[0]), located[1])
+    except KeyError:
+        return False
+    return True
+
+
+@contextmanager
+def open_transactions(path: str) -> Iterator:
+    """Open a merged transaction file, standard input ("-") or an archived file for reading in binary mode."""
+    import archive
+    located = None if stdio.is_stdio(path) else archive.split_path(path)
+    if located is None:
+        with stdio.open_input(path) as fh:
+            yield fh
+        return
+    with archive.open_member(*located) as fh:
+        yield fh
+
+
+def _skip_to(fh, offset: int, position: int):
+    """Move an open input from position to offset, reading past the bytes if it cannot seek."""
+    if fh.seekable():
+        fh.seek(offset)
+        return
+    while position < offset:
+        skipped = fh.read(min(offset - position, 1 << 20))
+        if not skipped:
+            break
+        position += len(skipped)
 
 
 class TransactionsList:
-    """Reads the merged transaction file produced by the Front End into a list."""
+    """
+    Reads the merged transaction file produced by the Front End.
+
+    Records are parsed by fixed column offsets from the file read in binary
+    mode, one batch of lines at a time (see iter_batches). Lines that do not match the record
+    layout are reported with their line numbers and collected in self.errors.
+
+    In the default list mode the whole file is parsed into self.transactions
+    up front. In streaming mode nothing is kept in memory: get_iterator()
+    parses and yields records straight from the file handle, so the Back End
+    can apply transactions while it reads them.
+
+    Files in the binary transaction format (binary_transactions.py) are
+    recognized by their first bytes and read with the same interface.
+
+    A file path of "<bundle>::<member>" (or a bundle on its own, for the
+    day's merged file) streams the records of an archived file, see
+    archive.py.
+
+    A file path of "-" reads the records from standard input, batch by batch
+    as they arrive. After a pass, self.complete tells whether the input
+    ended with the merged file's end-of-file (00) record, i.e. whether the
+    program writing the stream finished it.
+    """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, streaming: bool = False, batch_bytes: int = 1 << 20,
+                 rejects: Optional[RejectSink] = None, start_offset: int = 0, start_line: int = 0):
         """
         Initialize with the path to the merged transaction file.
 
         Args:
-            file_path: Path to the merged transaction file.
+            file_path:   Path to the merged transaction file.
+            streaming:   If True, records are parsed lazily by get_iterator()
+                         and self.transactions stays empty.
+            batch_bytes: Approximate number of bytes read and parsed per batch.
+            rejects:     Reject log that malformed lines are also recorded in
+                         (as MALFORMED_RECORD); their ERROR messages are then
+                         printed only if it is verbose.
+            start_offset: Byte offset to start reading at, taken from
+                         self.offset after an earlier batch (to resume a run).
+            start_line:  Number of records before start_offset (the matching
+                         self.line_number).
         """
-        self.file_path = file_path
-        self.transactions: List[Dict] = []
+        self.rejects     = rejects
+        self.file_path   = file_path
+        self.streaming   = streaming
+        self.batch_bytes = batch_bytes
+        self.transactions: List[Transaction] = []
+        self.errors: List[ParseError] = []
+        self.complete = False
+        self.start_offset = start_offset
+        self.start_line   = start_line
+        # Position just after the last batch yielded by iter_batches: bytes
+        # of the file and lines (records) read.
+        self.offset      = start_offset
+        self.line_number = start_line
 
     def read_merged_transaction_file(self):
         """
         Parse the merged transaction file into self.transactions.
 
-        Each non-sentinel line is split on whitespace and stored as a dict
-        with keys: code, accountName, accountNumber, money, misc.
+        Each non-sentinel line is parsed by parse_transaction_line() into a
+        Transaction record with fields: code, accountName, accountNumber,
+        money, misc. In streaming mode this only checks that the file exists;
+        parsing happens as get_iterator() is consumed.
 
         Raises:
             FileNotFoundError: If the transaction file does not exist.
         """
-        if not os.path.exists(self.file_path):
+        if not stdio.is_stdio(self.file_path) and not os.path.exists(self.file_path) \
+                and not _archived_file_exists(self.file_path):
             raise FileNotFoundError(self.file_path)
-        with open(self.file_path, "r") as fh:
-            for line in fh:
-                if not line.strip() or line.startswith("00000 END_OF_FILE"):
+        if self.streaming:
+            return
+        with gc_paused():
+            for batch in self.iter_batches():
+                self.transactions.extend(batch)
+
+    def iter_batches(self) -> Iterator[List[Transaction]]:
+        """
+        Parse the merged transaction file and yield the records in batches.
+
+        Each batch is roughly batch_bytes of complete lines. Malformed lines
+        are skipped, printed as ERROR messages and recorded in self.errors
+        (which is reset at the start of each pass). Before each batch is
+        yielded, self.offset and self.line_number are moved past it.
+        """
+        self.errors   = []
+        self.complete = False
+        self.offset, self.line_number = self.start_offset, self.start_line
+        line_number = self.start_line
+        with open_transactions(self.file_path) as fh:
+            # From a pipe, parse whatever has arrived rather than waiting for a full batch.
+            read  = fh.read1 if stdio.is_stdio(self.file_path) else fh.read
+            chunk = fh.read(4)
+            if chunk == BINARY_MAGIC:
+                yield from self._iter_binary_batches(fh, chunk, read)
+                return
+            if self.start_offset:
+                _skip_to(fh, self.start_offset, len(chunk))
+                chunk = b""
+            while True:
+                chunk += read(self.batch_bytes)
+                if not chunk:
+                    break
+                if not chunk.endswith(b"\n"):
+                    chunk += fh.readline()
+                last = chunk.rstrip(b"\r\n").rpartition(b"\n")[2]
+                if last.strip():
+                    self.complete = last.startswith(END_OF_STREAM_PREFIX)
+                batch = _parse_uniform_batch(chunk, line_number)
+                if batch is None:
+                    batch = self._parse_lines(chunk, line_number)
+                line_number += chunk.count(b"\n") + (not chunk.endswith(b"\n"))
+                self.offset += len(chunk)
+                self.line_number = line_number
+                yield batch
+                chunk = b""
+
+    def _iter_binary_batches(self, fh, magic: bytes, read) -> Iterator[List[Transaction]]:
+        """Yield the records of a binary transaction file (see binary_transactions.py) in batches."""
+        import binary_transactions as binary
+        size = binary.RECORD.size
+        binary.check_header(magic + fh.read(binary.HEADER.size - len(magic)))
+        if self.start_offset:
+            _skip_to(fh, self.start_offset, binary.HEADER.size)
+        else:
+            self.offset = binary.HEADER.size
+        line_number = self.start_line
+        while True:
+            chunk = read(max(self.batch_bytes // size, 1) * size)
+            if not chunk:
+                break
+            if len(chunk) % size:
+                chunk += fh.read(size - len(chunk) % size)
+            whole = len(chunk) - len(chunk) % size
+            batch = binary.parse_batch(chunk[:whole], line_number)
+            line_number += len(batch)
+            self.offset += len(chunk)
+            self.line_number = line_number
+            if whole < len(chunk):
+                self._report_malformed(line_number + 1, b"", "binary file ends part-way through a record")
+            if batch:
+                last = batch[-1]
+                self.complete = last.code == "00" and last.accountName == "END_OF_FILE"
+            yield batch
+
+    def _parse_lines(self, chunk: bytes, line_number: int) -> List[Transaction]:
+        """Parse a batch line by line, reporting malformed lines after line_number."""
+        batch: List[Transaction] = []
+        for raw in chunk.splitlines(keepends=True):
+            line_number += 1
+            try:
+                batch.append(parse_transaction_line(raw, line_number))
+            except ValueError as e:
+                # Blank lines and the accounts-file sentinel are skipped silently.
+                if raw.startswith(b"00000 END_OF_FILE") or not raw.strip():
                     continue
-                parts = line.strip().split()
-                if len(parts) >= 4:
-                    self.transactions.append({
-                        'code': parts[0],
-                        'accountName': " ".join(parts[1:-3]),
-                        'accountNumber': str(parts[-3]).zfill(5),
-                        'money': float(parts[-2]),
-                        'misc': parts[-1] if len(parts) >= 5 else ""
-                    })
-                # TODO: handle broken lines with errors and check that I did this right
-
-    def get_iterator(self):
-        """Return an iterator over the parsed transaction records."""
+                self._report_malformed(line_number, raw, str(e))
+        return batch
+
+    def _report_malformed(self, line_number: int, raw: bytes, reason: str):
+        """Record and print a line that could not be parsed."""
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        self.errors.append(ParseError(line_number, line, reason))
+        message = f"ERROR: Malformed transaction on line {line_number} – {reason}; record skipped."
+        if self.rejects is None or self.rejects.verbose:
+            print(message)
+        if self.rejects is not None:
+            self.rejects.add(Reject(line_number, line[0:2].strip(), line[24:29].strip(), MALFORMED_RECORD))
+
+    def get_iterator(self) -> Iterator[Transaction]:
+        """
+        Return an iterator over the parsed transaction records.
+
+        In streaming mode each call opens the file again and yields records
+        lazily; otherwise it iterates over self.transactions.
+        """
+        if self.streaming:
+            return chain.from_iterable(self.iter_batches())
         return iter(self.transactions)
@@ -10,14 +10,79 @@ constraints), then writes out:
   • a new current bank accounts file (for tomorrow's Front End sessions)
 
 Usage:
-    python main.py [merged_transactions] [current_accounts] [master_accounts]
+    python main.py [options] [merged_transactions] [current_accounts] [master_accounts]
 
 All three file-path arguments are optional; reasonable defaults relative to
 the repository root are used when they are not supplied.
 
+Standard input and output ("-"):
+    A merged_transactions of "-" reads the transactions from standard input
+    as they arrive, so the merge can be piped straight in:
+        python merge_transactions.py ../terminals - | python main.py - ...
+    The stream must end with the merged file's end-of-file (00) record; if
+    it does not (the merge stopped part-way), no account file is written.
+    A current_accounts, --rejects or --timings of "-" writes that file to
+    standard output instead (at most one of them), and all messages then go
+    to standard error. The master accounts file is read and rewritten, so
+    it cannot be "-".
+
+Options:
+    --columnar  keep accounts in the NumPy-backed columnar store
+                (columnar.ColumnarAccountsList) instead of Account records.
+                Cannot be used with --lazy or --patch.
+    --lazy      memory-map the master accounts file and decode only the
+                accounts the day's transactions touch (see master_file.py).
+    --patch     like --lazy, but update the existing account files in place,
+                rewriting only the records that changed (see journal.py).
+    --snapshot  also keep a binary snapshot of the master accounts file next
+                to it (<master_accounts>.snap), and start from that instead of
+                parsing the text file while it is up to date (see
+                master_snapshot.py). Ignored with --lazy and --patch.
+    --shards=N  apply the transactions in N worker processes, each owning a
+                range of account numbers (see sharded.py). The results are
+                the same as a serial run.
+    --rejects=PATH
+                where to write the rejected-transactions CSV file (default
+                rejected_transactions.csv next to the master accounts file;
+                "-" for standard output).
+    --verbose   also print an ERROR message for every rejected transaction.
+    --checkpoint[=N]
+                write a checkpoint of the run about every N transactions
+                (default 1,000,000; taken at the end of a batch of input) and
+                when they have all been applied, so that an interrupted run
+                can be resumed (see checkpoint.py). Batches are cut to about
+                N records, so a resumed run redoes fewer than 2N
+                transactions.
+    --resume    continue an interrupted run from its latest checkpoint, if
+                there is one for the same merged transaction file (implies
+                --checkpoint). The output files are the same as those of a
+                run that was never interrupted.
+                Neither works with --lazy, --patch or --shards, or with
+                standard input/output for the transactions or rejects.
+    --validate-only[=PATH]
+                only check the merged transaction file (record widths,
+                separators, codes, account numbers, amounts up to 99999.99,
+                the final 00 record), print a summary and write every
+                problem with its line number to PATH as CSV (default
+                validation_report.csv in the repository root; "-" for
+                standard output). No account file is read or written; exits
+                with status 1 if there are problems (see prevalidate.py).
+    --prevalidate[=PATH]
+                run the same checks before the run, and stop before any
+                account file is touched if there are problems. Does not work
+                with standard input (-) for the transactions.
+    --timings[=PATH]
+                report the wall time and throughput of each phase and the
+                latency histogram of each transaction code as a table, and
+                as JSON in PATH (default timings.json in the repository
+                root; "-" for standard output). Per-code latencies are only
+                recorded without --shards.
+
 Input files:
     merged_transactions  - concatenation of one or more Front End transaction
                            files, ended with an end-of-session (00) record.
+                           An archived day is replayed by giving its bundle
+                           (or "<bundle>::<member>", see archive.py).
     current_accounts     - current bank accounts file written by the previous
                            Back End run (used as a fallback if no master exists).
     master_accounts      - master bank accounts file written by the previous
@@ -27,56 +92,244 @@ Input files:
 Output files:
     master_accounts      - updated master file (overwrites the input).
     current_accounts     - updated current accounts file for the Front End.
+    rejects              - one CSV row (line, code, account, reason) per
+                           rejected or malformed transaction; a per-reason
+                           summary is printed at the end of the run.
 """
 
+import json
 import sys
 import os
-from lists import AccountsList, TransactionsList
+from itertools import chain
+
+import checkpoint
+import stdio
+import timings
+from lists import TRANSACTION_RECORD_LENGTH, AccountsList, TransactionsList
+from rejects import RejectSink
+from timings import PhaseTimer, TimedRegistry
 
 
-def parse_arguments() -> tuple[str, str, str]:
+def parse_arguments() -> tuple[str, str, str, dict[str, str]]:
     """
-    Parse command-line arguments and return the three file paths.
+    Parse command-line arguments and return the three file paths and options.
+
+    Arguments starting with "--" are options, given either as a bare flag
+    (--columnar) or with a value (--name=value); everything else is a
+    file-path argument.
 
     Returns:
-        Tuple of (transactions_file, current_file, master_file).
+        Tuple of (transactions_file, current_file, master_file, options), where
+        options maps each option name (without the dashes) to its value, or to
+        an empty string for bare flags.
     """
-    args     = sys.argv[1:]
+    args:    list[str]      = []
+    options: dict[str, str] = {}
+    for arg in sys.argv[1:]:
+        if arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value
+        else:
+            args.append(arg)
     base_dir = os.path.join(os.path.dirname(__file__), "..")
     transactions_file = args[0] if len(args) >= 1 else os.path.join(base_dir, "merged_transactions.txt")
     current_file      = args[1] if len(args) >= 2 else os.path.join(base_dir, "current_accounts.txt")
     master_file       = args[2] if len(args) >= 3 else os.path.join(base_dir, "master_accounts.txt")
-    return transactions_file, current_file, master_file
+    return transactions_file, current_file, master_file, options
 
 
 def main() -> None:
+    """Parse the arguments and run the Back End, keeping messages off standard output if it carries data."""
+    transactions_file, current_file, master_file, options = parse_arguments()
+    if stdio.is_stdio(master_file):
+        print("ERROR: The master accounts file is read and rewritten; it cannot be standard input/output (-).")
+        sys.exit(1)
+    to_stdout = [path for path in (current_file, options.get("rejects"), options.get("timings"),
+                                   options.get("validate-only"), options.get("prevalidate"))
+                 if stdio.is_stdio(path)]
+    if len(to_stdout) > 1:
+        print("ERROR: Only one output file can be standard output (-).")
+        sys.exit(1)
+    if ("checkpoint" in options or "resume" in options) and (
+            any(name in options for name in ("lazy", "patch", "shards"))
+            or stdio.is_stdio(transactions_file) or stdio.is_stdio(options.get("rejects"))):
+        print("ERROR: --checkpoint and --resume cannot be used with --lazy, --patch or --shards, "
+              "or with standard input/output (-) for the transactions or rejects.")
+        sys.exit(1)
+    if "columnar" in options and ("lazy" in options or "patch" in options):
+        print("ERROR: --columnar loads the whole master accounts file; it cannot be used with --lazy or --patch.")
+        sys.exit(1)
+    if "prevalidate" in options and stdio.is_stdio(transactions_file):
+        print("ERROR: --prevalidate reads the merged transaction file twice; it cannot be standard input (-).")
+        sys.exit(1)
+    with stdio.messages_to_stderr(bool(to_stdout)):
+        if "validate-only" in options:
+            if not validate(transactions_file, options["validate-only"]):
+                sys.exit(1)
+            return
+        if not run(transactions_file, current_file, master_file, options):
+            sys.exit(1)
+
+
+def run(transactions_file: str, current_file: str, master_file: str, options: dict[str, str]) -> bool:
     """
     Main Back End processing loop.
 
     1. Load account records from the master (and current) accounts files.
-    2. Load all transactions from the merged transaction file.
-    3. Apply each transaction in order via AccountsList.perform_transaction().
+    2. Stream the transactions from the merged transaction file.
+    3. Apply each transaction in order, as it is read, via
+       AccountsList.perform_transaction(), logging rejects to the rejects file.
     4. Write the updated accounts to the new master and current account files.
+
+    Returns:
+        False if the transactions came from standard input and the stream
+        ended early, or --prevalidate found problems, in which case no
+        account file is written.
     """
-    transactions_file, current_file, master_file = parse_arguments()
+    timer    = PhaseTimer()
+    registry = TimedRegistry() if "timings" in options else None
+
+    # With --prevalidate, check the whole merged file before touching any account.
+    if "prevalidate" in options:
+        with timer.phase("validate") as phase:
+            valid = validate(transactions_file, options["prevalidate"])
+        phase.bytes = _file_size(transactions_file)
+        if not valid:
+            print("ERROR: The merged transaction file has problems; account files not read or written.")
+            return False
+
+    # With --resume, pick up from the latest checkpoint of an interrupted run.
+    checkpointing   = "checkpoint" in options or "resume" in options
+    checkpoint_file = checkpoint.checkpoint_path(master_file)
+    interval        = int(options.get("checkpoint") or checkpoint.DEFAULT_INTERVAL)
+    resumed = checkpoint.load(checkpoint_file, transactions_file) if "resume" in options else None
+    if "resume" in options and resumed is None:
+        print("No checkpoint to resume from; starting from the beginning.")
 
     # Load bank accounts from the current and master accounts files.
-    accounts_list = AccountsList(current_file=current_file, master_file=master_file)
-    accounts_list.read_old_master_accounts()
+    if "columnar" in options:
+        from columnar import ColumnarAccountsList
+        accounts_list = ColumnarAccountsList(current_file=current_file, master_file=master_file,
+                                             registry=registry, snapshot="snapshot" in options)
+    else:
+        accounts_list = AccountsList(current_file=current_file, master_file=master_file,
+                                     lazy="lazy" in options, patch="patch" in options,
+                                     registry=registry, snapshot="snapshot" in options)
+    with timer.phase("master load") as phase:
+        if resumed is not None:
+            checkpoint.restore_accounts(accounts_list, resumed["accounts"], resumed.get("baseline"))
+            print(f"Resuming after transaction {resumed['records']} (line {resumed['line_number']}).")
+        else:
+            accounts_list.read_old_master_accounts()
+    phase.bytes = _file_size(master_file)
+
+    # Rejected transactions go to a buffered CSV file instead of the terminal.
+    rejects_file = options.get("rejects") or os.path.join(
+        os.path.dirname(os.path.abspath(master_file)), "rejected_transactions.csv")
+    rejects = RejectSink(rejects_file, verbose="verbose" in options,
+                         resume=resumed["rejects"] if resumed is not None else None)
+    accounts_list.rejects = rejects
 
-    # Load the merged transaction file.
-    transaction_records = TransactionsList(transactions_file)
+    # Open the merged transaction file; records are parsed as they are applied,
+    # so memory use does not grow with the day's transaction volume. When
+    # checkpointing, a batch holds at most about one interval of records, since
+    # checkpoints can only be taken between batches.
+    batch_options = {"batch_bytes": min(1 << 20, interval * (TRANSACTION_RECORD_LENGTH + 1))} \
+        if checkpointing else {}
+    transaction_records = TransactionsList(transactions_file, streaming=True, rejects=rejects,
+                                           start_offset=resumed["offset"] if resumed is not None else 0,
+                                           start_line=resumed["line_number"] if resumed is not None else 0,
+                                           **batch_options)
     transaction_records.read_merged_transaction_file()
+    timer.get("parse").bytes = _file_size(transactions_file)
+    batches = timer.iterate("parse", transaction_records.iter_batches())
 
-    # Apply every transaction in order; constraint errors are printed to the terminal.
-    for transaction in transaction_records.get_iterator():
-        accounts_list.perform_transaction(transaction)
+    # Apply every transaction in order; constraint errors go to the reject log.
+    shards = int(options.get("shards") or 1)
+    with timer.phase("apply", excluding="parse") as phase:
+        if shards > 1:
+            from sharded import apply_sharded
+            apply_sharded(accounts_list, chain.from_iterable(batches), shards)
+        else:
+            perform = accounts_list.perform_transaction
+            applied = resumed["records"] if resumed is not None else 0
+            due     = applied + interval
+            for batch in batches:
+                for transaction in batch:
+                    perform(transaction)
+                applied += len(batch)
+                if checkpointing and applied >= due:
+                    _save_checkpoint(checkpoint_file, transactions_file, transaction_records,
+                                     applied, accounts_list, rejects)
+                    due = applied + interval
+            if checkpointing:
+                _save_checkpoint(checkpoint_file, transactions_file, transaction_records,
+                                 applied, accounts_list, rejects)
+    phase.records = timer.get("parse").records
+    rejects.close()
+    if stdio.is_stdio(transactions_file) and not transaction_records.complete:
+        print("ERROR: Transaction stream ended without its end-of-file record; account files not written.")
+        return False
     print("Transactions Applied.")
+    print("\n".join(rejects.summary()))
 
     # Write the updated accounts to both output files.
-    accounts_list.write_new_master_accounts()
-    accounts_list.write_new_current_accounts()
+    with timer.phase("master write") as phase:
+        accounts_list.write_new_master_accounts()
+    phase.bytes = _file_size(master_file)
+    with timer.phase("current write") as phase:
+        accounts_list.write_new_current_accounts()
+    phase.bytes = _file_size(current_file)
     print("New Account Files Written.")
+    if checkpointing:
+        checkpoint.remove(checkpoint_file)
+
+    if "timings" in options:
+        data = timings.report(timer, accounts_list.registry)
+        timings_file = options["timings"] or os.path.join(os.path.dirname(__file__), "..", "timings.json")
+        with stdio.open_output(timings_file) as f:
+            json.dump(data, f, indent=2)
+        print("\n".join(timings.format_report(data)))
+    return True
+
+
+def validate(transactions_file: str, report_file: str = "") -> bool:
+    """
+    Check the merged transaction file, print a summary and write the problem report.
+
+    Args:
+        transactions_file: The merged transaction file.
+        report_file:       Where to write the CSV problem report (default
+                           validation_report.csv in the repository root).
+
+    Returns:
+        True if no problem was found.
+    """
+    import prevalidate
+    report = prevalidate.validate_file(transactions_file)
+    report_file = report_file or os.path.join(os.path.dirname(__file__), "..", "validation_report.csv")
+    prevalidate.write_report(report, report_file)
+    print("\n".join(prevalidate.summary(report)))
+    return not report.problems
+
+
+def _save_checkpoint(path: str, transactions_file: str, transaction_records: TransactionsList,
+                     applied: int, accounts_list: AccountsList, rejects: RejectSink):
+    """Write a checkpoint of the run just after the last applied batch (see checkpoint.py)."""
+    checkpoint.save(path, {
+        "transactions": checkpoint.input_identity(transactions_file),
+        "offset":       transaction_records.offset,
+        "line_number":  transaction_records.line_number,
+        "records":      applied,
+        "accounts":     checkpoint.account_rows(accounts_list),
+        "baseline":     checkpoint.account_baseline(accounts_list),
+        "rejects":      rejects.checkpoint(),
+    })
+
+
+def _file_size(path: str) -> int:
+    """Return the size of a file in bytes, or 0 if it does not exist (or is "-")."""
+    return os.path.getsize(path) if not stdio.is_stdio(path) and os.path.exists(path) else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+"""
+backend/master_file.py
+
+Memory-mapped, lazily decoded view of a master bank accounts file.
+
+Every master record has the same width (45 characters plus a newline) and the
+records are written in ascending account-number order, so record i starts at
+byte i * MASTER_RECORD_WIDTH and an account can be found by binary search on
+the raw bytes. MasterFile maps the file instead of reading it, decodes a
+record into an Account only when that account is asked for, and hands out
+runs of raw record bytes so untouched accounts can be copied to the output
+files as they are.
+
+Master record layout (0-based columns):
+    NNNNN AAAAAAAAAAAAAAAAAAAA S PPPPPPPP MM TTTT
+"""
+
+import mmap
+import operator
+import os
+import struct
+from itertools import islice
+from typing import Iterator, Optional, Tuple
+
+from money import parse_cents
+from records import Account
+
+
+# Width of one master record, including its newline.
+MASTER_RECORD_WIDTH = 46
+
+# Width of the current-accounts prefix of a master record (NNNNN ... PPPPPPPP).
+CURRENT_PREFIX_WIDTH = 37
+
+_NUMBER_WIDTH   = 5
+_SPACE_COLUMNS  = (5, 26, 28, 37, 40)
+_DIGIT_COLUMNS  = (0, 1, 2, 3, 4, 29, 30, 31, 32, 33, 35, 36, 41, 42, 43, 44)
+_DECIMAL_COLUMN = 34
+
+# Unpackers over whole records: every field, the key only, and the fields the
+# holder-name index needs.
+_RECORD  = struct.Struct("5sx20sx1sx8sx2sx4sx")
+_KEY     = struct.Struct("5s41x")
+_NAME    = struct.Struct("5sx20sx1s18x")
+_CURRENT = struct.Struct("37s9x")
+
+
+class MasterFile:
+    """
+    Read-only, memory-mapped master accounts file with on-demand decoding.
+
+    Use MasterFile.open(); it returns None for files that are not in the
+    fixed-width sorted layout, so the caller can fall back to reading the
+    file line by line.
+    """
+
+    def __init__(self, path: str, data, count: int, handle=None):
+        self.path    = path
+        self.count   = count
+        self._data   = data
+        self._handle = handle
+
+    @classmethod
+    def open(cls, path: str) -> Optional["MasterFile"]:
+        """
+        Map a master accounts file and check its layout.
+
+        The columns of every record are checked at once with strided slices
+        (data[5::46] holds column 5 of every record), and the account numbers
+        must be strictly ascending. Records from an END_OF_FILE (00000)
+        sentinel onwards are ignored, as the line-by-line reader does.
+
+        Args:
+            path: Path to the master accounts file.
+
+        Returns:
+            The mapped file, or None if it is empty or not fixed-width and sorted.
+        """
+        handle = open(path, "rb")
+        try:
+            size = os.fstat(handle.fileno()).st_size
+            if size == 0 or size % MASTER_RECORD_WIDTH:
+                handle.close()
+                return None
+            data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            handle.close()
+            return None
+        count = cls._check_layout(data)
+        if count is None:
+            data.close()
+            handle.close()
+            return None
+        return cls(path, data, count, handle)
+
+    @staticmethod
+    def _check_layout(data) -> Optional[int]:
+        """Return the number of records before any sentinel, or None if the layout is wrong."""
+        w = MASTER_RECORD_WIDTH
+        if data[w - 1::w].strip(b"\n"):
+            return None
+        if any(data[c::w].strip(b" ") for c in _SPACE_COLUMNS):
+            return None
+        if not all(data[c::w].isdigit() for c in _DIGIT_COLUMNS):
+            return None
+        if data[_DECIMAL_COLUMN::w].strip(b"."):
+            return None
+        keys = [key for (key,) in _KEY.iter_unpack(data)]
+        try:
+            count = keys.index(b"00000")
+        except ValueError:
+            count = len(keys)
+        if not all(map(operator.lt, keys, islice(keys, 1, count))):
+            return None
+        return count
+
+    def close(self):
+        """Release the mapping and the file handle."""
+        if self._handle is not None:
+            self._data.close()
+            self._handle.close()
+            self._handle = None
+
+    def detach(self):
+        """
+        Copy the records into memory and release the file.
+
+        Needed before the mapped file itself is overwritten.
+        """
+        if self._handle is not None:
+            data = self._data[:self.count * MASTER_RECORD_WIDTH]
+            self.close()
+            self._data = data
+
+    def number_at(self, index: int) -> int:
+        """Return the account number of record index."""
+        start = index * MASTER_RECORD_WIDTH
+        return int(self._data[start:start + _NUMBER_WIDTH])
+
+    def lower_bound(self, number: int) -> int:
+        """Return the index of the first record whose account number is >= number."""
+        key = b"%05d" % number
+        data, w = self._data, MASTER_RECORD_WIDTH
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mid * w
+            if data[start:start + _NUMBER_WIDTH] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, number: int) -> Optional[int]:
+        """Return the index of the record for an account number, or None."""
+        index = self.lower_bound(number)
+        if index < self.count and self.number_at(index) == number:
+            return index
+        return None
+
+    def decode(self, index: int) -> Account:
+        """Decode record index into an Account."""
+        number, name, status, balance, plan, count = _RECORD.unpack_from(
+            self._data, index * MASTER_RECORD_WIDTH)
+        return Account(
+            number.decode(),
+            name.decode().strip(),
+            status.decode().strip(),
+            parse_cents(balance.decode()),
+            plan.decode().strip(),
+            int(count),
+        )
+
+    def iter_active_names(self) -> Iterator[Tuple[int, str]]:
+        """Yield (account number, holder name) for every active record, in order."""
+        for number, name, status in _NAME.iter_unpack(self.master_bytes(0, self.count)):
+            if status == b"A":
+                yield int(number), name.decode().strip()
+
+    def master_bytes(self, start: int, stop: int) -> bytes:
+        """Return records start..stop-1 as master file lines."""
+        return self._data[start * MASTER_RECORD_WIDTH:stop * MASTER_RECORD_WIDTH]
+
+    def current_bytes(self, start: int, stop: int) -> bytes:
+        """Return records start..stop-1 as current accounts file lines."""
+        if start >= stop:
+            return b""
+        prefixes = [prefix for (prefix,) in _CURRENT.iter_unpack(self.master_bytes(start, stop))]
+        prefixes.append(b"")
+        return b"\n".join(prefixes)
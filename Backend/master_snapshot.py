@@ -0,0 +1,214 @@
+"""
+backend/master_snapshot.py
+
+Binary snapshot of the master bank accounts file, for a fast Back End start.
+
+Parsing the text master file builds every account field from its columns,
+which dominates start-up once there are tens of thousands of accounts. With
+snapshots enabled (main.py --snapshot), the Back End keeps a packed copy of
+the accounts it last wrote next to the master file (master_accounts.txt.snap)
+and loads that instead while it is still up to date.
+
+File layout (little-endian):
+    header   32 bytes:
+        magic        4 bytes   b"BMSN"
+        version      uint16    format version
+        record size  uint16    size of one record in bytes
+        count        uint32    number of records
+        text size    uint64    size of the master file the snapshot matches
+        text mtime   int64     modification time of that file, in nanoseconds
+        checksum     uint32    CRC-32 of the records
+    records  39 bytes each, in ascending account-number order:
+        number   uint32    account number
+        name     20 bytes  account holder name, padded with spaces
+        status   1 byte    A or D
+        balance  int64     balance in cents
+        plan     2 bytes   SP or NP
+        count    uint32    transactionCount
+
+The records are a fixed-size array straight after the header, so the file
+can be memory-mapped and read with a single struct (or NumPy) pass.
+
+A snapshot is only used when its header and checksum are valid and the
+master file's size and modification time still match the ones recorded in
+it. Anything else (a master file edited or rewritten without the snapshot,
+a damaged or old-format snapshot) makes the caller read the text file and
+rebuild the snapshot.
+
+A snapshot holds exactly the values the text file gives back when it is
+read. Accounts whose fields would not survive the text form unchanged (a name
+longer than 20 characters, a balance too large for its 8-character field,
+...) are not snapshotted; the stale snapshot is removed and the text file
+is read as usual.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import stdio
+from records import Account
+
+SNAPSHOT_SUFFIX = ".snap"
+
+MAGIC   = b"BMSN"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIQqI")
+RECORD = struct.Struct("<I20scq2sI")
+
+# Range of balances, in cents, that fit the 8-character balance field.
+MIN_BALANCE_CENTS = -999999
+MAX_BALANCE_CENTS = 9999999
+
+# Largest value the 4-character transactionCount field can hold.
+MAX_TRANSACTION_COUNT = 9999
+
+# Fields of one account, in record order: (accountNumber, accountName,
+# status, balance, plan, transactionCount).
+AccountFields = Tuple[str, str, str, int, str, int]
+
+
+def snapshot_path(master_path: str) -> str:
+    """Return the path of the snapshot kept next to a master accounts file."""
+    return master_path + SNAPSHOT_SUFFIX
+
+
+def pack_accounts(accounts: Iterable[AccountFields]) -> Optional[bytes]:
+    """
+    Pack account fields into snapshot records.
+
+    Args:
+        accounts: The accounts' fields, in ascending account-number order.
+
+    Returns:
+        The packed records, or None if an account cannot be snapshotted:
+        its fields would not read back unchanged from the text master file,
+        or the accounts are not in strictly ascending order.
+    """
+    pack    = RECORD.pack
+    records = []
+    last    = 0
+    for number, name, status, balance, plan, count in accounts:
+        if len(number) != 5 or not number.isdigit() or int(number) <= last:
+            return None
+        if len(name) > 20 or not name.isascii() or len(status) != 1 or len(plan) != 2:
+            return None
+        if not (MIN_BALANCE_CENTS <= balance <= MAX_BALANCE_CENTS and 0 <= count <= MAX_TRANSACTION_COUNT):
+            return None
+        if int(balance) != balance or int(count) != count:
+            return None
+        last = int(number)
+        records.append(pack(last, name.strip().encode().ljust(20), status.encode(),
+                            int(balance), plan.encode(), int(count)))
+    return b"".join(records)
+
+
+def write_snapshot(master_path: str, records: Optional[bytes]) -> bool:
+    """
+    Write the snapshot for a master accounts file that has just been written.
+
+    The snapshot is written under a temporary name and then renamed, so a
+    reader never sees a partial one.
+
+    Args:
+        master_path: The master accounts file the records were written to.
+        records:     Records from pack_accounts(); None removes any existing
+                     (now stale) snapshot instead.
+
+    Returns:
+        True if a snapshot was written.
+    """
+    if stdio.is_stdio(master_path):
+        return False
+    path = snapshot_path(master_path)
+    if records is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return False
+    st  = os.stat(master_path)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(records) // RECORD.size,
+                            st.st_size, st.st_mtime_ns, zlib.crc32(records)))
+        f.write(records)
+    os.replace(tmp, path)
+    return True
+
+
+@contextmanager
+def mapped_records(master_path: str) -> Iterator[Optional[memoryview]]:
+    """
+    Memory-map the snapshot of a master accounts file and yield its records.
+
+    The view is only valid inside the with-block; copy what is needed out of
+    it before the block ends.
+
+    Yields:
+        The packed records, or None if there is no snapshot or it is not
+        valid for the master file as it is now.
+    """
+    path = snapshot_path(master_path)
+    if stdio.is_stdio(master_path) or not os.path.exists(path):
+        yield None
+        return
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            print("Warning: master accounts snapshot is damaged; reading", master_path)
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                records = _valid_records(view, master_path)
+                try:
+                    yield records
+                finally:
+                    if records is not None:
+                        records.release()
+            finally:
+                view.release()
+
+
+def _valid_records(view: memoryview, master_path: str) -> Optional[memoryview]:
+    """Return the records of a mapped snapshot if it is valid for master_path, else None."""
+    magic, version, size, count, text_size, text_mtime_ns, checksum = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION or size != RECORD.size:
+        print("Warning: master accounts snapshot has an unsupported format; reading", master_path)
+        return None
+    st = os.stat(master_path)
+    if (st.st_size, st.st_mtime_ns) != (text_size, text_mtime_ns):
+        print("Warning: master accounts snapshot is out of date; reading", master_path)
+        return None
+    records = view[HEADER.size:]
+    if len(records) != count * RECORD.size or zlib.crc32(records) != checksum:
+        records.release()
+        print("Warning: master accounts snapshot is damaged; reading", master_path)
+        return None
+    return records
+
+
+def read_snapshot(master_path: str) -> Optional[List[Account]]:
+    """
+    Load the accounts from the snapshot of a master accounts file.
+
+    Returns:
+        The accounts as Account records, or None if there is no valid
+        snapshot (see mapped_records), in which case the text file must be
+        read instead.
+    """
+    with mapped_records(master_path) as records:
+        if records is None:
+            return None
+        # Status and plan take only a few values; decode each one once.
+        codes: Dict[bytes, str] = {}
+        accounts: List[Account] = []
+        append = accounts.append
+        for number, name, status, balance, plan, count in RECORD.iter_unpack(records):
+            text_status = codes.get(status) or codes.setdefault(status, status.decode())
+            text_plan   = codes.get(plan) or codes.setdefault(plan, plan.decode())
+            append(Account("%05d" % number, name.rstrip().decode(), text_status, balance, text_plan, count))
+        return accounts
@@ -4,113 +4,631 @@ backend/merge_transactions.py
 Merges one or more Front End transaction files into a single merged transaction
 file ready for the Back End to process.
 
-The Front End writes one transaction file per session named with a timestamp:
+The Front End writes one transaction file per session, when the session ends,
+named with a timestamp:
     MM-DD-YYYY HH-MM-SS.txt
     e.g.  03-12-2026 14-05-33.txt
+(or .btx for a session written in the binary format, see binary_transactions.py).
 
-This script scans a source directory for all files matching that pattern,
-sorts them chronologically by filename, strips every intermediate end-of-session
-record (code 00), and writes a single merged file ending with exactly one
-end-of-session record.
+This script scans one or more source directories (one per terminal, say) for
+all files matching that pattern, orders the sessions by the date and time in
+their names, strips every intermediate end-of-session record (code 00), and
+writes a single merged file ending with exactly one end-of-session record.
+
+Order of the merged records:
+    Sessions are ordered by timestamp; sessions with the same timestamp by
+    the position of their directory in the source list, then by file name.
+    Each session's records are kept together, in the order the Front End
+    wrote them. The directories are merged as sorted streams through a heap,
+    and records are copied line by line, so memory use does not grow with
+    the size of the session files. (With --validate, the checked records of
+    the few files validated ahead of the one being written are held in
+    memory until they are written.)
+
+Session boundaries:
+    Alongside the merged file, a CSV index (<output_file>.sessions) records
+    where each session's records start in the merged file:
+        first_line,records,file
+        1,12,/terminals/t01/03-12-2026 14-05-33.txt
+
+Manifest (--incremental):
+    An incremental merge also writes <output_file>.manifest.json, listing
+    each merged file with its size, modification time, SHA-256 and place in
+    the output (a merge without --incremental removes it, since it no longer
+    matches the output). A rerun with --incremental (after a partial failure, or during the day)
+    only reads the files that are not in the manifest and appends their
+    records before the end-of-file record, so its cost grows with the new
+    files rather than the whole day. New files are appended after the ones
+    already merged, even if their timestamps are earlier. A merged file whose contents changed
+    since is reported and not merged again. If the manifest does not match
+    the output (e.g. the last run stopped part-way), everything is merged
+    from scratch.
+
+Validation (--validate):
+    Each session file is checked in a pool of worker processes before it is
+    merged: every record must have the fixed-width layout the Back End reads
+    (field widths and separators, a numeric account number and money
+    amount), a known transaction code, and the file must end with exactly
+    one end-of-session (00) record. Line endings are normalized to LF.
+    Checked files are spliced into the output in the usual order; a file with
+    any problem is moved to the quarantine directory instead, and each of
+    its problems is added to quarantine_report.csv there:
+        file,line,problem
+        quarantine/03-12-2026 14-05-33.txt,4,invalid money amount '0001x.00'
 
 Usage:
-    python merge_transactions.py [source_dir] [output_file]
+    python merge_transactions.py [options] [source_dir] [output_file]
+
+Options:
+    --validate         check each session file before merging it (see above).
+    --workers=N        number of worker processes used by --validate
+                       (default: one per CPU; 1 checks files in-process).
+    --quarantine=DIR   where --validate moves bad files (default: a
+                       quarantine directory next to output_file).
+    --incremental      append only the session files that are not in the
+                       manifest yet (see below) to the existing output.
+    --binary           write the merged file in the binary transaction
+                       format (see binary_transactions.py). Session files
+                       may be in either format (.txt or .btx).
 
 Arguments (both optional):
-    source_dir   - directory to scan for Front End transaction files.
+    source_dir   - directory to scan for Front End transaction files, or
+                   several directories separated by os.pathsep (":" on
+                   Unix, ";" on Windows).
                    Defaults to the Frontend/ directory relative to the repo root.
-    output_file  - path to write the merged output.
+    output_file  - path to write the merged output, or "-" to write it to
+                   standard output (e.g. piped into main.py -); messages
+                   then go to standard error, and no session index or
+                   manifest is written.
                    Defaults to merged_transactions.txt in the repo root.
 """
 
+import csv
+import hashlib
+import heapq
+import json
 import os
 import re
+import shutil
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import binary_transactions as binary
+import stdio
+from lists import parse_transaction_line
+from registry import DEFAULT_HANDLERS
 
 
 # Pattern that matches Front End transaction filenames: MM-DD-YYYY HH-MM-SS.txt
+# (or .btx for the binary format, see binary_transactions.py)
 TRANSACTION_FILE_PATTERN = re.compile(
-    r"^\d{2}-\d{2}-\d{4} \d{2}-\d{2}-\d{2}\.txt$"
+    r"^\d{2}-\d{2}-\d{4} \d{2}-\d{2}-\d{2}\.(txt|btx)$"
 )
 
+# strptime format of the timestamp in a transaction filename.
+TIMESTAMP_FORMAT = "%m-%d-%Y %H-%M-%S"
+
 # The end-of-session record written by the Front End (code 00).
 END_OF_SESSION_PREFIX = "00 "
+END_OF_SESSION_BYTES  = END_OF_SESSION_PREFIX.encode()
 
+# The single end-of-session record that terminates the merged file.
+END_OF_FILE_RECORD = "00 END_OF_FILE          00000 00000000 00\n"
 
-def find_transaction_files(source_dir: str) -> list[str]:
+# Suffix of the session index written next to the merged file.
+SESSIONS_SUFFIX = ".sessions"
+
+SESSIONS_HEADER = ("first_line", "records", "file")
+
+# Suffix and format version of the manifest written next to the merged file.
+MANIFEST_SUFFIX  = ".manifest.json"
+MANIFEST_VERSION = 1
+
+# Name and header of the report kept in the quarantine directory.
+QUARANTINE_REPORT = "quarantine_report.csv"
+QUARANTINE_HEADER = ("file", "line", "problem")
+
+# Session files checked ahead of the one being written, per worker process.
+_VALIDATE_AHEAD = 4
+
+
+class CheckedSession(NamedTuple):
+    """The result of validating one session file."""
+    records:  bytes                   # normalized records, without the 00 record
+    count:    int                     # number of records
+    problems: List[Tuple[int, str]]   # (line number, description); line 0 is the whole file
+    sha256:   str                     # hex SHA-256 of the file as read
+
+
+class Session(NamedTuple):
+    """One Front End transaction file, with the fields it is ordered by."""
+    timestamp: datetime
+    source:    int   # position of its directory in the source list
+    name:      str
+    path:      str
+
+
+def parse_timestamp(filename: str) -> Optional[datetime]:
     """
-    Return a sorted list of Front End transaction file paths found in source_dir.
+    Return the date and time encoded in a transaction filename.
 
-    Files are sorted chronologically by filename (which encodes the timestamp).
+    Args:
+        filename: A file name (not a path), e.g. "03-12-2026 14-05-33.txt".
+
+    Returns:
+        The timestamp, or None if the name does not match the pattern or is
+        not a valid date and time.
+    """
+    if not TRANSACTION_FILE_PATTERN.match(filename):
+        return None
+    try:
+        return datetime.strptime(filename[:-4], TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def find_sessions(source_dir: str, source: int = 0) -> List[Session]:
+    """
+    Return the Front End transaction files found in source_dir, oldest first.
+
+    Files whose names match the pattern but do not hold a valid date and time
+    are skipped with a warning.
 
     Args:
         source_dir: Directory to scan.
+        source:     Position of the directory in the source list.
 
     Returns:
-        List of absolute file paths, sorted oldest-first.
+        The sessions, sorted by timestamp and then by file name.
     """
     if not os.path.isdir(source_dir):
         print(f"ERROR: Source directory not found: {source_dir}")
         return []
 
-    matches = [
-        os.path.join(source_dir, f)
-        for f in sorted(os.listdir(source_dir))
-        if TRANSACTION_FILE_PATTERN.match(f)
-    ]
-    return matches
+    sessions = []
+    for name in os.listdir(source_dir):
+        if not TRANSACTION_FILE_PATTERN.match(name):
+            continue
+        timestamp = parse_timestamp(name)
+        if timestamp is None:
+            print(f"Warning: skipping {name}: invalid timestamp.")
+            continue
+        sessions.append(Session(timestamp, source, name, os.path.join(source_dir, name)))
+    sessions.sort()
+    return sessions
+
+
+def find_transaction_files(source_dir: str) -> list[str]:
+    """
+    Return a sorted list of Front End transaction file paths found in source_dir.
+
+    Files are sorted chronologically by the date and time parsed from their
+    names (so December 2025 comes before January 2026).
+
+    Args:
+        source_dir: Directory to scan.
+
+    Returns:
+        List of file paths, sorted oldest-first.
+    """
+    return [session.path for session in find_sessions(source_dir)]
+
+
+def iter_sessions(source_dirs: Iterable[str]) -> Iterator[Session]:
+    """
+    Merge the sessions of several directories into one chronological stream.
+
+    Args:
+        source_dirs: Directories to scan, in tie-breaking order.
+
+    Returns:
+        An iterator over every session, ordered as described above.
+    """
+    return heapq.merge(*(find_sessions(d, i) for i, d in enumerate(source_dirs)))
+
+
+class _HashedFile:
+    """Wraps a session file open for reading, hashing everything read from it."""
+
+    def __init__(self, fh: BinaryIO):
+        self.fh     = fh
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fh.read(size)
+        self.digest.update(data)
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        for line in self.fh:
+            self.digest.update(line)
+            yield line
+
+    def hexdigest(self) -> str:
+        """Return the hex SHA-256 of the whole file, reading whatever has not been read yet."""
+        while self.read(1 << 16):
+            pass
+        return self.digest.hexdigest()
+
+
+def session_lines(fh: _HashedFile) -> Iterator[bytes]:
+    """
+    Yield the text records of a session file, in either format, one at a time.
+
+    Raises:
+        ValueError: If a binary session file is damaged.
+    """
+    if binary.is_binary(fh.fh.peek(len(binary.MAGIC))):
+        for record in binary.iter_records(fh):
+            yield binary.decode_record(record)
+    else:
+        yield from fh
+
+
+def copy_records(path: str, out: BinaryIO, binary_output: bool = False) -> Tuple[int, str]:
+    """
+    Copy the records of a session file to out, without its end-of-session records.
+
+    Args:
+        path:          The session file (text or binary).
+        out:           The merged file, open for writing in binary mode.
+        binary_output: Write the records in the binary format instead of as text.
+
+    Returns:
+        The number of records copied and the hex SHA-256 of the file.
+    """
+    count = 0
+    with open(path, "rb") as f:
+        fh = _HashedFile(f)
+        for raw in session_lines(fh):
+            if raw.startswith(END_OF_SESSION_BYTES):
+                continue
+            line = raw.rstrip(b"\r\n") + b"\n"
+            out.write(binary.encode_line(line) if binary_output else line)
+            count += 1
+        return count, fh.hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    """Return the hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def validate_session(path: str, binary_output: bool = False) -> CheckedSession:
+    """
+    Check and normalize one Front End session file.
+
+    Args:
+        path:          The session file (text or binary).
+        binary_output: Return the records in the binary format instead of as text.
+
+    Returns:
+        The normalized records and the problems found (none if the file is
+        good).
+    """
+    records:  List[bytes]           = []
+    problems: List[Tuple[int, str]] = []
+    ended = False
+    with open(path, "rb") as f:
+        fh = _HashedFile(f)
+        try:
+            for line_number, raw in enumerate(session_lines(fh), 1):
+                if ended:
+                    problems.append((line_number, "record after the end-of-session (00) record"))
+                    break
+                try:
+                    transaction = parse_transaction_line(raw, line_number)
+                except ValueError as e:
+                    problems.append((line_number, str(e)))
+                    continue
+                if transaction.code not in DEFAULT_HANDLERS:
+                    problems.append((line_number, f"unknown transaction code {transaction.code!r}"))
+                elif transaction.code == "00":
+                    ended = True
+                else:
+                    line = raw.rstrip(b"\r\n") + b"\n"
+                    records.append(binary.encode_line(line) if binary_output else line)
+        except ValueError as e:
+            problems.append((0, str(e)))
+        sha256 = fh.hexdigest()
+    if not ended and not problems:
+        problems.append((0, "missing end-of-session (00) record"))
+    return CheckedSession(b"".join(records), len(records), problems, sha256)
+
+
+def iter_checked(sessions: Iterable[Session], workers: int,
+                 binary_output: bool = False) -> Iterator[Tuple[Session, CheckedSession]]:
+    """
+    Validate sessions in a pool of worker processes, yielding the results in order.
+
+    At most workers * _VALIDATE_AHEAD files are being checked or waiting to be
+    written at any time.
+
+    Args:
+        sessions:      The sessions, in merge order.
+        workers:       Number of worker processes; 1 validates in this process.
+        binary_output: Return the records in the binary format.
+    """
+    if workers <= 1:
+        for session in sessions:
+            yield session, validate_session(session.path, binary_output)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending: deque = deque()
+        for session in sessions:
+            pending.append((session, pool.submit(validate_session, session.path, binary_output)))
+            if len(pending) >= workers * _VALIDATE_AHEAD:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+
+def quarantine(session: Session, problems: List[Tuple[int, str]], quarantine_dir: str) -> str:
+    """
+    Move a bad session file to the quarantine directory and report its problems.
+
+    Args:
+        session:        The bad session.
+        problems:       Its (line number, description) problems.
+        quarantine_dir: Directory to move it to (created if needed).
+
+    Returns:
+        The quarantined file's new path.
+    """
+    os.makedirs(quarantine_dir, exist_ok=True)
+    target = os.path.join(quarantine_dir, session.name)
+    stem, extension = os.path.splitext(session.name)
+    suffix = 1
+    while os.path.exists(target):
+        target = os.path.join(quarantine_dir, f"{stem} ({suffix}){extension}")
+        suffix += 1
+    shutil.move(session.path, target)
+
+    report_path = os.path.join(quarantine_dir, QUARANTINE_REPORT)
+    new_report  = not os.path.exists(report_path)
+    with open(report_path, "a", newline="") as f:
+        report = csv.writer(f)
+        if new_report:
+            report.writerow(QUARANTINE_HEADER)
+        report.writerows((target, line or "", problem) for line, problem in problems)
+    return target
+
+
+def load_manifest(output_file: str, binary_output: bool = False) -> Optional[Dict]:
+    """
+    Load the manifest of a merged file, if it still describes the file.
+
+    Args:
+        output_file:   The merged transaction file.
+        binary_output: Whether the merged file should be in the binary format.
+
+    Returns:
+        The manifest, or None if there is none, it is for the other format,
+        or the merged file no longer has the size and end-of-file record the
+        manifest expects (e.g. an earlier run stopped part-way through).
+    """
+    end_record = end_of_file_record(binary_output)
+    try:
+        with open(output_file + MANIFEST_SUFFIX) as f:
+            manifest = json.load(f)
+        size = os.path.getsize(output_file)
+        with open(output_file, "rb") as f:
+            f.seek(max(size - len(end_record), 0))
+            tail = f.read()
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("size") != size \
+            or manifest.get("binary", False) != binary_output or tail != end_record:
+        return None
+    return manifest
+
+
+def end_of_file_record(binary_output: bool) -> bytes:
+    """Return the end-of-file record that ends a merged file, in the text or binary format."""
+    return binary.encode_line(END_OF_FILE_RECORD.encode()) if binary_output else END_OF_FILE_RECORD.encode()
+
+
+def save_manifest(output_file: str, manifest: Dict):
+    """Write the manifest of a merged file, replacing the old one atomically."""
+    path = output_file + MANIFEST_SUFFIX
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(path + ".tmp", path)
+
+
+def is_merged(session: Session, manifest: Dict) -> bool:
+    """
+    Return True if a session is already in the merged file described by manifest.
+
+    A file whose size or modification time differs from the manifest is
+    hashed; if its contents changed since it was merged, a warning is
+    printed and it is still treated as merged (it is not merged again).
+    """
+    entry = manifest["files"].get(os.path.abspath(session.path))
+    if entry is None:
+        return False
+    stat = os.stat(session.path)
+    if (stat.st_size, stat.st_mtime_ns) == (entry["size"], entry["mtime_ns"]):
+        return True
+    if file_sha256(session.path) == entry["sha256"]:
+        entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+    else:
+        print(f"Warning: {session.path} changed after it was merged; it is not merged again.")
+    return True
 
 
-def merge(source_dir: str, output_file: str) -> bool:
+def merge(source_dir: Union[str, List[str]], output_file: str, validate: bool = False,
+          workers: Optional[int] = None, quarantine_dir: Optional[str] = None,
+          incremental: bool = False, binary_output: bool = False) -> bool:
     """
     Merge all Front End transaction files from source_dir into output_file.
 
     For each input file, every line except end-of-session (code 00) records is
-    written to the output. A single end-of-session record is appended at the end.
+    written to the output. A single end-of-session record is appended at the end,
+    and the session index is written to output_file + ".sessions".
+
+    With validate=True, each file is checked first (see validate_session)
+    and files with problems are quarantined instead of merged.
+
+    With incremental=True, the merged files are recorded in output_file +
+    ".manifest.json", files already in it are skipped and only new files are
+    appended to the existing merged file; files that changed after they were
+    merged are reported. Without a usable manifest, the merge starts from
+    scratch. Other merges remove the manifest.
 
     Args:
-        source_dir:  Directory containing Front End transaction files.
-        output_file: Path to write the merged transaction file.
+        source_dir:     Directory containing Front End transaction files, or a
+                        list of such directories.
+        output_file:    Path to write the merged transaction file.
+        validate:       Check each file before merging it.
+        workers:        Worker processes used for validation (default: one
+                        per CPU).
+        quarantine_dir: Where bad files are moved (default: a quarantine
+                        directory next to output_file).
+        incremental:    Append only files that are not in the manifest yet.
+        binary_output:  Write the merged file in the binary format (see
+                        binary_transactions.py) instead of as text.
 
     Returns:
         True if at least one file was merged, False otherwise.
     """
-    files = find_transaction_files(source_dir)
+    source_dirs = [source_dir] if isinstance(source_dir, str) else list(source_dir)
+    to_stdout   = stdio.is_stdio(output_file)
+    if to_stdout and incremental:
+        print("ERROR: An incremental merge appends to its output file; it cannot be standard output (-).")
+        return False
+    with stdio.messages_to_stderr(to_stdout):
+        return _merge(source_dirs, output_file, validate, workers, quarantine_dir, incremental, binary_output)
+
 
-    if not files:
-        print(f"No transaction files found in: {source_dir}")
+def _merge(source_dirs: List[str], output_file: str, validate: bool, workers: Optional[int],
+           quarantine_dir: Optional[str], incremental: bool, binary_output: bool) -> bool:
+    """Merge the sessions of source_dirs into output_file (see merge)."""
+    to_stdout   = stdio.is_stdio(output_file)
+    sessions    = iter_sessions(source_dirs)
+    manifest    = load_manifest(output_file, binary_output) if incremental else None
+    if incremental and manifest is None and os.path.exists(output_file):
+        print(f"Warning: no usable manifest for {output_file}; merging all files again.")
+    if manifest is not None:
+        sessions = (session for session in sessions if not is_merged(session, manifest))
+    session = next(sessions, None)
+
+    if session is None:
+        if manifest is not None:
+            save_manifest(output_file, manifest)
+            print(f"No new transaction files found in: {os.pathsep.join(source_dirs)}")
+        else:
+            print(f"No transaction files found in: {os.pathsep.join(source_dirs)}")
         return False
 
-    print(f"Merging {len(files)} transaction file(s):")
-    for f in files:
-        print(f"  {os.path.basename(f)}")
+    print("Merging transaction file(s):")
+    sessions = chain((session,), sessions)
+    if validate:
+        checked = iter_checked(sessions, workers or os.cpu_count() or 1, binary_output)
+        if quarantine_dir is None:
+            quarantine_dir = os.path.join(os.path.dirname(output_file), "quarantine")
+    else:
+        checked = ((session, None) for session in sessions)
 
-    with open(output_file, "w") as out:
-        for path in files:
-            with open(path, "r") as fh:
-                for line in fh:
-                    # Skip end-of-session records from individual files;
-                    # a single one will be written after all files are merged.
-                    if line.startswith(END_OF_SESSION_PREFIX):
-                        continue
-                    out.write(line)
+    end_record = end_of_file_record(binary_output)
+    if manifest is None:
+        manifest = {"version": MANIFEST_VERSION, "binary": binary_output, "size": 0, "records": 0, "files": {}}
+        mode     = "w"
+    else:
+        # Drop the end-of-file record; it is written again after the new records.
+        os.truncate(output_file, manifest["size"] - len(end_record))
+        mode = "a"
+    files       = manifest["files"]
+    line_number = manifest["records"]
+    merged      = 0
+    rejected    = 0
+    with stdio.open_output(output_file, mode + "b") as out, \
+         _session_index(output_file, mode) as index:
+        if binary_output and mode == "w":
+            out.write(binary.file_header())
+        for session, result in checked:
+            label = session.path if len(source_dirs) > 1 else session.name
+            stat  = os.stat(session.path)
+            if result is None:
+                count, sha256 = copy_records(session.path, out, binary_output)
+            elif result.problems:
+                target = quarantine(session, result.problems, quarantine_dir)
+                print(f"  {label}: {len(result.problems)} problem(s), quarantined as {target}")
+                rejected += 1
+                continue
+            else:
+                out.write(result.records)
+                count, sha256 = result.count, result.sha256
+            print(f"  {label}")
+            if index is not None:
+                index.writerow((line_number + 1, count, session.path))
+            files[os.path.abspath(session.path)] = {
+                "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256,
+                "first_line": line_number + 1, "records": count,
+            }
+            line_number += count
+            merged += 1
 
         # Write the single end-of-session record that terminates the merged file.
-        out.write("00 END_OF_FILE          00000 00000000 00\n")
+        out.write(end_record)
 
-    print(f"Merged output written to: {output_file}")
-    return True
+    if incremental:
+        manifest["records"] = line_number
+        manifest["size"]    = os.path.getsize(output_file)
+        save_manifest(output_file, manifest)
+    elif not to_stdout and os.path.exists(output_file + MANIFEST_SUFFIX):
+        os.remove(output_file + MANIFEST_SUFFIX)
+
+    print(f"Merged {merged} transaction file(s) into: {output_file}")
+    if rejected:
+        print(f"Warning: {rejected} file(s) quarantined; see {os.path.join(quarantine_dir, QUARANTINE_REPORT)}")
+    return merged > 0
+
+
+@contextmanager
+def _session_index(output_file: str, mode: str) -> Iterator[Optional[Any]]:
+    """Open the session index of a merged file as a CSV writer (None for standard output)."""
+    if stdio.is_stdio(output_file):
+        yield None
+        return
+    with open(output_file + SESSIONS_SUFFIX, mode, newline="") as f:
+        index = csv.writer(f)
+        if mode == "w":
+            index.writerow(SESSIONS_HEADER)
+        yield index
 
 
 def main() -> None:
     """Parse arguments and run the merge."""
-    args     = sys.argv[1:]
+    args:    list[str]      = []
+    options: dict[str, str] = {}
+    for arg in sys.argv[1:]:
+        if arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value
+        else:
+            args.append(arg)
     base_dir = os.path.join(os.path.dirname(__file__), "..")
 
     source_dir  = args[0] if len(args) >= 1 else base_dir
     output_file = args[1] if len(args) >= 2 else os.path.join(base_dir, "merged_transactions.txt")
 
-    merge(source_dir, output_file)
+    workers = int(options["workers"]) if options.get("workers") else None
+    merge(source_dir.split(os.pathsep), output_file, validate="validate" in options,
+          workers=workers, quarantine_dir=options.get("quarantine") or None,
+          incremental="incremental" in options, binary_output="binary" in options)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+"""
+backend/money.py
+
+Fixed-point money helpers for the Banking System Back End.
+
+Every balance, transaction amount and fee in the Back End is an int holding a
+whole number of cents. Amounts are converted from text once when a file is
+parsed and back to text once when a file or message is written, so no float
+arithmetic or rounding happens in between and replaying the same records
+always produces exactly the same balances.
+"""
+
+
+def is_digits(text: str) -> bool:
+    """Return True if text is a non-empty run of ASCII digits."""
+    return text.isascii() and text.isdigit()
+
+
+def parse_cents(text: str) -> int:
+    """
+    Convert a money field such as "01000.00" into integer cents.
+
+    Fields without a decimal point (e.g. the "00000000" end-of-session amount)
+    are read as whole dollars.
+
+    Args:
+        text: The money field, optionally signed, with at most 2 decimals.
+
+    Returns:
+        The amount in cents.
+
+    Raises:
+        ValueError: If the field is not a valid money amount.
+    """
+    text = text.strip()
+    if text.startswith("-"):
+        return -parse_cents(text[1:])
+    whole, point, frac = text.partition(".")
+    if not is_digits(whole) or (point and not (is_digits(frac) and len(frac) <= 2)):
+        raise ValueError(f"Invalid money amount: {text!r}")
+    return int(whole) * 100 + (int(frac.ljust(2, "0")) if frac else 0)
+
+
+def format_cents(cents: int, width: int = 8) -> str:
+    """
+    Format integer cents as a zero-padded money field, e.g. 100000 -> "01000.00".
+
+    Args:
+        cents: The amount in cents.
+        width: Total field width, including the decimal point and any sign.
+
+    Returns:
+        The formatted field (longer than width if the amount does not fit).
+    """
+    sign = "-" if cents < 0 else ""
+    dollars, rest = divmod(abs(cents), 100)
+    return f"{sign}{dollars:0{max(width - 3 - len(sign), 1)}d}.{rest:02d}"
+
+
+def format_dollars(cents: int) -> str:
+    """Format integer cents for a message, e.g. 75000 -> "$750.00"."""
+    return "$" + format_cents(cents, width=0)
@@ -0,0 +1,401 @@
+"""
+backend/prevalidate.py
+
+Bulk check of a merged transaction file before any account is touched
+(main.py --validate-only and --prevalidate).
+
+The Back End applies transactions as it reads them, so a bad feed is only
+noticed record by record: malformed lines are skipped as they are met and
+other problems surface inside the handlers, after earlier records have
+already changed the accounts. This module checks the whole file first and
+reports every problem at once, with its line number:
+
+    BAD_ENCODING   the line is not valid UTF-8
+    BAD_WIDTH      the record is not 41 characters (38 without the misc field)
+    BAD_SEPARATOR  a field separator column is not a space
+    BAD_CODE       the transaction code is not two digits
+    BAD_ACCOUNT    the account number is not five digits (binary: over 99999)
+    BAD_AMOUNT     the money field is neither DDDDD.DD nor DDDDDDDD
+    UNKNOWN_CODE   no Back End handler for the transaction code
+    AMOUNT_LIMIT   the amount is over 99999.99
+    BLANK_LINE     an empty (or all-space) line
+    AFTER_END      a record after the end-of-file (00) record (first one only)
+    MISSING_END    the file does not end with a 00 record (line 0)
+    BAD_HEADER     a binary file's header is not valid (line 0)
+
+Each record gets at most one problem, the first in the order above.
+
+With NumPy installed, each batch of the file is checked column by column:
+the batch's lines are gathered into a 2-D array of fixed-width rows and
+every check is one array operation over a column range, so no per-line
+Python code runs except to describe the lines that fail. Lines with
+non-ASCII bytes (whose character width differs from their byte width)
+are checked one at a time. Without NumPy the same checks run line by line,
+with the same results.
+
+Files in the binary transaction format are checked too (codes, account
+numbers, amounts and the end record; their layout is fixed by the format).
+"""
+
+import csv
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the checks then run line by line.
+    np = None
+
+import stdio
+from lists import (BINARY_MAGIC, CODE_COLUMNS, DECIMAL_COLUMN, MONEY_COLUMNS, NUMBER_COLUMNS, SPACE_COLUMNS,
+                   TRANSACTION_RECORD_LENGTH, open_transactions)
+from registry import DEFAULT_HANDLERS
+
+# Problem kinds, in the order records are checked.
+BAD_ENCODING  = "BAD_ENCODING"
+BAD_WIDTH     = "BAD_WIDTH"
+BAD_SEPARATOR = "BAD_SEPARATOR"
+BAD_CODE      = "BAD_CODE"
+BAD_ACCOUNT   = "BAD_ACCOUNT"
+BAD_AMOUNT    = "BAD_AMOUNT"
+UNKNOWN_CODE  = "UNKNOWN_CODE"
+AMOUNT_LIMIT  = "AMOUNT_LIMIT"
+BLANK_LINE    = "BLANK_LINE"
+AFTER_END     = "AFTER_END"
+MISSING_END   = "MISSING_END"
+BAD_HEADER    = "BAD_HEADER"
+
+REPORT_HEADER = ("line", "problem", "detail")
+
+# Largest amount a transaction may carry, in cents (99999.99).
+MAX_AMOUNT_CENTS = 9999999
+
+# Width of a record written without its misc field.
+SHORT_RECORD_LENGTH = TRANSACTION_RECORD_LENGTH - 3
+
+_KNOWN_CODES = sorted(int(code) for code in DEFAULT_HANDLERS)
+
+
+class Problem(NamedTuple):
+    """One problem found in the merged transaction file."""
+    line:   int   # 1-based line (record) number; 0 for the file as a whole
+    kind:   str   # one of the problem kinds above
+    detail: str
+
+
+class ValidationReport(NamedTuple):
+    """The result of checking a merged transaction file."""
+    records:  int             # non-blank lines (binary: records) checked
+    problems: List[Problem]
+
+
+def check_line(raw: bytes) -> Optional[Tuple[str, str]]:
+    """
+    Check one text record (without its line ending).
+
+    This is the line-at-a-time form of the checks; the vectorized batch
+    check gives the same result for every line.
+
+    Returns:
+        (kind, detail) of the first problem, or None if the record is good.
+        A blank line is reported as BLANK_LINE.
+    """
+    try:
+        line = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return BAD_ENCODING, "not valid UTF-8"
+    if not line.strip(" "):
+        return BLANK_LINE, "blank line"
+    if len(line) not in (TRANSACTION_RECORD_LENGTH, SHORT_RECORD_LENGTH):
+        return BAD_WIDTH, f"expected {TRANSACTION_RECORD_LENGTH} characters, found {len(line)}"
+    line = line.ljust(TRANSACTION_RECORD_LENGTH)
+    if any(line[c] != " " for c in SPACE_COLUMNS):
+        return BAD_SEPARATOR, "fields are not separated by spaces at the expected columns"
+    code   = line[CODE_COLUMNS[0]:CODE_COLUMNS[1]]
+    number = line[NUMBER_COLUMNS[0]:NUMBER_COLUMNS[1]]
+    money  = line[MONEY_COLUMNS[0]:MONEY_COLUMNS[1]]
+    if not _is_ascii_digits(code):
+        return BAD_CODE, f"invalid transaction code {code!r}"
+    if not _is_ascii_digits(number):
+        return BAD_ACCOUNT, f"invalid account number {number!r}"
+    whole = _is_ascii_digits(money)
+    if not (whole or (money[5] == "." and _is_ascii_digits(money[:5]) and _is_ascii_digits(money[6:]))):
+        return BAD_AMOUNT, f"invalid money amount {money!r}"
+    if int(code) not in _KNOWN_CODES:
+        return UNKNOWN_CODE, f"unknown transaction code {code!r}"
+    if whole and int(money) * 100 > MAX_AMOUNT_CENTS:
+        return AMOUNT_LIMIT, f"money amount {money!r} is over 99999.99"
+    return None
+
+
+def _is_ascii_digits(text: str) -> bool:
+    """Return True if text is non-empty and only ASCII digits."""
+    return text.isascii() and text.isdigit()
+
+
+class _Checker:
+    """Checks a merged file batch by batch, tracking the end-of-file record across batches."""
+
+    def __init__(self):
+        self.records  = 0
+        self.problems: List[Problem] = []
+        self.end_line  = 0       # line of the first 00 record, 0 until one is seen
+        self.after_end = False   # AFTER_END already reported
+        self.last_code = None    # code of the last non-blank record
+
+    def record(self, line: int, code: Optional[int], problem: Optional[Tuple[str, str]]):
+        """Account for one record (in line order): its code if known, and its problem if any."""
+        if problem is not None and problem[0] == BLANK_LINE:
+            self.problems.append(Problem(line, *problem))
+            return
+        self.records += 1
+        if self.end_line and not self.after_end:
+            self.after_end = True
+            self.problems.append(Problem(line, AFTER_END, "record after the end-of-file (00) record"))
+        elif problem is not None:
+            self.problems.append(Problem(line, *problem))
+        self.last_code = code
+        if code == 0 and not self.end_line:
+            self.end_line = line
+
+    def record_batch(self, first_line: int, codes, found: Dict[int, Tuple[str, str]]):
+        """
+        Account for a batch of records at once, as record() would one by one.
+
+        Args:
+            first_line: Line number of the batch's first record.
+            codes:      Array of the records' codes, -1 where unreadable.
+            found:      Problems by index in the batch.
+        """
+        blank = np.zeros(len(codes), dtype=bool)
+        blank[[i for i, problem in found.items() if problem[0] == BLANK_LINE]] = True
+        present = np.flatnonzero(~blank)
+        self.records += len(present)
+        if len(present):
+            if not self.end_line:
+                end = present[codes[present] == 0]
+                if len(end):
+                    self.end_line = first_line + int(end[0])
+            if self.end_line and not self.after_end:
+                later = present[present > self.end_line - first_line]
+                if len(later):
+                    self.after_end = True
+                    found[int(later[0])] = (AFTER_END, "record after the end-of-file (00) record")
+            self.last_code = int(codes[present[-1]]) if codes[present[-1]] >= 0 else None
+        self.problems.extend(Problem(first_line + i, *found[i]) for i in sorted(found))
+
+    def finish(self) -> ValidationReport:
+        """Add the end-of-file check and return the report."""
+        if self.last_code != 0:
+            self.problems.append(Problem(0, MISSING_END, "missing end-of-file (00) record"))
+        return ValidationReport(self.records, self.problems)
+
+    # Text files
+    def check_text_lines(self, chunk: bytes, first_line: int):
+        """Check a batch of complete text lines one at a time."""
+        lines = chunk.split(b"\n")
+        if lines[-1] == b"":
+            lines.pop()
+        for n, raw in enumerate(lines, first_line):
+            body = raw[:-1] if raw.endswith(b"\r") else raw
+            problem = check_line(body)
+            code = None
+            if problem is None or problem[0] in (UNKNOWN_CODE, AMOUNT_LIMIT):
+                code = int(body[0:2])
+            self.record(n, code, problem)
+
+    def check_text_columns(self, chunk: bytes, first_line: int):
+        """Check a batch of complete text lines with array operations over their columns."""
+        data   = np.frombuffer(chunk, dtype=np.uint8)
+        ends   = np.flatnonzero(data == ord("\n"))
+        if len(data) and data[-1] != ord("\n"):
+            ends = np.append(ends, len(data))
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        cr     = np.zeros(len(ends), dtype=bool)
+        nonempty = ends > starts
+        cr[nonempty] = data[ends[nonempty] - 1] == ord("\r")
+        body_ends = ends - cr
+        lengths   = body_ends - starts
+
+        # Only lines starting with a space (or empty) can be blank; only a
+        # chunk with a byte over 0x7f can hold non-ASCII lines.
+        blank = lengths == 0
+        for i in np.flatnonzero(~blank & (data[np.minimum(starts, len(data) - 1)] == ord(" "))).tolist():
+            blank[i] = not chunk[starts[i]:body_ends[i]].strip(b" ")
+        non_ascii = np.zeros(len(ends), dtype=bool)
+        if len(data) and data.max() >= 0x80:
+            total = np.concatenate(([0], np.cumsum(data >= 0x80, dtype=np.int64)))
+            non_ascii = total[body_ends] > total[starts]
+        found: Dict[int, Tuple[str, str]] = {}
+        codes = np.full(len(ends), -1, dtype=np.int64)
+
+        for i in np.flatnonzero(non_ascii).tolist():
+            body = chunk[starts[i]:body_ends[i]]
+            problem = check_line(body)
+            if problem is not None:
+                found[i] = problem
+            if problem is None or problem[0] in (UNKNOWN_CODE, AMOUNT_LIMIT):
+                codes[i] = int(body[0:2])
+        for i in np.flatnonzero(blank & ~non_ascii).tolist():
+            found[i] = (BLANK_LINE, "blank line")
+        regular = ~non_ascii & ~blank
+        for i in np.flatnonzero(regular & (lengths != TRANSACTION_RECORD_LENGTH)
+                                & (lengths != SHORT_RECORD_LENGTH)).tolist():
+            found[i] = (BAD_WIDTH, f"expected {TRANSACTION_RECORD_LENGTH} characters, found {lengths[i]}")
+
+        rows = np.flatnonzero(regular & ((lengths == TRANSACTION_RECORD_LENGTH) | (lengths == SHORT_RECORD_LENGTH)))
+        if len(rows):
+            index = starts[rows, None] + np.arange(TRANSACTION_RECORD_LENGTH)
+            grid  = data[np.minimum(index, len(data) - 1)]
+            grid[lengths[rows] == SHORT_RECORD_LENGTH, SHORT_RECORD_LENGTH:] = ord(" ")
+            digit = (grid >= ord("0")) & (grid <= ord("9"))
+            value = grid.astype(np.int64) - ord("0")
+            code  = value[:, 0] * 10 + value[:, 1]
+            whole = digit[:, 30:38].all(axis=1)
+            point = (digit[:, 30:35].all(axis=1) & (grid[:, DECIMAL_COLUMN] == ord("."))
+                     & digit[:, 36:38].all(axis=1))
+            dollars = value[:, 30:38] @ (10 ** np.arange(7, -1, -1, dtype=np.int64))
+            checks = (
+                (BAD_SEPARATOR, (grid[:, list(SPACE_COLUMNS)] != ord(" ")).any(axis=1)),
+                (BAD_CODE,      ~digit[:, 0:2].all(axis=1)),
+                (BAD_ACCOUNT,   ~digit[:, 24:29].all(axis=1)),
+                (BAD_AMOUNT,    ~(whole | point)),
+                (UNKNOWN_CODE,  ~np.isin(code, _KNOWN_CODES)),
+                (AMOUNT_LIMIT,  whole & (dollars * 100 > MAX_AMOUNT_CENTS)),
+            )
+            failed = np.zeros(len(rows), dtype=bool)
+            for kind, mask in checks:
+                for j in np.flatnonzero(mask & ~failed).tolist():
+                    found[int(rows[j])] = _describe(kind, grid[j].tobytes().decode("ascii"))
+                failed |= mask
+            # UNKNOWN_CODE and AMOUNT_LIMIT records still have a readable code.
+            readable = ~(checks[0][1] | checks[1][1] | checks[2][1] | checks[3][1])
+            codes[rows[readable]] = code[readable]
+
+        self.record_batch(first_line, codes, found)
+
+    # Binary files
+    def check_binary(self, fh, magic: bytes, vectorized: bool, batch_bytes: int):
+        """Check the records of a binary transaction file."""
+        import binary_transactions as binary
+        try:
+            binary.check_header(magic + fh.read(binary.HEADER.size - len(magic)))
+        except ValueError as e:
+            self.problems.append(Problem(0, BAD_HEADER, str(e)))
+            return
+        size = binary.RECORD.size
+        line = 0
+        while True:
+            chunk = fh.read(max(batch_bytes // size, 1) * size)
+            if not chunk:
+                break
+            whole = len(chunk) - len(chunk) % size
+            if vectorized:
+                self.check_binary_columns(chunk[:whole], line + 1)
+            else:
+                for n, fields in enumerate(binary.RECORD.iter_unpack(chunk[:whole]), line + 1):
+                    self.record(n, fields[0], _check_binary_record(fields))
+            line += whole // size
+            if whole < len(chunk):
+                self.record(line + 1, None, (BAD_WIDTH, "binary file ends part-way through a record"))
+                break
+
+    def check_binary_columns(self, chunk: bytes, first_line: int):
+        """Check a batch of packed records with array operations over their fields."""
+        import binary_transactions as binary
+        rows  = np.frombuffer(chunk, dtype=_binary_dtype())
+        names = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, binary.RECORD.size)[:, 2:22]
+        codes = rows["code"].astype(np.int64)
+        bad = ((names >= 0x80).any(axis=1) | (rows["number"] > 99999) | ~np.isin(codes, _KNOWN_CODES)
+               | (rows["cents"] > MAX_AMOUNT_CENTS))
+        found = {}
+        for i in np.flatnonzero(bad).tolist():
+            found[i] = _check_binary_record(binary.RECORD.unpack_from(chunk, i * binary.RECORD.size))
+        self.record_batch(first_line, codes, found)
+
+
+def _describe(kind: str, line: str) -> Tuple[str, str]:
+    """Return (kind, detail) for a record that failed one of the column checks, worded as check_line() words it."""
+    details = {
+        BAD_SEPARATOR: "fields are not separated by spaces at the expected columns",
+        BAD_CODE:      f"invalid transaction code {line[0:2]!r}",
+        BAD_ACCOUNT:   f"invalid account number {line[24:29]!r}",
+        BAD_AMOUNT:    f"invalid money amount {line[30:38]!r}",
+        UNKNOWN_CODE:  f"unknown transaction code {line[0:2]!r}",
+        AMOUNT_LIMIT:  f"money amount {line[30:38]!r} is over 99999.99",
+    }
+    return kind, details[kind]
+
+
+def _check_binary_record(fields: Tuple) -> Optional[Tuple[str, str]]:
+    """Check the unpacked fields of one binary record; return (kind, detail) of its first problem or None."""
+    code, _, name, number, cents, _ = fields
+    if not name.isascii():
+        return BAD_ENCODING, "account name is not ASCII"
+    if number > 99999:
+        return BAD_ACCOUNT, f"invalid account number {number}"
+    if code not in _KNOWN_CODES:
+        return UNKNOWN_CODE, f"unknown transaction code '{code:02d}'"
+    if cents > MAX_AMOUNT_CENTS:
+        return AMOUNT_LIMIT, f"money amount {cents // 100}.{cents % 100:02d} is over 99999.99"
+    return None
+
+
+def _binary_dtype():
+    """Return the NumPy record type matching binary_transactions.RECORD."""
+    return np.dtype([("code", "u1"), ("flags", "u1"), ("name", "S20"),
+                     ("number", "<u4"), ("cents", "<u8"), ("misc", "S2")])
+
+
+def validate_file(path: str, batch_bytes: int = 1 << 20, vectorized: Optional[bool] = None) -> ValidationReport:
+    """
+    Check every record of a merged transaction file.
+
+    Args:
+        path:        The merged transaction file (also "-" or an archived
+                     file, as for TransactionsList).
+        batch_bytes: Approximate number of bytes checked per batch.
+        vectorized:  Use the NumPy column checks (default: if NumPy is
+                     installed) or the line-by-line checks.
+
+    Returns:
+        The number of records checked and the problems found, in line order
+        (MISSING_END and BAD_HEADER, on line 0, come last).
+    """
+    vectorized = np is not None if vectorized is None else vectorized
+    checker = _Checker()
+    check_text = checker.check_text_columns if vectorized else checker.check_text_lines
+    line_number = 0
+    with open_transactions(path) as fh:
+        chunk = fh.read(len(BINARY_MAGIC))
+        if chunk == BINARY_MAGIC:
+            checker.check_binary(fh, chunk, vectorized, batch_bytes)
+            return checker.finish()
+        while True:
+            chunk += fh.read(batch_bytes)
+            if not chunk:
+                break
+            if not chunk.endswith(b"\n"):
+                chunk += fh.readline()
+            check_text(chunk, line_number + 1)
+            line_number += chunk.count(b"\n") + (not chunk.endswith(b"\n"))
+            chunk = b""
+    return checker.finish()
+
+
+def summary(report: ValidationReport) -> List[str]:
+    """Return the summary lines of a report: totals, then problems by kind, most frequent first."""
+    counts: Dict[str, int] = {}
+    for problem in report.problems:
+        counts[problem.kind] = counts.get(problem.kind, 0) + 1
+    lines = [f"Records checked: {report.records}", f"Problems found: {len(report.problems)}"]
+    for kind, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+        lines.append(f"  {kind:<24} {count}")
+    return lines
+
+
+def write_report(report: ValidationReport, path: str):
+    """Write the problems of a report as a CSV file (line,problem,detail); "-" for standard output."""
+    with stdio.open_output(path, newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_HEADER)
+        writer.writerows(report.problems)
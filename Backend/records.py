@@ -0,0 +1,110 @@
+"""
+backend/records.py
+
+Compact record types for the Banking System Back End.
+
+Account and Transaction replace the per-record dicts the Back End used to
+build for every account and every merged transaction. Both use __slots__, so
+each record carries no per-instance __dict__, and the small strings that
+repeat across millions of records (status, plan, transaction code, misc field)
+and the account numbers that merged transactions refer to again and again are
+interned so every record shares a single copy of each value.
+
+Both types keep the dict-style access the transaction handlers already use
+(record["balance"], record.get("plan", "SP"), record["status"] = "D"), so the
+handlers accept either a record or a plain dict with the same keys.
+"""
+
+import sys
+from typing import Any, Dict, Iterator
+
+
+# Returns the shared interned copy of a short, frequently repeated field.
+intern_field = sys.intern
+
+
+class _Record:
+    """Dict-style access shared by the slotted record types."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the field value for key, or default if there is no such field."""
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self) -> Iterator[str]:
+        """Return the field names, in record order."""
+        return iter(self.__slots__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain dict."""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={getattr(self, key)!r}" for key in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Account(_Record):
+    """One bank account record from the master accounts file."""
+
+    __slots__ = ("accountNumber", "accountName", "status", "balance", "plan", "transactionCount")
+
+    def __init__(self, accountNumber: str, accountName: str, status: str,
+                 balance: float, plan: str = "NP", transactionCount: int = 0):
+        self.accountNumber    = accountNumber
+        self.accountName      = accountName
+        self.status           = intern_field(status)
+        self.balance          = balance
+        self.plan             = intern_field(plan)
+        self.transactionCount = transactionCount
+
+    @classmethod
+    def from_dict(cls, account: Dict[str, Any]) -> "Account":
+        """Build an Account from an account dict (missing plan/count use defaults)."""
+        return cls(
+            account["accountNumber"],
+            account["accountName"],
+            account["status"],
+            account["balance"],
+            account.get("plan", "NP"),
+            account.get("transactionCount", 0),
+        )
+
+
+class Transaction(_Record):
+    """One parsed record from the merged transaction file (lineNumber is 1-based, 0 if unknown)."""
+
+    __slots__ = ("code", "accountName", "accountNumber", "money", "misc", "lineNumber")
+
+    def __init__(self, code: str, accountName: str, accountNumber: str,
+                 money: float, misc: str = "", lineNumber: int = 0):
+        self.code          = intern_field(code)
+        self.accountName   = accountName
+        self.accountNumber = intern_field(accountNumber)
+        self.money         = money
+        self.misc          = intern_field(misc)
+        self.lineNumber    = lineNumber
@@ -0,0 +1,167 @@
+"""
+backend/registry.py
+
+Transaction handler registry for the Banking System Back End.
+
+A HandlerRegistry maps two-digit transaction codes to handler functions. It
+is built once (AccountsList creates one when it is constructed) and then used
+by AccountsList.perform_transaction() to dispatch every record, counting how
+many records of each code were handled and how many were rejected.
+
+Registering an extra code:
+    A handler takes (transaction, accounts) and returns True if the
+    transaction was applied or False if it was rejected (None counts as
+    applied). Rejects are reported with rejects.report(), as the built-in
+    handlers in transactions.py do: it adds a row to accounts.rejects (which
+    prints the ERROR message only in verbose mode), or prints the message if
+    the accounts have no reject log.
+
+        def interest(transaction, accounts):
+            ...
+            return True
+
+        accounts = AccountsList()
+        accounts.registry.register("12", interest)
+
+    Built-in codes can only be replaced with replace=True.
+
+Reading the counters after a run:
+        for code, stats in accounts.registry.stats().items():
+            print(code, stats.invoked, stats.rejected)
+"""
+
+from typing import Callable, Dict, NamedTuple, Optional
+
+import rejects
+import transactions as tx
+from rejects import report
+
+# A transaction handler: (transaction, accounts) -> applied?
+Handler = Callable[..., Optional[bool]]
+
+
+def _no_action(transaction, accounts) -> bool:
+    """Handle a Front End-only record (login, logout); nothing to do in the Back End."""
+    return True
+
+
+# The built-in handlers, by transaction code.
+DEFAULT_HANDLERS: Dict[str, Handler] = {
+    "00": tx.end_of_session,
+    "01": tx.withdrawal,
+    "02": tx.transfer,
+    "03": tx.paybill,
+    "04": tx.deposit,
+    "05": tx.create,
+    "06": tx.delete,
+    "07": tx.disable,
+    "08": tx.changeplan,
+    "09": _no_action,   # login – Front End only
+    "10": _no_action,   # logout – Front End only
+}
+
+
+class HandlerStats(NamedTuple):
+    """Counters for one transaction code."""
+    invoked:  int
+    rejected: int
+
+
+class HandlerRegistry:
+    """Maps transaction codes to handlers and counts what each one did."""
+
+    def __init__(self, handlers: Optional[Dict[str, Handler]] = None):
+        """
+        Build a registry.
+
+        Args:
+            handlers: Initial code -> handler table. Defaults to the built-in
+                      handlers (DEFAULT_HANDLERS).
+        """
+        self._handlers: Dict[str, Handler] = dict(DEFAULT_HANDLERS if handlers is None else handlers)
+        self._invoked:  Dict[str, int] = {}
+        self._rejected: Dict[str, int] = {}
+
+    def register(self, code: str, handler: Handler, replace: bool = False):
+        """
+        Register the handler for a transaction code.
+
+        Args:
+            code:    Two-digit transaction code (shorter codes are zero-padded).
+            handler: Function taking (transaction, accounts).
+            replace: Allow replacing a handler that is already registered.
+
+        Raises:
+            ValueError: If the code is not a 1-2 digit number, or already has
+                        a handler and replace is False.
+        """
+        key = str(code).zfill(2)
+        if len(key) != 2 or not key.isdigit():
+            raise ValueError(f"Invalid transaction code: {code!r}")
+        if key in self._handlers and not replace:
+            raise ValueError(f"Transaction code {key} already has a handler")
+        self._handlers[key] = handler
+
+    def handler_for(self, code: str) -> Optional[Handler]:
+        """Return the handler registered for a code, or None."""
+        return self._handlers.get(str(code).zfill(2))
+
+    def is_default(self) -> bool:
+        """Return True if the registry holds exactly the built-in handlers."""
+        return self._handlers == DEFAULT_HANDLERS
+
+    def dispatch(self, transaction, accounts) -> bool:
+        """
+        Run the handler for a transaction record and update the counters.
+
+        An unregistered code is reported as an ERROR (see rejects.report)
+        and counts as rejected.
+
+        Args:
+            transaction: Transaction record (or dict) with keys: code,
+                         accountName, accountNumber, money, misc.
+            accounts:    AccountsList to apply it to.
+
+        Returns:
+            True if the transaction was applied, False if it was rejected.
+        """
+        code    = getattr(transaction, "code", None)  # Transaction records; dicts take the slow path
+        handler = self._handlers.get(code)
+        if handler is None:
+            code    = str(transaction.get("code", "")).zfill(2)
+            handler = self._handlers.get(code)
+        if handler is None:
+            report(accounts, transaction, rejects.UNKNOWN_CODE,
+                   f"ERROR: Unknown transaction code '{code}' - skipping.")
+            applied = False
+        else:
+            applied = handler(transaction, accounts) is not False
+        invoked = self._invoked
+        invoked[code] = invoked.get(code, 0) + 1
+        if not applied:
+            self._rejected[code] = self._rejected.get(code, 0) + 1
+        return applied
+
+    def count(self, code: str, applied: bool, invoked: int = 1):
+        """Add to the counters for a code (used by engines that split up a transaction)."""
+        self._invoked[code] = self._invoked.get(code, 0) + invoked
+        if not applied:
+            self._rejected[code] = self._rejected.get(code, 0) + invoked
+
+    def merge_counts(self, counts: Dict[str, HandlerStats]):
+        """Add counters read from another registry's stats() to this one's."""
+        for code, stats in counts.items():
+            self._invoked[code]  = self._invoked.get(code, 0) + stats.invoked
+            self._rejected[code] = self._rejected.get(code, 0) + stats.rejected
+
+    def stats(self) -> Dict[str, HandlerStats]:
+        """Return the counters for every code seen so far, in code order."""
+        return {
+            code: HandlerStats(self._invoked[code], self._rejected.get(code, 0))
+            for code in sorted(self._invoked)
+        }
+
+    def reset_counters(self):
+        """Set every counter back to zero."""
+        self._invoked.clear()
+        self._rejected.clear()
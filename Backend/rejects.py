@@ -0,0 +1,186 @@
+"""
+backend/rejects.py
+
+Structured reject log for the Banking System Back End.
+
+When an AccountsList has a RejectSink attached (accounts.rejects), every
+transaction a handler rejects is recorded as one row of a CSV file instead of
+being printed:
+
+    line,code,account,reason
+    17,01,00042,INSUFFICIENT_FUNDS
+
+Rows are buffered and written in blocks, and the sink counts rejects per
+reason so a summary can be printed at the end of the run. The ERROR messages
+the handlers used to print are still available by creating the sink with
+verbose=True. Without a sink, handlers print their ERROR messages as before.
+"""
+
+import csv
+import os
+from typing import Dict, List, NamedTuple, Optional, TextIO
+
+import stdio
+
+# Reason codes written to the rejects file.
+ACCOUNT_NOT_FOUND      = "ACCOUNT_NOT_FOUND"
+ACCOUNT_DISABLED       = "ACCOUNT_DISABLED"
+ACCOUNT_EXISTS         = "ACCOUNT_EXISTS"
+INSUFFICIENT_FUNDS     = "INSUFFICIENT_FUNDS"
+FEE_INSUFFICIENT_FUNDS = "FEE_INSUFFICIENT_FUNDS"
+NO_FROM_ACCOUNT        = "NO_ACTIVE_FROM_ACCOUNT"
+UNKNOWN_CODE           = "UNKNOWN_CODE"
+MALFORMED_RECORD       = "MALFORMED_RECORD"
+
+REJECTS_HEADER = ("line", "code", "account", "reason")
+
+
+class Reject(NamedTuple):
+    """One rejected transaction."""
+    line_number: int
+    code:        str
+    account:     str
+    reason:      str
+
+
+class RejectSink:
+    """Collects rejected transactions into a buffered CSV file and counts them by reason."""
+
+    def __init__(self, path: Optional[str] = None, verbose: bool = False, buffer_rows: int = 8192,
+                 resume: Optional[Dict] = None):
+        """
+        Open the rejects file.
+
+        Args:
+            path:        Where to write the CSV file ("-" for standard
+                         output). If None, rows are only kept in self.rows.
+            verbose:     Also print each reject's ERROR message.
+            buffer_rows: Number of rows collected before they are written out.
+            resume:      A checkpoint() of an earlier sink writing the same
+                         file: the file is cut back to the rows written by
+                         then and continued, and the counts carried on.
+                         If the file has gone, a new one is started.
+        """
+        self.path        = path
+        self.verbose     = verbose
+        self.buffer_rows = buffer_rows
+        self.rows: List[Reject] = []
+        self.counts: Dict[str, int] = {}
+        self._file: Optional[TextIO] = None
+        self._writer = None
+        if resume is not None:
+            self.counts = dict(resume["counts"])
+            if not os.path.exists(path):
+                print(f"Warning: rejects file {path} is missing; "
+                      f"the rejects before the checkpoint are only in the counts.")
+                resume = None
+        if resume is not None:
+            self._file   = open(path, "r+", newline="")
+            self._file.truncate(resume["offset"])
+            self._file.seek(resume["offset"])
+            self._writer = csv.writer(self._file)
+        elif path is not None:
+            self._file   = stdio.data_stream() if stdio.is_stdio(path) else open(path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(REJECTS_HEADER)
+
+    def reject(self, transaction, reason: str, message: str, account: Optional[str] = None):
+        """
+        Record a rejected transaction.
+
+        Args:
+            transaction: The rejected Transaction record (or dict).
+            reason:      One of the reason codes above.
+            message:     The ERROR message, printed in verbose mode.
+            account:     The account the reason refers to, if it is not the
+                         transaction's own account number.
+        """
+        if self.verbose:
+            print(message)
+        self.add(Reject(
+            transaction.get("lineNumber", 0),
+            transaction.get("code", ""),
+            transaction.get("accountNumber", "") if account is None else account,
+            reason,
+        ))
+
+    def add(self, row: Reject):
+        """Record a reject row, writing out the buffer when it is full."""
+        self.rows.append(row)
+        self.counts[row.reason] = self.counts.get(row.reason, 0) + 1
+        if self._writer is not None and len(self.rows) >= self.buffer_rows:
+            self.flush()
+
+    def take(self, start: int = 0) -> List[Reject]:
+        """
+        Remove the buffered rows after the first start ones and return them.
+
+        They are taken out of the counts too, so they can be add()ed again
+        later, e.g. once they can be put in file order.
+        """
+        rows = self.rows[start:]
+        del self.rows[start:]
+        for row in rows:
+            self.counts[row.reason] -= 1
+            if not self.counts[row.reason]:
+                del self.counts[row.reason]
+        return rows
+
+    def flush(self):
+        """Write the buffered rows to the rejects file."""
+        if self._writer is not None:
+            self._writer.writerows(self.rows)
+            self.rows = []
+
+    def checkpoint(self) -> Dict:
+        """
+        Write out every reject so far and return what is needed to resume from here.
+
+        Returns:
+            A JSON-ready dict with the rejects file's length and the counts
+            by reason (see the resume argument).
+        """
+        self.flush()
+        if self._file is None:
+            return {"offset": 0, "counts": dict(self.counts)}
+        self._file.flush()
+        return {"offset": self._file.tell(), "counts": dict(self.counts)}
+
+    def close(self):
+        """Write any buffered rows and close the rejects file."""
+        self.flush()
+        if self._file is not None:
+            if stdio.is_stdio(self.path):
+                self._file.flush()
+            else:
+                self._file.close()
+            self._file = self._writer = None
+
+    def total(self) -> int:
+        """Return the number of rejects recorded."""
+        return sum(self.counts.values())
+
+    def summary(self) -> List[str]:
+        """Return the per-reason summary lines, most frequent reason first."""
+        lines = [f"Rejected transactions: {self.total()}"]
+        for reason, count in sorted(self.counts.items(), key=lambda item: (-item[1], item[0])):
+            lines.append(f"  {reason:<24} {count}")
+        return lines
+
+
+def report(accounts, transaction, reason: str, message: str, account: Optional[str] = None):
+    """
+    Report a rejected transaction to accounts.rejects, or print its message if there is no sink.
+
+    Args:
+        accounts:    The AccountsList the transaction was applied to.
+        transaction: The rejected Transaction record (or dict).
+        reason:      One of the reason codes above.
+        message:     The ERROR message.
+        account:     The account the reason refers to, if not the transaction's own.
+    """
+    sink = getattr(accounts, "rejects", None)
+    if sink is None:
+        print(message)
+    else:
+        sink.reject(transaction, reason, message, account)
@@ -0,0 +1,335 @@
+"""
+backend/sharded.py
+
+Multi-process, account-sharded apply engine for the Banking System Back End.
+
+apply_sharded() splits the accounts into N shards by account-number range and
+applies each shard's transactions in its own worker process, producing the
+same balances and the same ERROR messages, in the same order, as applying the
+transactions one by one with AccountsList.perform_transaction().
+
+How the work is divided:
+  • A transaction on a single account (codes 01, 03-08) only reads and
+    changes that account, so it is sent whole to the shard that owns the
+    account number, which runs the normal handler on it.
+  • A transfer (02) touches two accounts, and its FROM account is chosen by
+    holder name among all active accounts. Existence, status and names change
+    only through create, delete and disable, never through money, so the
+    coordinator replays just those transactions on its own copy of the
+    accounts and picks both parties up front (transactions.transfer_parties).
+    The transfer is then split into a debit on the FROM shard
+    (transactions.transfer_debit) and a credit on the TO shard.
+  • The credit only happens if the debit succeeded, so the TO shard waits for
+    the FROM shard's outcome. Every shard works through its transactions in
+    file order and only ever waits for the outcome of an earlier transaction,
+    so the wait always ends.
+  • Everything a transaction prints is tagged with its position in the file,
+    and the coordinator prints the collected messages in that order once all
+    shards are done. So are its rejects, and what the parser reports about
+    malformed lines as the coordinator reads the transactions (placed just
+    before the next transaction, where a serial run would report it).
+  • If a worker fails or dies, the others are stopped and the run fails
+    instead of waiting for it.
+"""
+
+import multiprocessing
+import queue
+import sys
+import traceback
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import transactions as tx
+from lists import ACCOUNT_NUMBER_SPACE, AccountsList, account_slot
+from records import Account, Transaction
+from rejects import Reject, RejectSink
+
+# Kinds of work sent to a shard, as (seq, kind, ...) tuples:
+#   (seq, APPLY, transaction)                        run the normal handler
+#   (seq, DEBIT, transaction, from_slot, to_shard)   FROM side of a transfer
+#   (seq, CREDIT, to_slot, amount, from_shard)       TO side of a transfer
+APPLY, DEBIT, CREDIT = 0, 1, 2
+
+# Transaction codes that read or change only the account they name.
+_SINGLE_ACCOUNT_CODES = ("01", "03", "04", "05", "06", "07", "08")
+
+# Codes that also change account existence, status or names.
+_STRUCTURAL_CODES = ("05", "06", "07")
+
+# Transfer outcomes are sent to other shards in batches of this size (and
+# whenever the sender has to wait itself).
+_OUTCOME_BATCH = 256
+
+# Seconds between checks that the workers are still running, while waiting
+# for their results.
+_POLL_SECONDS = 1.0
+
+
+class _SequencedOutput:
+    """Stand-in for sys.stdout that tags everything written with the current transaction's position."""
+
+    def __init__(self):
+        self.seq: Optional[float] = None
+        self.parts: List[Tuple[float, str]] = []
+
+    def write(self, text: str) -> int:
+        if self.seq is not None:
+            self.parts.append((self.seq, text))
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def shard_bounds(accounts: List[Dict], shards: int) -> List[int]:
+    """
+    Split the account-number space into ranges holding similar numbers of accounts.
+
+    Args:
+        accounts: The accounts, in ascending account-number order.
+        shards:   Number of shards.
+
+    Returns:
+        shards - 1 ascending boundaries; shard k owns the account numbers n
+        with bounds[k - 1] <= n < bounds[k].
+    """
+    if not accounts:
+        return [ACCOUNT_NUMBER_SPACE * k // shards for k in range(1, shards)]
+    return [account_slot(accounts[len(accounts) * k // shards]["accountNumber"])
+            for k in range(1, shards)]
+
+
+def apply_sharded(accounts: AccountsList, transactions: Iterable[Transaction], shards: int):
+    """
+    Apply transactions to accounts using one worker process per shard.
+
+    The result is the same as calling accounts.perform_transaction() on each
+    transaction in turn: the records in accounts are replaced by the updated
+    records from the shards, and the ERROR messages are printed in order.
+    The handler counters from every shard are added to accounts.registry, and
+    if accounts.rejects is set the shards' rejects are added to it in order.
+
+    Only the built-in handlers are supported: a registry with extra or
+    replaced codes would need to say which accounts each code touches.
+
+    Args:
+        accounts:     The loaded accounts.
+        transactions: The parsed Transaction records, in file order.
+        shards:       Number of worker processes.
+
+    Raises:
+        ValueError:   If accounts.registry has non-default handlers.
+        RuntimeError: If a worker process fails.
+    """
+    if not accounts.registry.is_default():
+        raise ValueError("The sharded engine only supports the built-in transaction handlers")
+    registry = accounts.registry
+    current = [acc if isinstance(acc, Account) else Account.from_dict(acc)
+               for acc in accounts.current_accounts]
+    bounds  = shard_bounds(current, shards)
+
+    # The coordinator's copy only needs to track existence, status and names.
+    skeleton = AccountsList()
+    skeleton.current_accounts = [Account.from_dict(acc) for acc in current]
+
+    # Rejects are collected per transaction position and replayed into the
+    # caller's reject log in file order at the end.
+    sink    = accounts.rejects
+    verbose = None if sink is None else sink.verbose
+    tagged: List[Tuple[float, Reject]] = []
+    if sink is not None:
+        skeleton.rejects = RejectSink(verbose=verbose)
+        # The parser adds malformed-line rejects to the caller's sink while the
+        # transactions are read below; they are taken back out and tagged.
+        sink.flush()
+        buffer_rows, sink.buffer_rows = sink.buffer_rows, sys.maxsize
+
+    parts: List[List] = [[] for _ in range(shards)]
+    for acc in current:
+        parts[bisect_right(bounds, account_slot(acc["accountNumber"]))].append(acc)
+
+    ops: List[List[tuple]] = [[] for _ in range(shards)]
+    out = _SequencedOutput()
+    stdout, sys.stdout = sys.stdout, out
+    try:
+        for seq, transaction in _read_tagged(transactions, out, sink, tagged):
+            code = transaction.code
+            if code in _SINGLE_ACCOUNT_CODES:
+                ops[bisect_right(bounds, int(transaction.accountNumber))].append((seq, APPLY, transaction))
+                if code in _STRUCTURAL_CODES:
+                    out.seq = None  # the owning shard reports the outcome
+                    skeleton.perform_transaction(transaction)
+                    if sink is not None:
+                        skeleton.rejects.rows = []
+            elif code == "02":
+                out.seq = seq
+                parties = tx.transfer_parties(transaction, skeleton)
+                if parties is None:
+                    registry.count(code, False)
+                    _take_rejects(skeleton.rejects, seq, tagged)
+                    continue
+                to_slot   = account_slot(parties[0]["accountNumber"])
+                from_slot = account_slot(parties[1]["accountNumber"])
+                to_shard, from_shard = bisect_right(bounds, to_slot), bisect_right(bounds, from_slot)
+                ops[from_shard].append((seq, DEBIT, transaction, from_slot, to_shard))
+                ops[to_shard].append((seq, CREDIT, to_slot, transaction["money"], from_shard))
+            else:
+                out.seq = seq
+                registry.dispatch(transaction, skeleton)
+                _take_rejects(skeleton.rejects, seq, tagged)
+    finally:
+        sys.stdout = stdout
+        if sink is not None:
+            sink.buffer_rows = buffer_rows
+
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(shards)]
+    results = context.Queue()
+    workers = [
+        context.Process(target=_run_shard, args=(k, parts[k], ops[k], verbose, inboxes, results))
+        for k in range(shards)
+    ]
+    ops = parts = None
+
+    updated: List[Account] = []
+    messages = out.parts
+    for shard, shard_accounts, shard_messages, shard_counts, shard_rejects in _collect(workers, results):
+        updated.extend(shard_accounts)
+        messages.extend(shard_messages)
+        registry.merge_counts(shard_counts)
+        tagged.extend(shard_rejects)
+
+    messages.sort(key=lambda part: part[0])
+    sys.stdout.write("".join(text for _, text in messages))
+    if sink is not None:
+        tagged.sort(key=lambda part: part[0])
+        for _, row in tagged:
+            sink.add(row)
+    accounts.current_accounts = updated
+    accounts.master_accounts  = accounts.current_accounts
+
+
+def _read_tagged(transactions: Iterable[Transaction], out: _SequencedOutput, sink: Optional[RejectSink],
+                 tagged: List[Tuple[float, Reject]]) -> Iterator[Tuple[int, Transaction]]:
+    """
+    Yield (seq, transaction) in file order, tagging what the parser reports.
+
+    Transactions are parsed lazily as they are read, so messages and rejects
+    for malformed lines appear while the next one is fetched; they are given
+    the position seq - 0.5, just before the transaction that follows them.
+    """
+    transactions = iter(transactions)
+    start = len(sink.rows) if sink is not None else 0
+    seq = 0
+    while True:
+        out.seq = seq - 0.5
+        transaction = next(transactions, None)
+        if sink is not None:
+            tagged.extend((seq - 0.5, row) for row in sink.take(start))
+        if transaction is None:
+            return
+        yield seq, transaction
+        seq += 1
+
+
+def _collect(workers: List, results) -> Iterator[tuple]:
+    """
+    Start the workers and yield each one's result as it arrives.
+
+    Raises:
+        RuntimeError: If a worker fails or exits without sending its result;
+                      the other workers are stopped first.
+    """
+    for worker in workers:
+        worker.start()
+    pending = set(range(len(workers)))
+    exited: set = set()
+    failure = None
+    while pending and failure is None:
+        try:
+            result = results.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            # A worker that exited cleanly has sent its result; allow one more
+            # wait for it to arrive before treating it as lost.
+            for shard in sorted(pending):
+                code = workers[shard].exitcode
+                if code is not None and (code != 0 or shard in exited):
+                    failure = f"Shard {shard} exited with code {code} without sending its result"
+                    break
+                if code is not None:
+                    exited.add(shard)
+            continue
+        if result[1] is None:
+            failure = f"Shard {result[0]} failed:\n{result[2]}"
+            break
+        pending.discard(result[0])
+        yield result
+    for worker in workers:
+        if failure is not None and worker.is_alive():
+            worker.terminate()
+        worker.join()
+    if failure is not None:
+        raise RuntimeError(failure)
+
+
+def _take_rejects(sink: Optional[RejectSink], seq: int, tagged: List[Tuple[int, Reject]]):
+    """Move the rows a sink collected for transaction seq into tagged."""
+    if sink is not None and sink.rows:
+        tagged.extend((seq, row) for row in sink.rows)
+        sink.rows = []
+
+
+def _run_shard(shard: int, accounts: List[Account], ops: List[tuple], verbose: Optional[bool],
+               inboxes, results):
+    """
+    Worker process: apply one shard's work in order.
+
+    Sends back the shard's accounts, messages, handler counters and (if
+    verbose is not None, i.e. the caller has a reject log) rejects.
+    """
+    try:
+        out = _SequencedOutput()
+        sys.stdout = out
+        book = AccountsList()
+        book.current_accounts = accounts
+        if verbose is not None:
+            book.rejects = RejectSink(verbose=verbose)
+        tagged: List[Tuple[int, Reject]] = []
+        outcomes: Dict[int, bool] = {}
+        outbox: Dict[int, List[Tuple[int, bool]]] = {}
+
+        def send():
+            for target, batch in outbox.items():
+                if batch:
+                    inboxes[target].put(batch)
+            outbox.clear()
+
+        for op in ops:
+            seq, kind = op[0], op[1]
+            out.seq = seq
+            if kind == APPLY:
+                book.perform_transaction(op[2])
+            elif kind == DEBIT:
+                _, _, transaction, from_slot, to_shard = op
+                applied = tx.transfer_debit(transaction, book.get_account_by_id(from_slot), book)
+                book.registry.count(transaction.code, applied)
+                if to_shard == shard:
+                    outcomes[seq] = applied
+                else:
+                    batch = outbox.setdefault(to_shard, [])
+                    batch.append((seq, applied))
+                    if len(batch) >= _OUTCOME_BATCH:
+                        inboxes[to_shard].put(batch)
+                        outbox[to_shard] = []
+            else:
+                _, _, to_slot, amount, _ = op
+                while seq not in outcomes:
+                    send()
+                    outcomes.update(inboxes[shard].get())
+                if outcomes.pop(seq):
+                    book.get_account_by_id(to_slot)["balance"] += amount
+            _take_rejects(book.rejects, seq, tagged)
+        send()
+        results.put((shard, book.current_accounts, out.parts, book.registry.stats(), tagged))
+    except BaseException:
+        results.put((shard, None, traceback.format_exc(), None, None))
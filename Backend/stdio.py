@@ -0,0 +1,97 @@
+"""
+backend/stdio.py
+
+Standard input and output as file-path arguments ("-").
+
+Wherever the Back End tools take a file path, "-" stands for standard input
+(for a file that is read) or standard output (for a file that is written), so
+the nightly steps can be chained without an intermediate file:
+
+    python merge_transactions.py ../terminals - | python main.py - ...
+
+While a tool writes data to standard output, everything it prints for the
+operator (progress, warnings, ERROR messages) goes to standard error instead,
+so it cannot corrupt the data stream (see messages_to_stderr).
+"""
+
+import sys
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, TextIO
+
+# The file-path argument that means standard input or output.
+STDIO_PATH = "-"
+
+# The real standard output while messages_to_stderr() is active.
+_data_stream: Optional[TextIO] = None
+
+
+def is_stdio(path: Optional[str]) -> bool:
+    """Return True if a file-path argument means standard input or output."""
+    return path == STDIO_PATH
+
+
+def data_stream() -> TextIO:
+    """Return the stream that data written to "-" goes to."""
+    return _data_stream or sys.stdout
+
+
+@contextmanager
+def messages_to_stderr(enabled: bool = True) -> Iterator[None]:
+    """
+    Send everything printed inside the with-block to standard error.
+
+    Data written to "-" through open_output() still goes to standard output.
+
+    Args:
+        enabled: If False, nothing is redirected (for callers that only
+                 sometimes write data to standard output).
+    """
+    global _data_stream
+    if not enabled or _data_stream is not None:
+        yield
+        return
+    _data_stream, sys.stdout = sys.stdout, sys.stderr
+    try:
+        yield
+    finally:
+        sys.stdout, _data_stream = _data_stream, None
+
+
+@contextmanager
+def open_input(path: str) -> Iterator[BinaryIO]:
+    """
+    Open a file for reading in binary mode, or standard input for "-".
+
+    Standard input is not closed when the with-block ends.
+    """
+    if is_stdio(path):
+        yield sys.stdin.buffer
+        return
+    with open(path, "rb") as f:
+        yield f
+
+
+@contextmanager
+def open_output(path: str, mode: str = "w", newline: Optional[str] = None) -> Iterator:
+    """
+    Open a file for writing, or standard output for "-".
+
+    Standard output is flushed, not closed, when the with-block ends.
+
+    Args:
+        path:    The file path, or "-".
+        mode:    "w" for text or "wb" for binary.
+        newline: As for open(), in text mode.
+    """
+    if not is_stdio(path):
+        with open(path, mode, newline=newline) as f:
+            yield f
+        return
+    stream = data_stream()
+    stream.flush()
+    if "b" in mode:
+        stream = stream.buffer
+    try:
+        yield stream
+    finally:
+        stream.flush()
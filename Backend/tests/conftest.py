@@ -14,13 +14,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from lists import AccountsList
 
-# Sample accounts used across all test modules
+# Sample accounts used across all test modules (balances in integer cents)
 SAMPLE_ACCOUNTS = [
-    {"accountNumber": '00001', "accountName": "John Doe",       "status": "A", "balance": 1000.00, "plan": "NP"},
-    {"accountNumber": '00002', "accountName": "Jane Smith",     "status": "A", "balance": 2500.00, "plan": "NP"},
-    {"accountNumber": '00003', "accountName": "Bob Johnson",    "status": "A", "balance":  750.00, "plan": "NP"},
-    {"accountNumber": '00004', "accountName": "Alice Williams", "status": "D", "balance":  100.00, "plan": "NP"},
-    {"accountNumber": '00005', "accountName": "Charlie Brown",  "status": "A", "balance": 5000.00, "plan": "SP"},
+    {"accountNumber": '00001', "accountName": "John Doe",       "status": "A", "balance": 100000, "plan": "NP"},
+    {"accountNumber": '00002', "accountName": "Jane Smith",     "status": "A", "balance": 250000, "plan": "NP"},
+    {"accountNumber": '00003', "accountName": "Bob Johnson",    "status": "A", "balance":  75000, "plan": "NP"},
+    {"accountNumber": '00004', "accountName": "Alice Williams", "status": "D", "balance":  10000, "plan": "NP"},
+    {"accountNumber": '00005', "accountName": "Charlie Brown",  "status": "A", "balance": 500000, "plan": "SP"},
 ]
 
 @pytest.fixture
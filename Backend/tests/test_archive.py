@@ -0,0 +1,61 @@
+import os
+
+import archive
+import binary_transactions as binary
+from lists import TransactionsList
+
+RECORDS = [b"04 John Doe             %05d 00000100 00\n" % n for n in range(1, 11)]
+END_OF_SESSION = b"00 END_OF_SESSION       00000 00000000 00\n"
+END_OF_FILE = b"00 END_OF_FILE          00000 00000000 00\n"
+
+def make_sessions(tmp_path):
+    source = tmp_path / "terminal1"
+    source.mkdir()
+    (source / "03-12-2026 10-00-00.txt").write_bytes(b"".join(RECORDS[:6]) + END_OF_SESSION)
+    (source / "03-13-2026 09-00-00.txt").write_bytes(b"".join(RECORDS[6:]) + END_OF_SESSION)
+    (tmp_path / "session.txt").write_bytes(b"".join(RECORDS[6:]) + END_OF_SESSION)
+    binary.to_binary(str(tmp_path / "session.txt"), str(source / "03-13-2026 11-00-00.btx"))
+    return source
+
+def test_AR1_sessions_bundled_per_day_and_read_back(tmp_path):
+    source = make_sessions(tmp_path)
+    contents = {name: (source / name).read_bytes() for name in os.listdir(source)}
+    assert archive.archive_sessions([str(source)], str(tmp_path / "archive"), remove=True) == 3
+    assert os.listdir(source) == []
+    day1, day2 = str(tmp_path / "archive" / "2026-03-12.gz"), str(tmp_path / "archive" / "2026-03-13.gz")
+    assert [m["name"] for m in archive.load_index(day2)["members"]] == [
+        "terminal1/03-13-2026 09-00-00.txt", "terminal1/03-13-2026 11-00-00.btx"]
+    for name, data in contents.items():
+        bundle = day1 if name.startswith("03-12") else day2
+        assert archive.read_member(bundle, "terminal1/" + name) == data
+
+def test_AR2_record_ranges_read_only_their_blocks(tmp_path):
+    bundle = str(tmp_path / "day.xz")
+    index = archive.load_index(bundle)
+    index["compression"] = "lzma"
+    data = b"".join(RECORDS) + END_OF_FILE
+    archive.add_member(bundle, index, "merged.txt", "merged", data, block_records=3)
+    archive.save_index(bundle, index)
+    assert len(index["members"][0]["blocks"]) == 4
+    assert list(archive.read_records(bundle, None, 4, 8)) == RECORDS[4:8]
+    assert list(archive.read_records(bundle, "merged.txt", 9)) == [RECORDS[9], END_OF_FILE]
+    packed = binary.file_header() + b"".join(binary.encode_line(r) for r in RECORDS)
+    archive.add_member(bundle, index, "merged.btx", "merged", packed, block_records=4)
+    archive.save_index(bundle, index)
+    assert list(archive.read_records(bundle, "merged.btx", 3, 5)) == [binary.encode_line(r) for r in RECORDS[3:5]]
+    assert archive.read_member(bundle, "merged.btx") == packed
+
+def test_AR3_transactions_stream_from_archive(tmp_path):
+    merged = tmp_path / "merged.txt"
+    merged.write_bytes(b"".join(RECORDS) + END_OF_FILE)
+    archive.archive_sessions([], str(tmp_path / "archive"), merged_file=str(merged))
+    [bundle] = [str(path) for path in (tmp_path / "archive").glob("*.gz")]
+    fields = ("code", "accountName", "accountNumber", "money", "misc", "lineNumber")
+    direct = TransactionsList(str(merged))
+    direct.read_merged_transaction_file()
+    for path in (bundle, bundle + "::merged.txt"):
+        records = TransactionsList(path, streaming=True, batch_bytes=100)
+        records.read_merged_transaction_file()
+        assert [[t[f] for f in fields] for t in records.get_iterator()] == \
+               [[t[f] for f in fields] for t in direct.transactions]
+        assert records.complete
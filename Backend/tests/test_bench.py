@@ -0,0 +1,18 @@
+import filecmp
+from bench.generate import generate_master, generate_merged
+from bench.run import PHASES, run_benchmark
+
+def test_B1_generation_is_reproducible_from_seed(tmp_path):
+    for run in ("a", "b"):
+        accounts = generate_master(str(tmp_path / f"master_{run}.txt"), 200, seed=7)
+        generate_merged(str(tmp_path / f"merged_{run}.txt"), accounts, 500, seed=7)
+    assert filecmp.cmp(tmp_path / "master_a.txt", tmp_path / "master_b.txt", shallow=False)
+    assert filecmp.cmp(tmp_path / "merged_a.txt", tmp_path / "merged_b.txt", shallow=False)
+    lines = (tmp_path / "merged_a.txt").read_text().splitlines()
+    assert len(lines) == 501 and lines[-1].startswith("00 END_OF_FILE")
+
+def test_B2_run_reports_every_phase(tmp_path):
+    report = run_benchmark(accounts=100, transactions=300, seed=1, repeat=1, workdir=str(tmp_path))
+    assert list(report["phases"]) == list(PHASES)
+    assert report["phases"]["apply"]["records"] == 301
+    assert report["config"]["seed"] == 1
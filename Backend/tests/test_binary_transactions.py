@@ -0,0 +1,36 @@
+import binary_transactions as binary
+from lists import TransactionsList
+from merge_transactions import merge
+
+TEXT = (b"04 John Doe             00001 00000100 00\n"
+        b"02 Jane Smith           00002 00050.25 00\r\n"
+        b"08 Bob Johnson          00003 00000.00\n"
+        b"00 END_OF_FILE          00000 00000000 00")
+
+def test_BT1_text_round_trips_exactly(tmp_path):
+    (tmp_path / "in.txt").write_bytes(TEXT)
+    binary.to_binary(str(tmp_path / "in.txt"), str(tmp_path / "out.btx"))
+    binary.to_text(str(tmp_path / "out.btx"), str(tmp_path / "back.txt"))
+    assert (tmp_path / "back.txt").read_bytes() == TEXT
+    assert (tmp_path / "out.btx").stat().st_size == binary.HEADER.size + 4 * binary.RECORD.size
+
+def test_BT2_reader_parses_binary_like_text(tmp_path):
+    (tmp_path / "in.txt").write_bytes(TEXT)
+    binary.to_binary(str(tmp_path / "in.txt"), str(tmp_path / "in.btx"))
+    text, packed = TransactionsList(str(tmp_path / "in.txt")), TransactionsList(str(tmp_path / "in.btx"), batch_bytes=40)
+    for records in (text, packed):
+        records.read_merged_transaction_file()
+    fields = ("code", "accountName", "accountNumber", "money", "misc", "lineNumber")
+    assert [[t[f] for f in fields] for t in packed.transactions] == [[t[f] for f in fields] for t in text.transactions]
+    assert packed.complete and packed.transactions[1].money == 5025
+
+def test_BT3_merge_writes_binary_from_mixed_sessions(tmp_path):
+    end = b"00 END_OF_SESSION       00000 00000000 00\n"
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "03-12-2026 10-00-00.txt").write_bytes(TEXT.splitlines(True)[0] + end)
+    (tmp_path / "session.txt").write_bytes(TEXT.splitlines(True)[1] + end)
+    binary.to_binary(str(tmp_path / "session.txt"), str(tmp_path / "in" / "03-12-2026 11-00-00.btx"))
+    assert merge(str(tmp_path / "in"), str(tmp_path / "merged.btx"), validate=True, workers=1, binary_output=True)
+    binary.to_text(str(tmp_path / "merged.btx"), str(tmp_path / "merged.txt"))
+    assert (tmp_path / "merged.txt").read_bytes() == (
+        TEXT.splitlines(True)[0] + TEXT.splitlines(True)[1].replace(b"\r", b"") + b"00 END_OF_FILE          00000 00000000 00\n")
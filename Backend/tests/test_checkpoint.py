@@ -0,0 +1,59 @@
+import pytest
+
+import checkpoint
+import main
+from lists import AccountsList
+
+MASTER = (
+    "00001 John Doe             A 01000.00 NP 0000\n"
+    "00002 Jane Smith           A 03000.00 NP 0003\n"
+)
+DEPOSIT  = b"04 John Doe             00001 00000100 00\n"
+WITHDRAW = b"01 Jane Smith           00002 00500.00 00\n"
+END      = b"00 END_OF_FILE          00000 00000000 00\n"
+
+def run(tmp_path, options):
+    return main.run(str(tmp_path / "merged.txt"), str(tmp_path / "current.txt"),
+                    str(tmp_path / "master.txt"), dict(options, rejects=str(tmp_path / "rejects.csv")))
+
+def outputs(tmp_path):
+    return [(tmp_path / name).read_bytes() for name in ("master.txt", "current.txt", "rejects.csv")]
+
+def test_CP1_resume_after_crash_matches_uninterrupted_run(tmp_path, monkeypatch):
+    (tmp_path / "merged.txt").write_bytes((DEPOSIT * 3 + WITHDRAW) * 10 + END)
+    (tmp_path / "master.txt").write_text(MASTER)
+    assert run(tmp_path, {"checkpoint": "8"})
+    expected = outputs(tmp_path)
+    assert not (tmp_path / "master.txt.checkpoint").exists()
+
+    (tmp_path / "master.txt").write_text(MASTER)
+    perform = AccountsList.perform_transaction
+    def crash(self, transaction):
+        if transaction.lineNumber == 30:
+            raise KeyboardInterrupt
+        return perform(self, transaction)
+    monkeypatch.setattr(AccountsList, "perform_transaction", crash)
+    with pytest.raises(KeyboardInterrupt):
+        run(tmp_path, {"checkpoint": "8"})
+    state = checkpoint.load(str(tmp_path / "master.txt.checkpoint"), str(tmp_path / "merged.txt"))
+    assert 30 - 2 * 8 < state["records"] < 30 and state["line_number"] == state["records"]
+    monkeypatch.setattr(AccountsList, "perform_transaction", perform)
+    assert run(tmp_path, {"resume": ""})
+    assert outputs(tmp_path) == expected
+
+def test_CP2_damaged_or_foreign_checkpoints_are_skipped(tmp_path, capsys):
+    (tmp_path / "merged.txt").write_bytes(DEPOSIT + END)
+    path = str(tmp_path / "master.txt.checkpoint")
+    for records in (1, 2):
+        checkpoint.save(path, {"transactions": checkpoint.input_identity(str(tmp_path / "merged.txt")),
+                               "records": records})
+    assert checkpoint.load(path, str(tmp_path / "merged.txt"))["records"] == 2
+    with open(path, "r+b") as f:
+        f.seek(-1, 2)
+        f.write(b"\x00")
+    assert checkpoint.load(path, str(tmp_path / "merged.txt"))["records"] == 1
+    assert "damaged" in capsys.readouterr().out
+    (tmp_path / "merged.txt").write_bytes(DEPOSIT * 2 + END)
+    assert checkpoint.load(path, str(tmp_path / "merged.txt")) is None
+    checkpoint.remove(path)
+    assert list(tmp_path.glob("*.checkpoint*")) == []
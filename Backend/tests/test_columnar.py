@@ -0,0 +1,72 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import checkpoint
+import journal
+from columnar import ColumnarAccountsList
+from records import Account
+from transactions import withdrawal, transfer, create, delete, disable
+from conftest import SAMPLE_ACCOUNTS
+
+MASTER_LINES = (
+    "00001 John Doe             A 01000.00 NP 0000\n"
+    "00002 Jane Smith           A 03000.00 NP 0003\n"
+    "00004 Alice Williams       D 00100.00 SP 0000\n"
+)
+
+@pytest.fixture
+def columnar_list():
+    accounts = ColumnarAccountsList()
+    accounts.current_accounts = [dict(acc) for acc in SAMPLE_ACCOUNTS]
+    return accounts
+
+def test_C1_handlers_run_through_row_views(columnar_list):
+    transaction = {'code': '01', 'accountName': 'John Doe', 'accountNumber': '00001', 'money': 20000, 'misc': ''}
+    assert withdrawal(transaction, columnar_list) is True
+    assert columnar_list.current_accounts[0]["balance"] == 79990
+    assert columnar_list.balance[1] == 79990
+
+def test_C2_transfer_create_delete_disable(columnar_list):
+    assert transfer({'code': '02', 'accountName': 'Jane Smith', 'accountNumber': '00003', 'money': 5000, 'misc': ''}, columnar_list) is True
+    assert columnar_list.get_account_by_id('00002')["balance"] == 244990
+    assert create({'code': '05', 'accountName': 'Albert Eine', 'accountNumber': '00010', 'money': 30020, 'misc': ''}, columnar_list) is True
+    assert [a["accountNumber"] for a in columnar_list.current_accounts][-1] == '00010'
+    assert disable({'code': '07', 'accountName': 'Jane Smith', 'accountNumber': '00002', 'money': 0, 'misc': ''}, columnar_list) is True
+    assert columnar_list.get_active_account_by_name("Jane Smith") is None
+    assert delete({'code': '06', 'accountName': 'Albert Eine', 'accountNumber': '00010', 'money': 0, 'misc': ''}, columnar_list) is True
+    assert columnar_list.get_account_by_id('00010') is None
+
+def test_C3_fixed_width_load_and_write_round_trip(tmp_path):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(MASTER_LINES)
+    accounts = ColumnarAccountsList(master_file=str(master))
+    accounts.read_old_master_accounts()
+    assert accounts.get_account_by_id('00002')["transactionCount"] == 3
+    assert accounts.total_balance() == 410000
+    out = tmp_path / "out.txt"
+    accounts.write_new_master_accounts(str(out))
+    assert out.read_text() == MASTER_LINES
+
+def test_C4_bulk_fee_totals_and_validation(columnar_list):
+    withdrawal({'code': '01', 'accountName': 'Charlie Brown', 'accountNumber': '00005', 'money': 1000, 'misc': ''}, columnar_list)
+    withdrawal({'code': '01', 'accountName': 'John Doe', 'accountNumber': '00001', 'money': 1000, 'misc': ''}, columnar_list)
+    assert columnar_list.fee_totals() == {"SP": 5, "NP": 10}
+    columnar_list.balance[3] = -1
+    assert columnar_list.validate()["negative_balance"] == ['00003']
+
+def test_C5_fee_totals_kept_after_replace_and_restore(tmp_path, capsys):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(MASTER_LINES)
+    (tmp_path / ("master_accounts.txt" + journal.JOURNAL_SUFFIX)).write_text("")  # unfinished patch
+    accounts = ColumnarAccountsList(master_file=str(master))
+    accounts.read_old_master_accounts()
+    assert "rolled back" in capsys.readouterr().out
+    withdrawal({'code': '01', 'accountName': 'John Doe', 'accountNumber': '00001', 'money': 1000, 'misc': ''}, accounts)
+    rows, baseline = checkpoint.account_rows(accounts), checkpoint.account_baseline(accounts)
+    accounts.current_accounts = [Account(*row) for row in rows]   # as after a sharded apply
+    assert accounts.fee_totals() == {"SP": 0, "NP": 10}
+    restored = ColumnarAccountsList()
+    checkpoint.restore_accounts(restored, rows, baseline)
+    withdrawal({'code': '01', 'accountName': 'Jane Smith', 'accountNumber': '00002', 'money': 1000, 'misc': ''}, restored)
+    assert restored.fee_totals() == {"SP": 0, "NP": 20}
@@ -0,0 +1,37 @@
+import journal
+import pytest
+
+RECORDS = b"00001 A\n00002 B\n"
+
+def _write_journal(path, entries, committed):
+    lines = [f"PATCH {len(RECORDS)}"] + [f"{o} {old.hex()} {new.hex()}" for o, old, new in entries]
+    if committed:
+        lines.append("COMMIT")
+    (path.parent / (path.name + ".journal")).write_text("\n".join(lines) + "\n")
+
+def test_J1_apply_patches_edits_in_place(tmp_path):
+    path = tmp_path / "accounts.txt"
+    path.write_bytes(RECORDS)
+    journal.apply_patches(str(path), [(8, b"00002 B", b"00002 C")])
+    assert path.read_bytes() == b"00001 A\n00002 C\n"
+    assert not (tmp_path / "accounts.txt.journal").exists()
+
+def test_J2_recover_completes_committed_and_rolls_back_uncommitted(tmp_path):
+    path = tmp_path / "accounts.txt"
+    path.write_bytes(RECORDS)
+    _write_journal(path, [(0, b"00001 A", b"00001 Z")], committed=False)
+    assert journal.recover(str(path)) == "rolled back"
+    assert path.read_bytes() == RECORDS
+    _write_journal(path, [(0, b"00001 A", b"00001 Z"), (8, b"00002 B", b"00002 Y")], committed=True)
+    path.write_bytes(b"00001 Z\n00002 B\n")  # stopped after the first edit
+    assert journal.recover(str(path)) == "completed"
+    assert path.read_bytes() == b"00001 Z\n00002 Y\n"
+    assert journal.recover(str(path)) is None
+
+def test_J3_recover_refuses_a_file_changed_since(tmp_path):
+    path = tmp_path / "accounts.txt"
+    path.write_bytes(b"00009 X\n00002 B\n")
+    _write_journal(path, [(0, b"00001 A", b"00001 Z")], committed=True)
+    with pytest.raises(ValueError):
+        journal.recover(str(path))
+    assert (tmp_path / "accounts.txt.journal").exists()
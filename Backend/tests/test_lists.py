@@ -0,0 +1,198 @@
+from transactions import create, delete
+from lists import AccountsList, TransactionsList
+from records import Transaction
+
+MASTER_LINES = (
+    "00001 John Doe             A 01000.00 NP 0000\n"
+    "00003 Bob Johnson          A 00750.00 NP 0002\n"
+)
+
+def test_L1_lookup_by_padded_and_unpadded_number(accounts_list):
+    assert accounts_list.get_account_by_id('00003')["accountName"] == "Bob Johnson"
+    assert accounts_list.get_account_by_id('3')["accountName"] == "Bob Johnson"
+    assert accounts_list.get_account_by_id(3)["accountName"] == "Bob Johnson"
+
+def test_L2_lookup_invalid_number(accounts_list):
+    assert accounts_list.get_account_by_id('99999') is None
+    assert accounts_list.get_account_by_id('123456') is None
+    assert accounts_list.get_account_by_id('abcde') is None
+
+def test_L3_index_follows_create_and_delete(accounts_list):
+    transaction = {'code': '05', 'accountName': 'Albert Eine', 'accountNumber': '00010', 'money': 30020, 'misc': '00'}
+    assert create(transaction, accounts_list) is True
+    assert accounts_list.get_account_by_id('00010')["accountName"] == "Albert Eine"
+    assert delete(transaction, accounts_list) is True
+    assert accounts_list.get_account_by_id('00010') is None
+    assert all(a["accountNumber"] != '00010' for a in accounts_list.current_accounts)
+
+def test_L4_index_rebuilt_on_master_read(accounts_list, tmp_path):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(MASTER_LINES)
+    accounts_list.read_old_master_accounts(str(master))
+    assert accounts_list.get_account_by_id('00002') is None
+    assert accounts_list.get_account_by_id('00003')["transactionCount"] == 2
+
+def test_L5_name_index_first_active_in_order(accounts_list):
+    accounts_list.add_account({"accountNumber": '00000', "accountName": "Jane Smith", "status": "D", "balance": 1000, "plan": "NP"})
+    accounts_list.add_account({"accountNumber": '00009', "accountName": "Jane Smith", "status": "A", "balance": 1000, "plan": "NP"})
+    assert accounts_list.get_active_account_by_name("Jane Smith")["accountNumber"] == '00002'
+    accounts_list.disable_account(accounts_list.get_account_by_id('00002'))
+    assert accounts_list.get_active_account_by_name(" Jane Smith ")["accountNumber"] == '00009'
+    accounts_list.remove_account(accounts_list.get_account_by_id('00009'))
+    assert accounts_list.get_active_account_by_name("Jane Smith") is None
+
+def test_L6_name_index_skips_disabled_accounts(accounts_list):
+    assert accounts_list.get_active_account_by_name("Alice Williams") is None
+
+def test_L7_create_keeps_ascending_order_without_resort(accounts_list):
+    for number in ('00009', '00000', '00006'):
+        transaction = {'code': '05', 'accountName': 'New Holder', 'accountNumber': number, 'money': 1000, 'misc': '00'}
+        assert create(transaction, accounts_list) is True
+    numbers = [a["accountNumber"] for a in accounts_list.current_accounts]
+    assert numbers == ['00000', '00001', '00002', '00003', '00004', '00005', '00006', '00009']
+
+def test_L8_writers_emit_ascending_order(accounts_list, tmp_path):
+    accounts_list.add_account({"accountNumber": '00000', "accountName": "Zero", "status": "A", "balance": 100, "plan": "SP", "transactionCount": 0})
+    for acc in accounts_list.current_accounts:
+        acc.setdefault("transactionCount", 0)
+    current = tmp_path / "current.txt"
+    accounts_list.write_new_current_accounts(str(current))
+    lines = current.read_text().splitlines()
+    assert [line[:5] for line in lines] == ['00000', '00001', '00002', '00003', '00004', '00005', '00000']
+    assert lines[-1] == "00000 END_OF_FILE          A 00000.00"
+
+def test_L9_master_and_current_share_account_records(tmp_path):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(MASTER_LINES)
+    accounts = AccountsList()
+    accounts.read_old_master_accounts(str(master))
+    assert all(type(acc).__name__ == "Account" for acc in accounts.master_accounts)
+    assert accounts.current_accounts[0] is accounts.master_accounts[0]
+    assert accounts.master_accounts[1]["plan"] is accounts.master_accounts[0]["plan"]
+
+MERGED_LINES = (
+    "04 John Doe             00001 01000.00 00\n"
+    "03 John Doe             00001 00100.00 EC\n"
+    "00 END_OF_FILE          00000 00000000 00\n"
+)
+
+def test_L10_streaming_matches_list_mode(tmp_path):
+    merged = tmp_path / "merged.txt"
+    merged.write_text(MERGED_LINES)
+    listed = TransactionsList(str(merged))
+    listed.read_merged_transaction_file()
+    streamed = TransactionsList(str(merged), streaming=True)
+    streamed.read_merged_transaction_file()
+    assert streamed.transactions == []
+    assert list(streamed.get_iterator()) == listed.transactions
+    assert [t["money"] for t in listed.transactions] == [100000, 10000, 0]
+
+def test_L11_fixed_column_parse_crlf_and_misc(tmp_path):
+    merged = tmp_path / "merged.txt"
+    merged.write_bytes(MERGED_LINES.replace("\n", "\r\n").encode())
+    transactions = TransactionsList(str(merged))
+    transactions.read_merged_transaction_file()
+    first = transactions.transactions[1]
+    assert (first["code"], first["accountName"], first["accountNumber"], first["money"], first["misc"]) == ('03', 'John Doe', '00001', 10000, 'EC')
+    assert transactions.errors == []
+
+def test_L12_malformed_lines_reported_with_line_numbers(tmp_path, capsys):
+    merged = tmp_path / "merged.txt"
+    merged.write_text(
+        "04 John Doe             00001 01000.00 00\n"
+        "04 John Doe 00001 10.00\n"
+        "\n"
+        "0x John Doe             00001 01000.00 00\n"
+        "01 John Doe             00001 0100a.00 00\n"
+        "00 END_OF_FILE          00000 00000000 00\n"
+    )
+    transactions = TransactionsList(str(merged), batch_bytes=16)
+    transactions.read_merged_transaction_file()
+    assert [t["code"] for t in transactions.transactions] == ['04', '00']
+    assert [e.line_number for e in transactions.errors] == [2, 4, 5]
+    assert "ERROR: Malformed transaction on line 4 – invalid transaction code '0x'" in capsys.readouterr().out
+
+LAZY_MASTER_LINES = (
+    "00001 John Doe             A 01000.00 NP 0000\n"
+    "00002 Jane Smith           A 02500.00 SP 0001\n"
+    "00003 Bob Johnson          A 00750.00 NP 0002\n"
+    "00005 Jane Smith           A 00100.00 SP 0000\n"
+)
+
+def _lazy_list(tmp_path):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(LAZY_MASTER_LINES)
+    accounts = AccountsList(str(tmp_path / "current.txt"), str(master), lazy=True)
+    accounts.read_old_master_accounts()
+    return accounts, master
+
+def test_L13_lazy_master_decodes_only_touched_accounts(tmp_path):
+    accounts, master = _lazy_list(tmp_path)
+    assert accounts.master_accounts == []
+    assert accounts.get_account_by_id('00004') is None
+    assert accounts.get_account_by_id('00003')["balance"] == 75000
+    assert sum(acc is not None for acc in accounts._by_number) == 1
+    assert accounts.get_active_account_by_name("Jane Smith")["accountNumber"] == '00002'
+
+def test_L14_lazy_writers_match_eager_writers(tmp_path):
+    lazy, master = _lazy_list(tmp_path)
+    eager = AccountsList(str(tmp_path / "current.txt"), str(master))
+    eager.read_old_master_accounts()
+    for accounts in (lazy, eager):
+        accounts.get_account_by_id('00003')["balance"] -= 500
+        accounts.disable_account(accounts.get_account_by_id('00002'))
+        accounts.remove_account(accounts.get_account_by_id('00001'))
+        accounts.add_account({"accountNumber": '00004', "accountName": "New Holder", "status": "A", "balance": 0, "plan": "SP", "transactionCount": 0})
+    assert lazy.get_active_account_by_name("Jane Smith")["accountNumber"] == '00005'
+    lazy.write_new_master_accounts(str(master))
+    lazy.write_new_current_accounts(str(tmp_path / "lazy_current.txt"))
+    eager.write_new_master_accounts(str(tmp_path / "eager_master.txt"))
+    eager.write_new_current_accounts(str(tmp_path / "eager_current.txt"))
+    assert master.read_text() == (tmp_path / "eager_master.txt").read_text()
+    assert (tmp_path / "lazy_current.txt").read_text() == (tmp_path / "eager_current.txt").read_text()
+
+def test_L15_lazy_falls_back_for_irregular_master(tmp_path):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(LAZY_MASTER_LINES[46:92] + LAZY_MASTER_LINES[:46])  # not in ascending order
+    accounts = AccountsList(master_file=str(master), lazy=True)
+    accounts.read_old_master_accounts()
+    assert accounts._source is None
+    assert accounts.get_account_by_id('00001') is not None
+
+def test_L16_patch_mode_rewrites_changed_records_in_place(tmp_path):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(LAZY_MASTER_LINES)
+    current = tmp_path / "current.txt"
+    eager = AccountsList(str(current), str(master))
+    eager.read_old_master_accounts()
+    eager.write_new_current_accounts()
+    inode = master.stat().st_ino
+
+    accounts = AccountsList(str(current), str(master), patch=True)
+    accounts.read_old_master_accounts()
+    accounts.get_account_by_id('00003')["balance"] -= 500
+    accounts.write_new_master_accounts()
+    accounts.write_new_current_accounts()
+    assert master.stat().st_ino == inode
+    assert master.read_text() == LAZY_MASTER_LINES.replace("00750.00 NP", "00745.00 NP")
+    assert "00003 Bob Johnson          A 00745.00\n" in current.read_text()
+    assert not (tmp_path / "master_accounts.txt.journal").exists()
+
+def test_L17_patch_mode_falls_back_when_a_record_widens(tmp_path):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(LAZY_MASTER_LINES)
+    current = tmp_path / "current.txt"
+    outputs = []
+    for patch in (False, True):
+        master.write_text(LAZY_MASTER_LINES)
+        AccountsList(str(current), str(master)).read_old_master_accounts()
+        accounts = AccountsList(str(current), str(master), patch=patch)
+        accounts.read_old_master_accounts()
+        accounts.write_new_current_accounts()
+        accounts.perform_transaction(Transaction("04", "Bob Johnson", "00003", 9950000, "", 1))
+        accounts.write_new_master_accounts()
+        accounts.write_new_current_accounts()
+        outputs.append((master.read_text(), current.read_text()))
+    assert "00003 Bob Johnson          A 100249.90 NP 0003\n" in outputs[0][0]
+    assert outputs[1] == outputs[0]
+    assert not (tmp_path / "master_accounts.txt.journal").exists()
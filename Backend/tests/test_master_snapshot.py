@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+import master_snapshot
+from lists import AccountsList
+
+MASTER = (
+    "00001 John Doe             A 01000.00 NP 0000\n"
+    "00002 Jane Smith           A 03000.00 SP 0003\n"
+    "00004 Alice Williams       D 00100.00 NP 0012\n"
+)
+
+FIELDS = ("accountNumber", "accountName", "status", "balance", "plan", "transactionCount")
+
+def load(path, snapshot=True):
+    accounts = AccountsList(master_file=str(path), current_file=str(path) + ".current", snapshot=snapshot)
+    accounts.read_old_master_accounts()
+    return accounts
+
+def rows(accounts):
+    return [[acc[f] for f in FIELDS] for acc in accounts.current_accounts]
+
+def test_SN1_snapshot_loads_same_accounts_as_text(tmp_path):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(MASTER)
+    load(master).write_new_master_accounts()
+    assert master.read_text() == MASTER
+    snap = tmp_path / "master_accounts.txt.snap"
+    assert snap.stat().st_size == master_snapshot.HEADER.size + 3 * master_snapshot.RECORD.size
+    assert master_snapshot.read_snapshot(str(master)) is not None
+    accounts = load(master)
+    assert rows(accounts) == rows(load(master, snapshot=False))
+    assert accounts.get_active_account_by_name("Jane Smith")["plan"] == "SP"
+    assert accounts.get_active_account_by_name("Alice Williams") is None
+
+def test_SN2_stale_or_damaged_snapshot_falls_back_and_rebuilds(tmp_path, capsys):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(MASTER)
+    load(master)
+    assert master_snapshot.read_snapshot(str(master)) is not None
+    master.write_text(MASTER.replace("01000.00", "02000.00"))
+    assert load(master).get_account_by_id("00001")["balance"] == 200000
+    assert "out of date" in capsys.readouterr().out
+    assert master_snapshot.read_snapshot(str(master))[0].balance == 200000
+    snap = tmp_path / "master_accounts.txt.snap"
+    data = bytearray(snap.read_bytes())
+    data[-1] ^= 0xFF
+    snap.write_bytes(bytes(data))
+    assert rows(load(master)) == rows(load(master, snapshot=False))
+    assert "damaged" in capsys.readouterr().out
+
+def test_SN3_accounts_that_do_not_fit_are_not_snapshotted(tmp_path):
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(MASTER)
+    accounts = load(master)
+    assert os.path.exists(master_snapshot.snapshot_path(str(master)))
+    accounts.get_account_by_id("00002")["balance"] = 100000000
+    accounts.write_new_master_accounts()
+    assert not os.path.exists(master_snapshot.snapshot_path(str(master)))
+
+def test_SN4_columnar_engine_reads_and_writes_snapshots(tmp_path):
+    pytest.importorskip("numpy")
+    from columnar import ColumnarAccountsList
+    master = tmp_path / "master_accounts.txt"
+    master.write_text(MASTER)
+    load(master).write_new_master_accounts()
+    columnar = ColumnarAccountsList(master_file=str(master), snapshot=True)
+    columnar.read_old_master_accounts()
+    assert rows(columnar) == rows(load(master))
+    columnar.get_account_by_id("00004")["transactionCount"] = 13
+    columnar.write_new_master_accounts()
+    assert load(master).get_account_by_id("00004")["transactionCount"] == 13
+    assert master_snapshot.read_snapshot(str(master))[2].transactionCount == 13
@@ -0,0 +1,87 @@
+from merge_transactions import find_transaction_files, merge
+
+def write_session(directory, name, lines):
+    directory.mkdir(exist_ok=True)
+    (directory / name).write_text("".join(line + "\n" for line in lines))
+
+def test_M1_files_are_ordered_by_parsed_timestamp(tmp_path):
+    for name in ("01-02-2026 09-00-00.txt", "12-31-2025 23-00-00.txt", "01-02-2026 08-59-59.txt",
+                 "13-01-2026 00-00-00.txt", "notes.txt"):
+        write_session(tmp_path, name, [])
+    names = [p.rsplit("/", 1)[-1] for p in find_transaction_files(str(tmp_path))]
+    assert names == ["12-31-2025 23-00-00.txt", "01-02-2026 08-59-59.txt", "01-02-2026 09-00-00.txt"]
+
+def test_M2_merge_interleaves_sources_and_records_sessions(tmp_path):
+    deposit = "04 John Doe             00001 00000100 00"
+    write_session(tmp_path / "t1", "03-12-2026 10-00-00.txt", [deposit, deposit, "00 END"])
+    write_session(tmp_path / "t1", "03-12-2026 12-00-00.txt", [deposit.replace("04", "01", 1)])
+    write_session(tmp_path / "t2", "03-12-2026 11-00-00.txt", [deposit.replace("100", "200")])
+    output = tmp_path / "merged.txt"
+    assert merge([str(tmp_path / "t1"), str(tmp_path / "t2")], str(output))
+    lines = output.read_text().splitlines()
+    assert [line[:2] for line in lines] == ["04", "04", "04", "01", "00"]
+    assert lines[2].endswith("00000200 00")
+    index = (tmp_path / "merged.txt.sessions").read_text().splitlines()
+    assert [row.split(",")[:2] for row in index[1:]] == [["1", "2"], ["3", "1"], ["4", "1"]]
+    assert index[2].endswith("t2/03-12-2026 11-00-00.txt")
+
+def test_M3_validate_quarantines_bad_files(tmp_path):
+    deposit, end = "04 John Doe             00001 00000100 00", "00 END_OF_SESSION       00000 00000000 00"
+    write_session(tmp_path / "in", "03-12-2026 10-00-00.txt", [deposit + "\r", end])
+    write_session(tmp_path / "in", "03-12-2026 11-00-00.txt", [deposit.replace("00000100", "0000010x"), end])
+    write_session(tmp_path / "in", "03-12-2026 12-00-00.txt", [deposit])
+    output = tmp_path / "merged.txt"
+    assert merge(str(tmp_path / "in"), str(output), validate=True, workers=1)
+    assert output.read_text() == deposit + "\n00 END_OF_FILE          00000 00000000 00\n"
+    assert sorted(p.name for p in (tmp_path / "in").iterdir()) == ["03-12-2026 10-00-00.txt"]
+    report = (tmp_path / "quarantine" / "quarantine_report.csv").read_text().splitlines()
+    assert [row.rsplit(",", 2)[1:] for row in report[1:]] == [
+        ["1", "invalid money amount '0000010x'"], ["", "missing end-of-session (00) record"]]
+
+def test_M4_worker_pool_output_matches_serial(tmp_path):
+    end = "00 END_OF_SESSION       00000 00000000 00"
+    for hour in range(10, 22):
+        write_session(tmp_path / "in", f"03-12-2026 {hour}-00-00.txt",
+                      [f"04 John Doe             000{hour} 00000100 00", end])
+    for workers, name in ((1, "serial.txt"), (3, "pool.txt")):
+        assert merge(str(tmp_path / "in"), str(tmp_path / name), validate=True, workers=workers)
+    assert (tmp_path / "serial.txt").read_text() == (tmp_path / "pool.txt").read_text()
+    assert (tmp_path / "pool.txt").read_text().count("\n") == 13
+
+def test_M5_incremental_merge_appends_only_new_files(tmp_path, capsys):
+    deposit = "04 John Doe             00001 00000100 00"
+    write_session(tmp_path / "in", "03-12-2026 10-00-00.txt", [deposit])
+    output = tmp_path / "merged.txt"
+    assert merge(str(tmp_path / "in"), str(output), incremental=True)
+    write_session(tmp_path / "in", "03-12-2026 11-00-00.txt", [deposit.replace("04", "01", 1)])
+    capsys.readouterr()
+    assert merge(str(tmp_path / "in"), str(output), incremental=True)
+    assert "10-00-00" not in capsys.readouterr().out
+    assert merge(str(tmp_path / "in"), str(tmp_path / "full.txt"))
+    assert output.read_text() == (tmp_path / "full.txt").read_text()
+    assert (tmp_path / "merged.txt.sessions").read_text() == (tmp_path / "full.txt.sessions").read_text()
+    assert not (tmp_path / "full.txt.manifest.json").exists()
+    assert not merge(str(tmp_path / "in"), str(output), incremental=True)
+
+def test_M6_incremental_merge_reports_changed_files_and_stale_manifests(tmp_path, capsys):
+    deposit = "04 John Doe             00001 00000100 00"
+    write_session(tmp_path / "in", "03-12-2026 10-00-00.txt", [deposit])
+    output = tmp_path / "merged.txt"
+    merge(str(tmp_path / "in"), str(output), incremental=True)
+    write_session(tmp_path / "in", "03-12-2026 10-00-00.txt", [deposit, deposit])
+    assert not merge(str(tmp_path / "in"), str(output), incremental=True)
+    assert "changed after it was merged" in capsys.readouterr().out
+    assert output.read_text().count("\n") == 2
+    output.write_text(deposit + "\n")   # e.g. an interrupted run
+    assert merge(str(tmp_path / "in"), str(output), incremental=True)
+    assert "merging all files again" in capsys.readouterr().out
+    assert output.read_text().count("\n") == 3
+
+def test_M7_quarantined_name_collisions_keep_the_extension(tmp_path):
+    (tmp_path / "in").mkdir()
+    (tmp_path / "quarantine").mkdir()
+    (tmp_path / "in" / "03-12-2026 10-00-00.btx").write_bytes(b"BTXF\x01\x00")
+    (tmp_path / "quarantine" / "03-12-2026 10-00-00.btx").write_bytes(b"")
+    assert not merge(str(tmp_path / "in"), str(tmp_path / "merged.txt"), validate=True, workers=1)
+    assert sorted(p.name for p in (tmp_path / "quarantine").iterdir()) == [
+        "03-12-2026 10-00-00 (1).btx", "03-12-2026 10-00-00.btx", "quarantine_report.csv"]
@@ -0,0 +1,18 @@
+from money import parse_cents, format_cents, format_dollars
+import pytest
+
+def test_M1_parse_fixed_width_fields():
+    assert parse_cents("01000.00") == 100000
+    assert parse_cents("00300.2") == 30020
+    assert parse_cents("00000000") == 0
+
+def test_M2_parse_rejects_bad_amounts():
+    for text in ("", "1.005", "12a.00", "1.-5"):
+        with pytest.raises(ValueError):
+            parse_cents(text)
+
+def test_M3_format_round_trip():
+    for text in ("00000.00", "00000.05", "01999.60", "99999.99"):
+        assert format_cents(parse_cents(text)) == text
+    assert format_cents(-550) == "-0005.50"
+    assert format_dollars(75000) == "$750.00"
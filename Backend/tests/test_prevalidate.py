@@ -0,0 +1,62 @@
+import pytest
+
+import binary_transactions as binary
+import main
+import prevalidate
+from prevalidate import Problem
+
+GOOD = b"04 John Doe             00001 00000100 00"
+END  = b"00 END_OF_FILE          00000 00000000 00"
+LINES = [
+    (GOOD,                                         None),
+    (GOOD[:38],                                    None),
+    (GOOD[:40],                                    "BAD_WIDTH"),
+    (b"\xff" + GOOD[1:],                           "BAD_ENCODING"),
+    (b"04 J\xc3\xa9hn Doe             0000x 00000100 00", "BAD_ACCOUNT"),
+    (GOOD[:2] + b"x" + GOOD[3:],                   "BAD_SEPARATOR"),
+    (b"0a" + GOOD[2:],                             "BAD_CODE"),
+    (GOOD.replace(b"00001", b"0000a"),             "BAD_ACCOUNT"),
+    (GOOD.replace(b"00000100", b"000001.0"),       "BAD_AMOUNT"),
+    (GOOD.replace(b"00000100", b"99999.99") + b"\r", None),
+    (b"44" + GOOD[2:],                             "UNKNOWN_CODE"),
+    (GOOD.replace(b"00000100", b"00100000"),       "AMOUNT_LIMIT"),
+    (b"",                                          "BLANK_LINE"),
+    (b"   ",                                       "BLANK_LINE"),
+    (END,                                          None),
+    (GOOD,                                         "AFTER_END"),
+    (GOOD,                                         None),
+    (END,                                          None),
+]
+
+def test_PV1_column_and_line_checks_agree(tmp_path):
+    pytest.importorskip("numpy")
+    path = str(tmp_path / "merged.txt")
+    with open(path, "wb") as f:
+        f.write(b"\n".join(line for line, _ in LINES) + b"\n")
+    expected = [(n, kind) for n, (_, kind) in enumerate(LINES, 1) if kind]
+    for batch_bytes in (1, 100, 1 << 20):
+        report = prevalidate.validate_file(path, batch_bytes, vectorized=True)
+        assert report == prevalidate.validate_file(path, batch_bytes, vectorized=False)
+        assert [(p.line, p.kind) for p in report.problems] == expected
+        assert report.records == len(LINES) - 2
+
+def test_PV2_missing_end_and_binary_records(tmp_path):
+    (tmp_path / "merged.txt").write_bytes(GOOD + b"\n" + (b"44" + GOOD[2:]) + b"\n")
+    binary.to_binary(str(tmp_path / "merged.txt"), str(tmp_path / "merged.btx"))
+    expected = [Problem(2, "UNKNOWN_CODE", "unknown transaction code '44'"),
+                Problem(0, "MISSING_END", "missing end-of-file (00) record")]
+    for name in ("merged.txt", "merged.btx"):
+        for vectorized in (False, prevalidate.np is not None):
+            report = prevalidate.validate_file(str(tmp_path / name), vectorized=vectorized)
+            assert report.problems == expected
+
+def test_PV3_prevalidate_stops_before_accounts_are_touched(tmp_path, capsys):
+    (tmp_path / "merged.txt").write_bytes(GOOD + b"\n" + GOOD[:40] + b"\n" + END + b"\n")
+    (tmp_path / "master.txt").write_text("00001 John Doe             A 01000.00 NP 0000\n")
+    report = str(tmp_path / "report.csv")
+    assert not main.run(str(tmp_path / "merged.txt"), str(tmp_path / "current.txt"), str(tmp_path / "master.txt"),
+                        {"prevalidate": report, "rejects": str(tmp_path / "rejects.csv")})
+    assert not (tmp_path / "current.txt").exists() and not (tmp_path / "rejects.csv").exists()
+    assert (tmp_path / "report.csv").read_text().splitlines() == [
+        "line,problem,detail", '2,BAD_WIDTH,"expected 41 characters, found 40"']
+    assert "BAD_WIDTH                1" in capsys.readouterr().out
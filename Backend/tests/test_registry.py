@@ -0,0 +1,34 @@
+from records import Transaction
+from registry import HandlerRegistry
+import pytest
+
+def test_R1_counts_invocations_and_rejects(accounts_list, capsys):
+    for transaction in (
+        Transaction("01", "John Doe", "00001", 1000),
+        Transaction("01", "John Doe", "00099", 1000),   # not found
+        Transaction("09", "John Doe", "00000", 0),
+        Transaction("12", "John Doe", "00001", 0),      # unknown code
+    ):
+        accounts_list.perform_transaction(transaction)
+    stats = accounts_list.registry.stats()
+    assert stats["01"] == (2, 1)
+    assert stats["09"] == (1, 0)
+    assert stats["12"] == (1, 1)
+    assert "Unknown transaction code '12'" in capsys.readouterr().out
+
+def test_R2_register_extra_code(accounts_list):
+    def bonus(transaction, accounts):
+        accounts.get_account_by_id(transaction["accountNumber"])["balance"] += transaction["money"]
+    accounts_list.registry.register("12", bonus)
+    assert accounts_list.perform_transaction({"code": "12", "accountNumber": "00003", "money": 500}) is True
+    assert accounts_list.get_account_by_id("00003")["balance"] == 75500
+    assert not accounts_list.registry.is_default()
+
+def test_R3_register_rejects_taken_and_invalid_codes():
+    registry = HandlerRegistry()
+    with pytest.raises(ValueError):
+        registry.register("01", lambda t, a: True)
+    with pytest.raises(ValueError):
+        registry.register("123", lambda t, a: True)
+    registry.register("1", lambda t, a: False, replace=True)
+    assert registry.handler_for("01")(None, None) is False
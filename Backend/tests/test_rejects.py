@@ -0,0 +1,55 @@
+from lists import TransactionsList
+from records import Transaction
+from rejects import Reject, RejectSink
+
+def test_RJ1_sink_replaces_console_messages(accounts_list, capsys):
+    accounts_list.rejects = RejectSink()
+    accounts_list.perform_transaction(Transaction("01", "Bob Johnson", "00003", 75000, "", 7))
+    accounts_list.perform_transaction(Transaction("04", "Nobody", "00099", 100, "", 8))
+    assert capsys.readouterr().out == ""
+    assert accounts_list.rejects.rows == [
+        Reject(7, "01", "00003", "INSUFFICIENT_FUNDS"),
+        Reject(8, "04", "00099", "ACCOUNT_NOT_FOUND"),
+    ]
+    assert accounts_list.rejects.checkpoint() == {
+        "offset": 0, "counts": {"INSUFFICIENT_FUNDS": 1, "ACCOUNT_NOT_FOUND": 1}}
+
+def test_RJ2_verbose_sink_writes_csv_and_summary(accounts_list, tmp_path, capsys):
+    path = tmp_path / "rejects.csv"
+    accounts_list.rejects = RejectSink(str(path), verbose=True, buffer_rows=1)
+    transaction = Transaction("02", "Alice Williams", "00001", 100, "", 3)
+    accounts_list.perform_transaction(transaction)
+    accounts_list.perform_transaction(transaction)
+    accounts_list.rejects.close()
+    assert "ERROR: Transfer failed – no active account found for holder 'Alice Williams'" in capsys.readouterr().out
+    assert path.read_text().splitlines() == [
+        "line,code,account,reason", "3,02,00001,NO_ACTIVE_FROM_ACCOUNT", "3,02,00001,NO_ACTIVE_FROM_ACCOUNT"]
+    assert accounts_list.rejects.summary() == ["Rejected transactions: 2", "  NO_ACTIVE_FROM_ACCOUNT   2"]
+
+def test_RJ3_malformed_lines_logged_with_line_numbers(tmp_path, capsys):
+    merged = tmp_path / "merged.txt"
+    merged.write_text("04 John Doe             00001 01000.00 00\n0x John Doe             00001 01000.00 00\n")
+    sink = RejectSink()
+    transactions = TransactionsList(str(merged), rejects=sink)
+    transactions.read_merged_transaction_file()
+    assert capsys.readouterr().out == ""
+    assert transactions.transactions[0]["lineNumber"] == 1
+    assert sink.rows == [Reject(2, "0x", "00001", "MALFORMED_RECORD")]
+
+def test_RJ4_resume_continues_or_restarts_the_file(tmp_path, capsys):
+    path = tmp_path / "rejects.csv"
+    sink = RejectSink(str(path))
+    sink.add(Reject(1, "01", "00003", "INSUFFICIENT_FUNDS"))
+    state = sink.checkpoint()
+    sink.add(Reject(2, "04", "00099", "ACCOUNT_NOT_FOUND"))
+    sink.close()
+    for lost in (False, True):
+        if lost:
+            path.unlink()
+        resumed = RejectSink(str(path), resume=state)
+        resumed.add(Reject(3, "04", "00099", "ACCOUNT_NOT_FOUND"))
+        resumed.close()
+        assert path.read_text().splitlines()[-2:] == [
+            "line,code,account,reason" if lost else "1,01,00003,INSUFFICIENT_FUNDS", "3,04,00099,ACCOUNT_NOT_FOUND"]
+        assert resumed.total() == 2
+    assert "Warning: rejects file" in capsys.readouterr().out
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+import sharded
+from conftest import SAMPLE_ACCOUNTS
+from lists import AccountsList, TransactionsList
+from records import Account, Transaction
+from rejects import RejectSink
+from sharded import _run_shard, apply_sharded
+
+DAY = [
+    Transaction("02", "Charlie Brown", "00001", 400000),   # FROM 00005 (last shard) to 00001
+    Transaction("02", "Charlie Brown", "00002", 200000),   # rejected: balance too low, no credit
+    Transaction("01", "John Doe", "00001", 450000),        # only succeeds after the first credit
+    Transaction("07", "Jane Smith", "00002", 0),
+    Transaction("02", "Jane Smith", "00003", 100),         # rejected: holder has no active account
+    Transaction("05", "Jane Smith", "00006", 5000),
+    Transaction("02", "Jane Smith", "00001", 1000),        # FROM the new account 00006
+    Transaction("06", "Bob Johnson", "00003", 0),
+    Transaction("04", "Bob Johnson", "00003", 100),        # rejected: deleted
+    Transaction("11", "Nobody", "00001", 0),               # unknown code
+    Transaction("00", "END_OF_FILE", "00000", 0),
+]
+
+def _fresh():
+    accounts = AccountsList()
+    accounts.current_accounts = [Account.from_dict(acc) for acc in SAMPLE_ACCOUNTS]
+    return accounts
+
+def test_S1_sharded_apply_matches_serial(capsys):
+    serial = _fresh()
+    for transaction in DAY:
+        serial.perform_transaction(transaction)
+    expected = capsys.readouterr().out
+
+    sharded = _fresh()
+    apply_sharded(sharded, DAY, 3)
+    assert capsys.readouterr().out == expected
+    assert [acc.to_dict() for acc in sharded.current_accounts] == [acc.to_dict() for acc in serial.current_accounts]
+    assert sharded.get_account_by_id('00001')["balance"] == 100000 + 400000 - 450000 - 10 + 1000
+
+def test_S2_sharded_counters_match_serial(capsys):
+    serial = _fresh()
+    for transaction in DAY:
+        serial.perform_transaction(transaction)
+    sharded = _fresh()
+    apply_sharded(sharded, DAY, 3)
+    assert sharded.registry.stats() == serial.registry.stats()
+
+MERGED_LINES = (
+    "02 Charlie Brown        00001 04000.00 00\n"
+    "01 John Doe             00001 04500.00 00\n"
+    "04 John Doe 00001 10.00\n"                      # malformed, between two transactions
+    "02 Charlie Brown        00002 02000.00 00\n"
+    "0x John Doe             00001 01000.00 00\n"
+    "04 Bob Johnson          00003 00001.00 00\n"
+    "11 Nobody               00001 00000000 00\n"
+    "00 END_OF_FILE          00000 00000000 00\n"
+)
+
+def test_S3_malformed_lines_reported_in_serial_order(tmp_path, capsys):
+    merged = tmp_path / "merged.txt"
+    merged.write_text(MERGED_LINES)
+    runs = []
+    for shards in (None, 3):
+        sink = RejectSink(verbose=True)
+        transactions = TransactionsList(str(merged), streaming=True, rejects=sink, batch_bytes=64)
+        transactions.read_merged_transaction_file()
+        accounts = _fresh()
+        accounts.rejects = sink
+        if shards is None:
+            for transaction in transactions.get_iterator():
+                accounts.perform_transaction(transaction)
+        else:
+            apply_sharded(accounts, transactions.get_iterator(), shards)
+        runs.append((capsys.readouterr().out, sink.rows, sink.counts))
+    assert "ERROR: Malformed transaction on line 3" in runs[0][0]
+    assert runs[1] == runs[0]
+
+def _dies_first(shard, *args):
+    if shard == 0:
+        os._exit(3)
+    _run_shard(shard, *args)
+
+def test_S4_dead_worker_fails_the_run(monkeypatch):
+    monkeypatch.setattr(sharded, "_run_shard", _dies_first)
+    monkeypatch.setattr(sharded, "_POLL_SECONDS", 0.05)
+    with pytest.raises(RuntimeError, match="Shard 0 exited with code 3"):
+        apply_sharded(_fresh(), DAY, 3)
@@ -0,0 +1,25 @@
+import io
+import sys
+import stdio
+from lists import TransactionsList
+
+DEPOSIT = b"04 John Doe             00001 00000100 00\n"
+END     = b"00 END_OF_FILE          00000 00000000 00\n"
+
+def test_IO1_transactions_stream_from_stdin(monkeypatch):
+    for data, complete in ((DEPOSIT * 3 + END, True), (DEPOSIT * 3, False)):
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+        records = TransactionsList("-", batch_bytes=50)
+        records.read_merged_transaction_file()
+        assert [t.code for t in records.transactions] == ["04"] * 3 + ["00"] * complete
+        assert records.complete is complete
+
+def test_IO2_data_to_stdout_and_messages_to_stderr(accounts_list, capsys):
+    with stdio.messages_to_stderr():
+        print("Transactions Applied.")
+        accounts_list.write_new_current_accounts("-")
+    captured = capsys.readouterr()
+    assert captured.err == "Transactions Applied.\n"
+    assert captured.out.startswith("00001 John Doe") and captured.out.endswith("00000 END_OF_FILE          A 00000.00\n")
+    print("after")
+    assert capsys.readouterr().out == "after\n"
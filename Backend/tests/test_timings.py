@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+from lists import AccountsList
+from records import Transaction
+from timings import LatencyHistogram, PhaseTimer, TimedRegistry, format_report, report
+
+def test_TM1_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram()
+    for ns in (500, 1500, 3000, 3500, 900000):
+        histogram.record(ns)
+    data = histogram.to_dict()
+    assert data["histogram_us"] == {"<1": 1, "1-2": 1, "2-4": 2, "512-1024": 1}
+    assert (data["count"], data["p50_us"], data["p99_us"], data["max_us"]) == (5, 4, 1024, 900.0)
+
+def test_TM2_timed_registry_records_each_code(accounts_list):
+    registry = TimedRegistry()
+    accounts = AccountsList(registry=registry)
+    accounts.current_accounts = accounts_list.current_accounts
+    for code in ("04", "04", "08"):
+        accounts.perform_transaction(Transaction(code, "John Doe", "00001", 100))
+    assert {code: h.count for code, h in registry.latency.items()} == {"04": 2, "08": 1}
+    assert registry.stats()["04"] == (2, 0)
+
+def test_TM3_phase_timer_excludes_nested_parse_time(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(time, "perf_counter", lambda: clock[0])
+    def slow_batches():
+        for batch in ([1, 2], [3]):
+            clock[0] += 0.05
+            yield batch
+    timer = PhaseTimer()
+    with timer.phase("apply", excluding="parse") as apply:
+        for batch in timer.iterate("parse", slow_batches()):
+            clock[0] += 0.01
+    assert timer.get("parse").records == 3
+    assert timer.get("parse").seconds == pytest.approx(0.1)
+    assert apply.seconds == pytest.approx(0.02)
+    lines = format_report(report(timer))
+    assert lines[1].startswith("apply") and lines[2].startswith("parse")
@@ -0,0 +1,192 @@
+"""
+backend/timings.py
+
+Timing instrumentation for the Banking System Back End (main.py --timings).
+
+PhaseTimer records the wall time and throughput of each phase of a run
+(master load, merged-file parse, apply loop, master write, current write).
+TimedRegistry is a HandlerRegistry that also keeps a latency histogram for
+every transaction code it dispatches.
+
+report() turns both into a JSON-ready dict, and format_report() into a
+table for the terminal.
+
+Histogram buckets are powers of two in microseconds: bucket "<1" holds
+latencies under 1us, "1-2" those from 1us up to 2us, "2-4" from 2us up to
+4us, and so on. Percentiles are read from the buckets, so they are upper
+bounds accurate to a factor of two.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from registry import HandlerRegistry
+
+
+class Phase:
+    """Wall time and volume of one phase of a run."""
+
+    def __init__(self, name: str):
+        self.name    = name
+        self.seconds = 0.0
+        self.records = 0
+        self.bytes   = 0
+
+    def to_dict(self) -> Dict:
+        """Return the phase as a JSON-ready dict, with throughput."""
+        result = {"name": self.name, "seconds": round(self.seconds, 6),
+                  "records": self.records, "bytes": self.bytes}
+        if self.seconds > 0:
+            result["records_per_second"] = round(self.records / self.seconds, 1)
+            result["mb_per_second"]      = round(self.bytes / self.seconds / 1e6, 3)
+        return result
+
+
+class PhaseTimer:
+    """Collects Phase timings in the order the phases first run."""
+
+    def __init__(self):
+        self.phases: Dict[str, Phase] = {}
+
+    def get(self, name: str) -> Phase:
+        """Return the named phase, creating it if needed."""
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(name)
+        return phase
+
+    @contextmanager
+    def phase(self, name: str, excluding: Optional[str] = None) -> Iterator[Phase]:
+        """
+        Time the body of a with-block as the named phase.
+
+        Args:
+            name:      The phase name.
+            excluding: Another phase whose time, when it runs inside this
+                       one, is not counted towards this one.
+        """
+        phase   = self.get(name)
+        nested  = self.get(excluding) if excluding else None
+        before  = nested.seconds if nested else 0.0
+        started = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase.seconds += time.perf_counter() - started
+            if nested:
+                phase.seconds -= nested.seconds - before
+
+    def iterate(self, name: str, batches: Iterable[List]) -> Iterator[List]:
+        """
+        Yield from batches, timing only the work of producing them as the named phase.
+
+        Each batch's length is added to the phase's record count.
+        """
+        phase = self.get(name)
+        it    = iter(batches)
+        while True:
+            started = time.perf_counter()
+            try:
+                batch = next(it)
+            except StopIteration:
+                phase.seconds += time.perf_counter() - started
+                return
+            phase.seconds += time.perf_counter() - started
+            phase.records += len(batch)
+            yield batch
+
+
+class LatencyHistogram:
+    """Power-of-two microsecond latency histogram for one transaction code."""
+
+    def __init__(self):
+        self.buckets: List[int] = []
+        self.count    = 0
+        self.total_ns = 0
+        self.max_ns   = 0
+
+    def record(self, ns: int):
+        """Add one latency, in nanoseconds."""
+        index = (ns // 1000).bit_length()
+        if index >= len(self.buckets):
+            self.buckets.extend([0] * (index + 1 - len(self.buckets)))
+        self.buckets[index] += 1
+        self.count    += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    @staticmethod
+    def bucket_label(index: int) -> str:
+        """Return the label of a bucket, e.g. "<1" or "4-8" (microseconds)."""
+        return "<1" if index == 0 else f"{1 << (index - 1)}-{1 << index}"
+
+    def percentile_us(self, fraction: float) -> int:
+        """Return the upper bound, in microseconds, of the bucket holding the given percentile."""
+        target = fraction * self.count
+        seen   = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return 1 << index
+        return 0
+
+    def to_dict(self) -> Dict:
+        """Return the histogram and its summary figures as a JSON-ready dict."""
+        return {
+            "count":         self.count,
+            "total_seconds": round(self.total_ns / 1e9, 6),
+            "mean_us":       round(self.total_ns / self.count / 1000, 3) if self.count else 0,
+            "p50_us":        self.percentile_us(0.50),
+            "p99_us":        self.percentile_us(0.99),
+            "max_us":        round(self.max_ns / 1000, 3),
+            "histogram_us":  {self.bucket_label(i): n for i, n in enumerate(self.buckets) if n},
+        }
+
+
+class TimedRegistry(HandlerRegistry):
+    """HandlerRegistry that records how long every dispatch takes, per transaction code."""
+
+    def __init__(self, handlers=None):
+        super().__init__(handlers)
+        self.latency: Dict[str, LatencyHistogram] = {}
+
+    def dispatch(self, transaction, accounts) -> bool:
+        started = time.perf_counter_ns()
+        applied = super().dispatch(transaction, accounts)
+        elapsed = time.perf_counter_ns() - started
+        code = getattr(transaction, "code", None) or str(transaction.get("code", "")).zfill(2)
+        histogram = self.latency.get(code)
+        if histogram is None:
+            histogram = self.latency[code] = LatencyHistogram()
+        histogram.record(elapsed)
+        return applied
+
+
+def report(timer: PhaseTimer, registry: Optional[HandlerRegistry] = None) -> Dict:
+    """Return the phase timings and per-code latencies as a JSON-ready dict."""
+    latency = getattr(registry, "latency", {})
+    return {
+        "phases": [phase.to_dict() for phase in timer.phases.values()],
+        "transaction_codes": {code: latency[code].to_dict() for code in sorted(latency)},
+    }
+
+
+def format_report(data: Dict) -> List[str]:
+    """Format a report() dict as table lines for the terminal."""
+    lines = [f"{'Phase':<16}{'Seconds':>10}{'Records':>10}{'Records/s':>12}{'MB/s':>9}"]
+    for phase in data["phases"]:
+        lines.append(
+            f"{phase['name']:<16}{phase['seconds']:>10.3f}{phase['records']:>10}"
+            f"{phase.get('records_per_second', 0):>12.0f}{phase.get('mb_per_second', 0):>9.2f}"
+        )
+    if data["transaction_codes"]:
+        lines.append("")
+        lines.append(f"{'Code':<6}{'Count':>9}{'Total s':>10}{'Mean us':>10}{'p50 us':>9}{'p99 us':>9}{'Max us':>10}")
+        for code, stats in data["transaction_codes"].items():
+            lines.append(
+                f"{code:<6}{stats['count']:>9}{stats['total_seconds']:>10.3f}{stats['mean_us']:>10.2f}"
+                f"{stats['p50_us']:>9}{stats['p99_us']:>9}{stats['max_us']:>10.1f}"
+            )
+    return lines
@@ -5,7 +5,8 @@ Transaction handler functions for the Banking System Back End.
 
 Each function applies a single transaction dict to an AccountsList, enforcing
 the business constraints defined in the project spec. Constraint violations are
-reported to the terminal as ERROR messages. Returns True if the transaction was
+reported to the terminal as ERROR messages, or to the AccountsList's reject log
+if it has one (see rejects.py). Returns True if the transaction was
 applied successfully, False if it was skipped due to a constraint violation.
 
 Transaction codes handled:
@@ -17,6 +18,9 @@ Transaction fee rates (debited from the account after each money transaction):
     SP (student plan)     – $0.05 per transaction
     NP (non-student plan) – $0.10 per transaction
 
+All money values (balances, transaction amounts and fees) are integer cents;
+see money.py.
+
 Note on transfer (code 02):
     The Front End stores the TO account number in the 'accountNumber' field and
     the FROM account holder's name in the 'accountName' field. The 'misc' field
@@ -29,38 +33,47 @@ Note on transfer (code 02):
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+import rejects
+from money import format_dollars
+from records import Account
+from rejects import report
+
 if TYPE_CHECKING:
     # Imported for type-checking only to avoid a circular import at runtime.
     from lists import AccountsList
 
 
-# Per-transaction fee amounts indexed by payment plan code.
-TRANSACTION_FEE: dict[str, float] = {
-    "SP": 0.05,
-    "NP": 0.10,
+# Per-transaction fee amounts in cents, indexed by payment plan code.
+TRANSACTION_FEE: dict[str, int] = {
+    "SP": 5,
+    "NP": 10,
 }
 
 
 # Internal helper
-def _charge_fee(account: dict) -> bool:
+def _charge_fee(account: dict, transaction: dict, accounts: AccountsList) -> bool:
     """
     Deduct the per-transaction fee from account['balance'] based on the
     account's payment plan, and increment its transaction counter.
 
     Args:
-        account: The account dict to charge.
+        account:     The account dict to charge.
+        transaction: The transaction the fee is for (for the reject log).
+        accounts:    AccountsList the transaction is applied to.
 
     Returns:
         True if the fee was applied, False if the balance would go negative.
     """
-    fee = TRANSACTION_FEE.get(account.get("plan", "SP"), 0.05)
-    if round(account["balance"] - fee, 2) < 0:
-        print(
-            f"ERROR: Transaction fee of ${fee:.2f} would cause a negative balance "
-            f"on account {account['accountNumber']} – fee not applied."
+    fee = TRANSACTION_FEE.get(account.get("plan", "SP"), 5)
+    if account["balance"] - fee < 0:
+        report(
+            accounts, transaction, rejects.FEE_INSUFFICIENT_FUNDS,
+            f"ERROR: Transaction fee of {format_dollars(fee)} would cause a negative balance "
+            f"on account {account['accountNumber']} – fee not applied.",
+            account=account["accountNumber"],
         )
         return False
-    account["balance"] = round(account["balance"] - fee, 2)
+    account["balance"] -= fee
     account["transactionCount"] = account.get("transactionCount", 0) + 1
     return True
 
@@ -86,23 +99,26 @@ def withdrawal(transaction: dict, accounts: AccountsList) -> bool:
     """
     account = accounts.get_account_by_id(transaction["accountNumber"])
     if account is None:
-        print(f"ERROR: Withdrawal failed – account {transaction['accountNumber']} not found.")
+        report(accounts, transaction, rejects.ACCOUNT_NOT_FOUND,
+               f"ERROR: Withdrawal failed – account {transaction['accountNumber']} not found.")
         return False
     if account["status"] == "D":
-        print(f"ERROR: Withdrawal failed – account {transaction['accountNumber']} is disabled.")
+        report(accounts, transaction, rejects.ACCOUNT_DISABLED,
+               f"ERROR: Withdrawal failed – account {transaction['accountNumber']} is disabled.")
         return False
 
     amount = transaction["money"]
-    fee    = TRANSACTION_FEE.get(account.get("plan", "SP"), 0.05)
-    if round(account["balance"] - amount - fee, 2) < 0:
-        print(
-            f"ERROR: Withdrawal of ${amount:.2f} on account {transaction['accountNumber']} "
+    fee    = TRANSACTION_FEE.get(account.get("plan", "SP"), 5)
+    if account["balance"] - amount - fee < 0:
+        report(
+            accounts, transaction, rejects.INSUFFICIENT_FUNDS,
+            f"ERROR: Withdrawal of {format_dollars(amount)} on account {transaction['accountNumber']} "
             f"would cause a negative balance – transaction skipped."
         )
         return False
 
-    account["balance"] = round(account["balance"] - amount, 2)
-    _charge_fee(account)
+    account["balance"] -= amount
+    _charge_fee(account, transaction, accounts)
     return True
 
 
@@ -120,6 +136,9 @@ def transfer(transaction: dict, accounts: AccountsList) -> bool:
     Constraint: the FROM account balance must remain >= $0.00 after the
     deduction and the fee.
 
+    The work is split into transfer_parties() and transfer_debit() so the
+    sharded engine (sharded.py) can run the two halves in different processes.
+
     Args:
         transaction: Transaction dict.
         accounts:    AccountsList to modify.
@@ -127,42 +146,83 @@ def transfer(transaction: dict, accounts: AccountsList) -> bool:
     Returns:
         True on success, False if a constraint was violated.
     """
+    parties = transfer_parties(transaction, accounts)
+    if parties is None:
+        return False
+    to_account, from_account = parties
+    if not transfer_debit(transaction, from_account, accounts):
+        return False
+    to_account["balance"] += transaction["money"]
+    return True
+
+
+def transfer_parties(transaction: dict, accounts: AccountsList):
+    """
+    Find the TO and FROM accounts of a transfer (code 02).
+
+    Only account existence, status and holder names are consulted, never
+    balances.
+
+    Args:
+        transaction: Transaction dict.
+        accounts:    AccountsList to search.
+
+    Returns:
+        (to_account, from_account), or None if either is missing or the TO
+        account is disabled.
+    """
     to_account = accounts.get_account_by_id(transaction["accountNumber"])
     if to_account is None:
-        print(f"ERROR: Transfer failed – TO account {transaction['accountNumber']} not found.")
-        return False
+        report(accounts, transaction, rejects.ACCOUNT_NOT_FOUND,
+               f"ERROR: Transfer failed – TO account {transaction['accountNumber']} not found.")
+        return None
     if to_account["status"] == "D":
-        print(f"ERROR: Transfer failed – TO account {transaction['accountNumber']} is disabled.")
-        return False
+        report(accounts, transaction, rejects.ACCOUNT_DISABLED,
+               f"ERROR: Transfer failed – TO account {transaction['accountNumber']} is disabled.")
+        return None
 
     # Locate the FROM account by the account holder's name (best-effort, see module note).
     name_key     = transaction["accountName"].strip()
-    from_account = None
-    for acc in accounts.current_accounts:
-        if acc["accountName"].strip() == name_key and acc["status"] == "A":
-            from_account = acc
-            break
+    from_account = accounts.get_active_account_by_name(name_key)
 
     if from_account is None:
-        print(
+        report(
+            accounts, transaction, rejects.NO_FROM_ACCOUNT,
             f"ERROR: Transfer failed – no active account found for holder "
             f"'{name_key}' to transfer from."
         )
-        return False
+        return None
+    return to_account, from_account
+
 
+def transfer_debit(transaction: dict, from_account: dict, accounts: AccountsList) -> bool:
+    """
+    Debit the FROM account of a transfer (code 02) and charge its fee.
+
+    The fee can never fail here: the balance check already covers it.
+
+    Args:
+        transaction:  Transaction dict.
+        from_account: The FROM account found by transfer_parties().
+        accounts:     AccountsList the transaction is applied to.
+
+    Returns:
+        True if the amount was debited, False if the balance was too low.
+    """
     amount = transaction["money"]
-    fee    = TRANSACTION_FEE.get(from_account.get("plan", "SP"), 0.05)
-    if round(from_account["balance"] - amount - fee, 2) < 0:
-        print(
-            f"ERROR: Transfer of ${amount:.2f} from account "
+    fee    = TRANSACTION_FEE.get(from_account.get("plan", "SP"), 5)
+    if from_account["balance"] - amount - fee < 0:
+        report(
+            accounts, transaction, rejects.INSUFFICIENT_FUNDS,
+            f"ERROR: Transfer of {format_dollars(amount)} from account "
             f"{from_account['accountNumber']} would cause a negative balance "
-            f"– transaction skipped."
+            f"– transaction skipped.",
+            account=from_account["accountNumber"],
         )
         return False
 
-    from_account["balance"] = round(from_account["balance"] - amount, 2)
-    to_account["balance"]   = round(to_account["balance"]   + amount, 2)
-    _charge_fee(from_account)
+    from_account["balance"] -= amount
+    _charge_fee(from_account, transaction, accounts)
     return True
 
 
@@ -186,23 +246,26 @@ def paybill(transaction: dict, accounts: AccountsList) -> bool:
     """
     account = accounts.get_account_by_id(transaction["accountNumber"])
     if account is None:
-        print(f"ERROR: Paybill failed – account {transaction['accountNumber']} not found.")
+        report(accounts, transaction, rejects.ACCOUNT_NOT_FOUND,
+               f"ERROR: Paybill failed – account {transaction['accountNumber']} not found.")
         return False
     if account["status"] == "D":
-        print(f"ERROR: Paybill failed – account {transaction['accountNumber']} is disabled.")
+        report(accounts, transaction, rejects.ACCOUNT_DISABLED,
+               f"ERROR: Paybill failed – account {transaction['accountNumber']} is disabled.")
         return False
 
     amount = transaction["money"]
-    fee    = TRANSACTION_FEE.get(account.get("plan", "SP"), 0.05)
-    if round(account["balance"] - amount - fee, 2) < 0:
-        print(
-            f"ERROR: Paybill of ${amount:.2f} on account {transaction['accountNumber']} "
+    fee    = TRANSACTION_FEE.get(account.get("plan", "SP"), 5)
+    if account["balance"] - amount - fee < 0:
+        report(
+            accounts, transaction, rejects.INSUFFICIENT_FUNDS,
+            f"ERROR: Paybill of {format_dollars(amount)} on account {transaction['accountNumber']} "
             f"would cause a negative balance – transaction skipped."
         )
         return False
 
-    account["balance"] = round(account["balance"] - amount, 2)
-    _charge_fee(account)
+    account["balance"] -= amount
+    _charge_fee(account, transaction, accounts)
     return True
 
 
@@ -227,23 +290,26 @@ def deposit(transaction: dict, accounts: AccountsList) -> bool:
     """
     account = accounts.get_account_by_id(transaction["accountNumber"])
     if account is None:
-        print(f"ERROR: Deposit failed – account {transaction['accountNumber']} not found.")
+        report(accounts, transaction, rejects.ACCOUNT_NOT_FOUND,
+               f"ERROR: Deposit failed – account {transaction['accountNumber']} not found.")
         return False
     if account["status"] == "D":
-        print(f"ERROR: Deposit failed – account {transaction['accountNumber']} is disabled.")
+        report(accounts, transaction, rejects.ACCOUNT_DISABLED,
+               f"ERROR: Deposit failed – account {transaction['accountNumber']} is disabled.")
         return False
 
     amount = transaction["money"]
-    fee    = TRANSACTION_FEE.get(account.get("plan", "SP"), 0.05)
-    if round(account["balance"] + amount - fee, 2) < 0:
-        print(
-            f"ERROR: Deposit fee of ${fee:.2f} on account {transaction['accountNumber']} "
+    fee    = TRANSACTION_FEE.get(account.get("plan", "SP"), 5)
+    if account["balance"] + amount - fee < 0:
+        report(
+            accounts, transaction, rejects.FEE_INSUFFICIENT_FUNDS,
+            f"ERROR: Deposit fee of {format_dollars(fee)} on account {transaction['accountNumber']} "
             f"would cause a negative balance – transaction skipped."
         )
         return False
 
-    account["balance"] = round(account["balance"] + amount, 2)
-    _charge_fee(account)
+    account["balance"] += amount
+    _charge_fee(account, transaction, accounts)
     return True
 
 
@@ -268,19 +334,19 @@ def create(transaction: dict, accounts: AccountsList) -> bool:
     """
     new_num = str(transaction["accountNumber"]).zfill(5)
     if accounts.get_account_by_id(new_num) is not None:
-        print(f"ERROR: Create failed – account number {new_num} already exists.")
+        report(accounts, transaction, rejects.ACCOUNT_EXISTS,
+               f"ERROR: Create failed – account number {new_num} already exists.")
         return False
 
-    accounts.current_accounts.append({
-        "accountNumber":    new_num,
-        "accountName":      transaction["accountName"].strip(),
-        "status":           "A",
-        "balance":          round(transaction["money"], 2),
-        "plan":             "SP",   # all new accounts start on the student plan
-        "transactionCount": 0,
-    })
-    # Maintain ascending order by account number as required by the spec.
-    accounts.current_accounts.sort(key=lambda a: a["accountNumber"])
+    # add_account keeps ascending order by account number as required by the spec.
+    accounts.add_account(Account(
+        accountNumber=new_num,
+        accountName=transaction["accountName"].strip(),
+        status="A",
+        balance=transaction["money"],
+        plan="SP",   # all new accounts start on the student plan
+        transactionCount=0,
+    ))
     return True
 
 
@@ -301,10 +367,11 @@ def delete(transaction: dict, accounts: AccountsList) -> bool:
     """
     account = accounts.get_account_by_id(transaction["accountNumber"])
     if account is None:
-        print(f"ERROR: Delete failed – account {transaction['accountNumber']} not found.")
+        report(accounts, transaction, rejects.ACCOUNT_NOT_FOUND,
+               f"ERROR: Delete failed – account {transaction['accountNumber']} not found.")
         return False
 
-    accounts.current_accounts.remove(account)
+    accounts.remove_account(account)
     return True
 
 
@@ -324,10 +391,11 @@ def disable(transaction: dict, accounts: AccountsList) -> bool:
     """
     account = accounts.get_account_by_id(transaction["accountNumber"])
     if account is None:
-        print(f"ERROR: Disable failed – account {transaction['accountNumber']} not found.")
+        report(accounts, transaction, rejects.ACCOUNT_NOT_FOUND,
+               f"ERROR: Disable failed – account {transaction['accountNumber']} not found.")
         return False
 
-    account["status"] = "D"
+    accounts.disable_account(account)
     return True
 
 
@@ -348,7 +416,8 @@ def changeplan(transaction: dict, accounts: AccountsList) -> bool:
     """
     account = accounts.get_account_by_id(transaction["accountNumber"])
     if account is None:
-        print(f"ERROR: Changeplan failed – account {transaction['accountNumber']} not found.")
+        report(accounts, transaction, rejects.ACCOUNT_NOT_FOUND,
+               f"ERROR: Changeplan failed – account {transaction['accountNumber']} not found.")
         return False
 
     account["plan"] = "NP"
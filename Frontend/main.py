@@ -27,8 +27,16 @@ How to run:
     If no accounts file argument is provided, the program defaults to
     ../current_accounts.txt. Input can be piped from a file:
         python main.py < input.txt
+    With --transactions=-, each session's transaction log is written to
+    standard output instead of a <timestamp>.txt file, and prompts and
+    messages go to standard error, so the log can be piped onwards:
+        python main.py --transactions=- < input.txt > session.txt
+    With --binary, transaction logs are written in the compact binary
+    format read by the Back End (<timestamp>.btx instead of .txt).
 """
 
+import sys
+
 from utils import SessionType, TransactionLog, AccountsList
 from transactions import *
 
@@ -84,6 +92,14 @@ def main():
     Main entry point for the Banking System Front End.
     Initializes session and processes transactions until program termination.
     """
+    # Send transaction logs to standard output and everything else to standard error
+    if "--transactions=-" in sys.argv[1:]:
+        TransactionLog.outputPath = "-"
+        TransactionLog.outputStream = sys.stdout
+        sys.stdout = sys.stderr
+    if "--binary" in sys.argv[1:]:
+        TransactionLog.binary = True
+
     print("Welcome to the Banking System")
     print("-" * 40)
 
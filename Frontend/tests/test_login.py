@@ -2,6 +2,10 @@
 # Input order - standard login: session_type, account_name
 #             - admin login:    session_type
 
+import os
+
+import pytest
+
 from transactions import login, withdrawal, transfer, paybill, deposit, create, delete, disable, changeplan
 from utils import SessionType, AccountsList
 
@@ -149,3 +153,49 @@ def test_login_fails_with_name_over_20_chars(new_session, monkeypatch, capsys):
     mock_login_input(monkeypatch, "standard", "A" * 21)
     assert login(new_session) is None
     assert "ERROR" in capsys.readouterr().out
+
+
+# fetchAccounts: the parsed accounts file is reused while it is unchanged
+def write_accounts(path, balance):
+    path.write_text(f"00001 John Doe             A {balance}\n00000 END_OF_FILE          A 00000.00\n")
+
+def test_fetch_accounts_reuses_unchanged_file(tmp_path, monkeypatch):
+    path = tmp_path / "current_accounts.txt"
+    write_accounts(path, "01000.00")
+    monkeypatch.setattr(AccountsList, "accountsPath", str(path))
+    monkeypatch.setattr(AccountsList, "_cache", None)
+    AccountsList.fetchAccounts()
+    monkeypatch.setattr(AccountsList, "parseAccounts", staticmethod(lambda _: pytest.fail("file re-parsed")))
+    AccountsList.accounts[0]["balance"] = 0.00
+    AccountsList.fetchAccounts()
+    assert list(AccountsList.accounts) == [
+        {"accountNumber": 1, "accountName": "John Doe", "status": "A", "balance": 1000.00}]
+
+def test_fetch_accounts_copies_only_changed_accounts(tmp_path, monkeypatch):
+    path = tmp_path / "current_accounts.txt"
+    path.write_text("".join(f"{n:05} Holder{n:<14} A 01000.00\n" for n in range(1, 1001)))
+    monkeypatch.setattr(AccountsList, "accountsPath", str(path))
+    monkeypatch.setattr(AccountsList, "_cache", None)
+    AccountsList.fetchAccounts()
+    parsed = AccountsList._cache[1]
+    AccountsList.fetchAccounts()
+    session = AccountsList.accounts
+    assert len(session) == 1000 and session._views == {}  # nothing copied at login
+    session[4]["balance"] -= 250.00
+    session.remove(session[9])
+    session.append({"accountNumber": 1001, "accountName": "New", "status": "A", "balance": 0.0})
+    assert session[4]["balance"] == 750.00 and len(session) == 1000
+    assert parsed[4]["balance"] == 1000.00 and len(AccountsList._cache[1]) == 1000
+    AccountsList.fetchAccounts()
+    assert AccountsList.accounts[4]["balance"] == 1000.00 and AccountsList.accounts[9]["accountNumber"] == 10
+
+def test_fetch_accounts_rereads_changed_file(tmp_path, monkeypatch):
+    path = tmp_path / "current_accounts.txt"
+    write_accounts(path, "01000.00")
+    monkeypatch.setattr(AccountsList, "accountsPath", str(path))
+    monkeypatch.setattr(AccountsList, "_cache", None)
+    AccountsList.fetchAccounts()
+    write_accounts(path, "02000.00")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    AccountsList.fetchAccounts()
+    assert AccountsList.accounts[0]["balance"] == 2000.00
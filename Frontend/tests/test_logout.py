@@ -3,7 +3,7 @@
 #             - admin:    account_holder, account_number
 
 from transactions import login, withdrawal, transfer, paybill, deposit, create, delete, disable, changeplan, logout
-from utils import SessionType, AccountsList
+from utils import SessionType, AccountsList, TransactionLog, BINARY_RECORD
 
 
 # savesLogoutInfo: successful logout should be recorded in the transaction log
@@ -166,4 +166,22 @@ def test_changePlan_after_logout_(monkeypatch, standard_session, capsys):
     logout(standard_session)
     assert standard_session.log.transactions[0]["code"] == "00"
     assert changeplan(standard_session) is None
-    assert "ERROR: Not logged in. Please login first."  in capsys.readouterr().out
\ No newline at end of file
+    assert "ERROR: Not logged in. Please login first."  in capsys.readouterr().out
+
+# logToStandardOutput: with outputPath "-" the session log is written to standard output
+def test_logout_writes_log_to_stdout(monkeypatch, admin_session, mock_input, capsys):
+    mock_input("John Doe", "1")
+    monkeypatch.setattr(TransactionLog, "outputPath", "-")
+    logout(admin_session)
+    assert "00       END_OF_SESSION 00000 00000.00 00\n" in capsys.readouterr().out
+
+
+# binaryLog: with binary set the session log is written in the packed binary format
+def test_logout_writes_binary_log(monkeypatch, admin_session, mock_input, capsysbinary):
+    mock_input("John Doe", "1")
+    monkeypatch.setattr(TransactionLog, "outputPath", "-")
+    monkeypatch.setattr(TransactionLog, "binary", True)
+    logout(admin_session)
+    out = capsysbinary.readouterr().out
+    log = out[out.index(b"BTXF"):][:8 + 36]
+    assert BINARY_RECORD.unpack(log[8:]) == (0, 0, b"      END_OF_SESSION", 0, 0, b"00")
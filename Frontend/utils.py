@@ -1,6 +1,35 @@
+from collections import ChainMap
+from collections.abc import MutableSequence
 from enum import Enum
 from datetime import datetime
 import os
+import struct
+import sys
+
+# Binary transaction file format read by the Back End (Backend/binary_transactions.py):
+# an 8-byte header, then one 36-byte record per transaction.
+BINARY_HEADER = struct.Struct("<4sHH").pack(b"BTXF", 1, 36)
+BINARY_RECORD = struct.Struct("<BB20sIQ2s")
+BINARY_WHOLE_DOLLARS = 0x01
+
+"""
+Packs one transaction file line into a binary transaction record.
+
+Args:
+    line: the text line, as written to a .txt transaction file.
+
+Returns:
+    bytes: the packed record.
+"""
+def packTransactionLine(line: str) -> bytes:
+    money = line[30:38]
+    flags = 0
+    if money[5] == ".":
+        cents = int(money[:5]) * 100 + int(money[6:])
+    else:
+        cents = int(money) * 100
+        flags |= BINARY_WHOLE_DOLLARS
+    return BINARY_RECORD.pack(int(line[0:2]), flags, line[3:23].encode(), int(line[24:29]), cents, line[39:41].encode())
 
 """
 Simple enum to denote a session type. 
@@ -13,6 +42,13 @@ class SessionType(Enum):
 Manages tracking, logging, and exporting transactions.
 """
 class TransactionLog:
+    # Where session logs are written: None for a new <timestamp>.txt file in
+    # the working directory, or "-" for outputStream (standard output).
+    outputPath: str = None
+    outputStream = None
+    # Write session logs in the binary format (<timestamp>.btx) instead of text.
+    binary: bool = False
+
     def __init__(self):
         self.transactions: list[dict] = []
 
@@ -27,7 +63,9 @@ class TransactionLog:
 
     """
     Parses transactions into transaction file format.
-    Attempts to write new transaction file.
+    Attempts to write new transaction file, or writes the records to
+    standard output if outputPath is "-". If binary is set, the records are
+    written in the binary transaction format.
 
     Returns:
         bool: If the transaction file was successfully written to.
@@ -40,8 +78,26 @@ class TransactionLog:
         for i in self.transactions:
             fileContents += f"{i['code']:>02} {i['accountName']:>20} {i['accountNumber']:>05} {i['money']:>08} {i['misc']:>02}\n"
 
+        # Pack the records if writing the binary format.
+        if TransactionLog.binary:
+            fileContents = BINARY_HEADER + b"".join(packTransactionLine(line) for line in fileContents.splitlines())
+
+        # Write to standard output, for a pipe into the Back End
+        if TransactionLog.outputPath == "-":
+            stream = TransactionLog.outputStream or sys.stdout
+            if TransactionLog.binary:
+                stream.flush()
+                stream = stream.buffer
+            stream.write(fileContents)
+            stream.flush()
+            return True
+
         # Write to file
         try:
+            if TransactionLog.binary:
+                with open(f"{timeStamp}.btx", "wb") as file:
+                    file.write(fileContents)
+                return True
             with open(f"{timeStamp}.txt", "w") as file:
                 file.write(fileContents)
         except:
@@ -52,12 +108,61 @@ class TransactionLog:
 
         return True
 
+"""
+Copy-on-write view of the parsed accounts, handed to one session.
+Creating it copies nothing. An account is wrapped the first time the session
+looks at it, and its changes are kept in the wrapper, so the parsed accounts
+it shares with other sessions never change. The list of accounts is only
+copied if the session adds or removes an account.
+"""
+class AccountsView(MutableSequence):
+    def __init__(self, accounts: tuple):
+        self._base = accounts
+        self._views: dict[int, ChainMap] = {}
+        self._items: list = None
+
+    def __len__(self):
+        return len(self._base) if self._items is None else len(self._items)
+
+    def __getitem__(self, index):
+        if self._items is not None:
+            return self._items[index]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._base)))]
+        index = range(len(self._base))[index]
+        view = self._views.get(index)
+        if view is None:
+            view = self._views[index] = ChainMap({}, self._base[index])
+        return view
+
+    def __setitem__(self, index, value):
+        self._copy()[index] = value
+
+    def __delitem__(self, index):
+        del self._copy()[index]
+
+    def insert(self, index, value):
+        self._copy().insert(index, value)
+
+    """
+    Switches to a list of its own before an account is added or removed.
+    """
+    def _copy(self) -> list:
+        if self._items is None:
+            self._items = [self[i] for i in range(len(self._base))]
+        return self._items
+
 """
 Manages storing, sending, and importing bank accounts list.
 Written similar to a singleton.
 """
 class AccountsList:
     accounts: list[dict] = []
+    # The current bank accounts file read at login.
+    accountsPath: str = os.path.join(os.path.dirname(__file__), "..", "current_accounts.txt")
+    # Last parsed accounts file: ((size, mtime_ns, inode), parsed accounts).
+    # The parsed dictionaries are only handed out behind an AccountsView.
+    _cache: tuple = None
 
     """
     Simple getter for accounts.
@@ -69,16 +174,39 @@ class AccountsList:
     """
     Parses accounts file and updates accounts to
     store newly created account dictionaries.
+    If the file has not changed (same size, modification time and inode)
+    since it was last parsed, the parsed accounts are reused. Each call
+    gets its own copy-on-write view of them (see AccountsView), so changes
+    made during one session never show up in the next.
     """
     @classmethod
     def fetchAccounts(cls):
         # This should be recieved from the backend.
         cls.accounts = []
-        file_path = os.path.join(os.path.dirname(__file__), "..", "current_accounts.txt")
-        if not os.path.exists(file_path):
+        file_path = cls.accountsPath
+        try:
+            stat = os.stat(file_path)
+        except OSError:
             print("Warning: current_accounts.txt not found")
             return
 
+        key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        if cls._cache is None or cls._cache[0] != key:
+            cls._cache = (key, tuple(cls.parseAccounts(file_path)))
+        cls.accounts = AccountsView(cls._cache[1])
+
+    """
+    Parses an accounts file into account dictionaries.
+
+    Args:
+        file_path: path of the current bank accounts file.
+
+    Returns:
+        list[dict]: one dictionary per account, in file order.
+    """
+    @staticmethod
+    def parseAccounts(file_path: str) -> list[dict]:
+        accounts = []
         with open(file_path, "r") as f:
             for line in f:
                 if line.startswith("00000 END_OF_FILE"):
@@ -87,9 +215,10 @@ class AccountsList:
                 acc_name = line[6:26].rstrip()
                 acc_status = line[27]
                 acc_balance = float(line[29:37])
-                cls.accounts.append({
+                accounts.append({
                     'accountNumber': acc_number,
                     'accountName': acc_name,
                     'status': acc_status,
                     'balance': acc_balance
                 })
+        return accounts